@@ -17,8 +17,13 @@ taxonomy_columns = ['id', 'name', 'parent_id', 'parent_name', 'vocabulary']
 services_taxonomy_columns = ['id', 'service_id', 'taxonomy_id', 'taxonomy_detail']
 
 
+# Output rows are small, a large buffer per file turns many small writes into few large ones
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
 class CsvFileSink:
     def __init__(self, path):
+        self.files = []
         self.organization_writer = self.make_writer(path, 'organizations', organization_columns)
         self.service_writer = self.make_writer(path, 'services', service_columns)
         self.location_writer = self.make_writer(path, 'location', location_columns)
@@ -30,11 +35,23 @@ class CsvFileSink:
 
     def make_writer(self, path, filename, columns):
         full_path = path + '/' + filename + '.csv'
-        writable_file_handle = open(full_path, 'w', newline='')
+        writable_file_handle = open(full_path, 'w', newline='', buffering=WRITE_BUFFER_SIZE)
+        self.files.append(writable_file_handle)
         writer = csv.writer(writable_file_handle, quoting=csv.QUOTE_ALL, delimiter=',')
         writer.writerow(columns)
         return writer
 
+    def close(self):
+        for file in self.files:
+            file.close()
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def write_organization(self, organization):
         row = [organization.get(column, '') for column in organization_columns]
         self.organization_writer.writerow(row)
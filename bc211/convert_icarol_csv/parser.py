@@ -12,9 +12,10 @@ class CsvMissingIdParseException(Exception):
 def parse(sink, lines, vocabulary=None):
     reader = csv.reader(lines)
     headers = reader.__next__()
-    unique_location_ids = {}
-    unique_phone_ids = {}
-    unique_taxonomy_term_ids = {}
+    column_parsers = compile_column_parsers(headers, vocabulary)
+    unique_location_ids = set()
+    unique_phone_ids = set()
+    unique_taxonomy_term_ids = set()
     line = 0
 
     for row in reader:
@@ -22,24 +23,21 @@ def parse(sink, lines, vocabulary=None):
         if not row:
             continue
 
-        organization_or_service = {}
-        location = {}
-        addresses = [{}, {}]
-        phone_numbers = [{}]
-        taxonomy_terms = []
-        service_taxonomy_terms = []
-        parent_id = None
+        parsed_row = ParsedRow()
+        for parsers, value in zip(column_parsers, row):
+            for parse_value in parsers:
+                parse_value(value, parsed_row)
 
-        for header, value in zip(headers, row):
-            parse_row(header, value, organization_or_service, location,
-                      addresses, phone_numbers, taxonomy_terms, vocabulary)
-            if header == 'ParentAgencyNum':
-                parent_id = value
+        organization_or_service = parsed_row.organization_or_service
+        location = parsed_row.location
+        parent_id = parsed_row.parent_id
+        service_taxonomy_terms = []
 
         if not organization_or_service['id']:
             raise CsvMissingIdParseException(f'Missing service or organization id at line {line}')
 
-        set_location_ids(location, addresses, phone_numbers, organization_or_service['id'], parent_id)
+        set_location_ids(location, parsed_row.addresses, parsed_row.phone_numbers,
+                         organization_or_service['id'], parent_id)
         write_location_to_sink(location, unique_location_ids, sink)
 
         if parent_id == '0':
@@ -48,37 +46,145 @@ def parse(sink, lines, vocabulary=None):
             organization_or_service['organization_id'] = parent_id
             sink.write_service(organization_or_service, location['id'])
             write_service_at_location_to_sink(organization_or_service['id'], location['id'], sink)
-            compile_taxonomy_terms(taxonomy_terms, organization_or_service['id'], service_taxonomy_terms)
+            compile_taxonomy_terms(parsed_row.taxonomy_terms, organization_or_service['id'],
+                                   service_taxonomy_terms)
 
-        write_to_sink(addresses, location['id'],
-                      phone_numbers, unique_phone_ids,
-                      taxonomy_terms, unique_taxonomy_term_ids,
+        write_to_sink(parsed_row.addresses, location['id'],
+                      parsed_row.phone_numbers, unique_phone_ids,
+                      parsed_row.taxonomy_terms, unique_taxonomy_term_ids,
                       service_taxonomy_terms, sink)
     return sink
 
 
-def parse_row(header, value, organization_or_service, location, addresses, phone_numbers, taxonomy_terms, vocabulary):
-    parse_organization_and_service_fields(header, value, organization_or_service)
-    parse_locations_fields(header, value, location)
-    parse_address_fields(header, value, addresses)
-    parse_phone_number_fields(header, value, phone_numbers)
-    parse_taxonomy_fields(header, value, taxonomy_terms, vocabulary)
-    if is_inactive(header, value):
-        mark_as_inactive(organization_or_service)
-
-
-def parse_organization_and_service_fields(header, value, organization_or_service):
-    output_header = organization_header_map.get(header, None)
-    if output_header:
-        if output_header == 'last_verified_on-x':
-            organization_or_service[output_header] = fix_date_time_string_if_exists(value)
-        elif output_header == 'description':
-            old_description = organization_or_service.get('description', '')
-            new_description = value
-            organization_or_service[output_header] = transfer_inactive_mark_if_present(old_description,
-                                                                                       new_description)
-        else:
-            organization_or_service[output_header] = value
+class ParsedRow:
+    __slots__ = ['organization_or_service', 'location', 'addresses', 'phone_numbers',
+                 'taxonomy_terms', 'parent_id']
+
+    def __init__(self):
+        self.organization_or_service = {}
+        self.location = {}
+        self.addresses = [{}, {}]
+        self.phone_numbers = [{}]
+        self.taxonomy_terms = []
+        self.parent_id = None
+
+
+def compile_column_parsers(headers, vocabulary):
+    # Work out once from the headers which fields each column goes into, instead of
+    # looking up every header in every field map for every cell
+    return [compile_column_parser(header, vocabulary) for header in headers]
+
+
+def compile_column_parser(header, vocabulary):
+    parsers = []
+    organization_field = organization_header_map.get(header, None)
+    if organization_field:
+        parsers.append(make_organization_field_parser(organization_field))
+    location_field = location_header_map.get(header, None)
+    if location_field:
+        parsers.append(make_location_field_parser(location_field))
+    address_field = address_header_map.get(get_normalized_address_header(header), None)
+    if address_field:
+        parsers.append(make_address_field_parser(header, address_field))
+    phone_field = phone_header_map.get(phone_header_with_index_one(header), None)
+    if phone_field:
+        parsers.append(make_phone_field_parser(header, phone_field))
+    if header in taxonomy_headers:
+        parsers.append(make_taxonomy_parser(header, vocabulary))
+    if header in inactive_headers:
+        parsers.append(make_inactive_parser(header))
+    if header == 'ParentAgencyNum':
+        parsers.append(parse_parent_id)
+    return tuple(parsers)
+
+
+def make_organization_field_parser(output_header):
+    def parse_field(value, parsed_row):
+        parsed_row.organization_or_service[output_header] = value
+
+    def parse_last_verified_on(value, parsed_row):
+        parsed_row.organization_or_service[output_header] = fix_date_time_string_if_exists(value)
+
+    def parse_description(value, parsed_row):
+        organization_or_service = parsed_row.organization_or_service
+        old_description = organization_or_service.get('description', '')
+        organization_or_service[output_header] = transfer_inactive_mark_if_present(old_description, value)
+
+    if output_header == 'last_verified_on-x':
+        return parse_last_verified_on
+    if output_header == 'description':
+        return parse_description
+    return parse_field
+
+
+def make_location_field_parser(output_header):
+    def parse_field(value, parsed_row):
+        parsed_row.location[output_header] = value
+
+    def parse_coordinate(value, parsed_row):
+        try:
+            value = float(value)
+        except ValueError:
+            value = None
+        parsed_row.location[output_header] = value
+
+    if output_header in ['latitude', 'longitude']:
+        return parse_coordinate
+    return parse_field
+
+
+def make_address_field_parser(header, output_header):
+    is_physical_address_type = header.startswith('Physical')
+    index = 1 if is_physical_address_type else 0
+    address_type = 'physical_address' if is_physical_address_type else 'postal_address'
+
+    def parse_field(value, parsed_row):
+        if value:
+            address = parsed_row.addresses[index]
+            address[output_header] = value
+            address['type'] = address_type
+
+    return parse_field
+
+
+def make_phone_field_parser(header, output_header):
+    phone_index = get_zero_based_phone_index(header)
+
+    def parse_field(value, parsed_row):
+        phone_numbers = parsed_row.phone_numbers
+        set_phone_array_length(phone_numbers, phone_index)
+        phone_numbers[phone_index][output_header] = value
+        if output_header == 'type' and value == '':
+            phone_numbers[phone_index]['type'] = f'Phone {phone_index + 1}'
+        elif header == 'PhoneFax':
+            phone_numbers[phone_index]['type'] = 'Fax'
+
+    return parse_field
+
+
+def make_taxonomy_parser(header, vocabulary):
+    def parse_field(value, parsed_row):
+        vocabulary_name = compute_vocabulary_name(vocabulary, header, value)
+        parsed_row.taxonomy_terms += parse_taxonomy_terms(value, vocabulary_name)
+
+    return parse_field
+
+
+def make_inactive_parser(header):
+    def parse_field(value, parsed_row):
+        if is_inactive(header, value):
+            mark_as_inactive(parsed_row.organization_or_service)
+
+    return parse_field
+
+
+def parse_parent_id(value, parsed_row):
+    parsed_row.parent_id = value
+
+
+taxonomy_headers = ['TaxonomyTerm', 'TaxonomyTerms', 'TaxonomyTermsNotDeactivated', 'TaxonomyCodes']
+
+inactive_headers = ['AgencyStatus', 'MailingStateProvince', 'PhysicalStateProvince']
 
 
 def is_inactive(header, value):
@@ -132,15 +238,6 @@ organization_header_map = {
 }
 
 
-def parse_address_fields(header, value, addresses):
-    output_address_header = address_header_map.get(get_normalized_address_header(header), None)
-    is_physical_address_type = header.startswith('Physical')
-    if output_address_header and value:
-        index = 1 if is_physical_address_type else 0
-        addresses[index][output_address_header] = value
-        addresses[index]['type'] = 'physical_address' if is_physical_address_type else 'postal_address'
-
-
 def get_normalized_address_header(fff):
     return re.sub(r'^Physical', 'Mailing', fff)
 
@@ -157,17 +254,6 @@ address_header_map = {
 }
 
 
-def parse_locations_fields(header, value, location):
-    output_location_header = location_header_map.get(header, None)
-    if output_location_header:
-        if output_location_header in ['latitude', 'longitude']:
-            try:
-                value = float(value)
-            except ValueError:
-                value = None
-        location[output_location_header] = value
-
-
 location_header_map = {
     'ResourceAgencyNum': 'organization_id',
     'PublicName': 'name',
@@ -178,18 +264,6 @@ location_header_map = {
 }
 
 
-def parse_phone_number_fields(header, value, phone_numbers):
-    output_phone_header = phone_header_map.get(phone_header_with_index_one(header), None)
-    if output_phone_header:
-        phone_index = get_zero_based_phone_index(header)
-        set_phone_array_length(phone_numbers, phone_index)
-        phone_numbers[phone_index][output_phone_header] = value
-        if output_phone_header == 'type' and value == '':
-            phone_numbers[phone_index]['type'] = f'Phone {phone_index + 1}'
-        elif header == 'PhoneFax':
-            phone_numbers[phone_index]['type'] = 'Fax'
-
-
 def set_phone_array_length(phone_numbers, index):
     while index and len(phone_numbers) <= index:
         phone_numbers.append({})
@@ -214,12 +288,6 @@ phone_header_map = {
 }
 
 
-def parse_taxonomy_fields(header, value, taxonomy_terms, vocabulary):
-    if header in ['TaxonomyTerm', 'TaxonomyTerms', 'TaxonomyTermsNotDeactivated', 'TaxonomyCodes']:
-        vocabulary = compute_vocabulary_name(vocabulary, header, value)
-        taxonomy_terms += parse_taxonomy_terms(value, vocabulary)
-
-
 def compute_vocabulary_name(vocabulary, header, value):
     if vocabulary:
         return vocabulary
@@ -310,9 +378,16 @@ def pick_location_organization_id(organization_or_service_id, parent_id):
 
 
 def write_location_to_sink(location, unique_location_ids, sink):
-    if location['id'] not in unique_location_ids:
+    key = to_compact_key(location['id'])
+    if key not in unique_location_ids:
         sink.write_location(location)
-        unique_location_ids[location['id']] = 1
+        unique_location_ids.add(key)
+
+
+def to_compact_key(hash_as_hex):
+    # The 20 bytes of a hash take much less space in the sets of ids seen so far than
+    # its 40 character hex string
+    return bytes.fromhex(hash_as_hex)
 
 
 def compute_location_id(location, phone_numbers):
@@ -379,16 +454,18 @@ def write_phone_numbers_to_sink(phone_numbers, location_id, phone_ids, sink):
         if 'number' not in phone_number or not phone_number['number']:
             continue
         the_id = compute_hash(phone_number['number'])
-        if the_id in phone_ids:
+        key = to_compact_key(the_id)
+        if key in phone_ids:
             continue
         phone_number['id'] = the_id
         phone_number['location_id'] = location_id
         sink.write_phone_number(phone_number)
-        phone_ids[the_id] = 1
+        phone_ids.add(key)
 
 
 def write_taxonomy_terms_to_sink(taxonomy_terms, unique_taxonomy_term_ids, sink):
     for term in taxonomy_terms:
-        if term['id'] not in unique_taxonomy_term_ids:
+        key = to_compact_key(term['id'])
+        if key not in unique_taxonomy_term_ids:
             sink.write_taxonomy_term(term)
-            unique_taxonomy_term_ids[term['id']] = 1
+            unique_taxonomy_term_ids.add(key)
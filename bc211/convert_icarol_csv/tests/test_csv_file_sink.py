@@ -0,0 +1,42 @@
+import csv
+import os
+from tempfile import TemporaryDirectory
+from django.test import TestCase
+from bc211.convert_icarol_csv.csv_file_sink import CsvFileSink
+from bc211.convert_icarol_csv.parser import parse
+from bc211.convert_icarol_csv.tests.helpers import Bc211CsvDataBuilder
+from common.testhelpers.random_test_values import a_string
+
+
+class CsvFileSinkTests(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output_file(self, filename):
+        with open(os.path.join(self.directory.name, filename), newline='') as file:
+            return list(csv.reader(file))
+
+    def test_all_rows_are_written_when_sink_is_closed(self):
+        organization_id = a_string()
+        data = (Bc211CsvDataBuilder().
+                as_organization().
+                with_field('ResourceAgencyNum', organization_id).
+                with_field('PublicName', a_string()).
+                build())
+
+        with CsvFileSink(self.directory.name) as sink:
+            parse(sink, data)
+
+        organizations = self.read_output_file('organizations.csv')
+        self.assertEqual(len(organizations), 2)
+        self.assertEqual(organizations[1][0], organization_id)
+
+    def test_closing_sink_closes_all_files(self):
+        sink = CsvFileSink(self.directory.name)
+        files = list(sink.files)
+        sink.close()
+        self.assertEqual(len(files), 8)
+        self.assertTrue(all(file.closed for file in files))
@@ -0,0 +1,24 @@
+from bc211.models import ImportCheckpoint
+
+
+class ImportCheckpoints:
+    """The checkpoints of the files imported by one importer. They are cleared when an
+    import starts from scratch and when it completes, and kept when it is interrupted so
+    that it can be resumed."""
+
+    def __init__(self, importer_name):
+        self.prefix = importer_name + '/'
+
+    def for_file(self, filename):
+        name = self.prefix + filename
+        checkpoint = ImportCheckpoint.objects.filter(name=name).first()
+        return checkpoint or ImportCheckpoint(name=name)
+
+    def inactive_records(self):
+        return [checkpoint.inactive_records for checkpoint in self.all() if checkpoint.inactive_records]
+
+    def clear(self):
+        self.all().delete()
+
+    def all(self):
+        return ImportCheckpoint.objects.filter(name__startswith=self.prefix)
@@ -36,3 +36,7 @@ class ImportCounters:
 
     def count_phone_at_location(self):
         self.phone_at_location_count += 1
+
+    def add_counts(self, other):
+        for name, count in vars(other).items():
+            setattr(self, name, getattr(self, name) + count)
@@ -1,11 +1,18 @@
 import logging
 import csv
+import xml.etree.ElementTree as etree
 from bc211.is_inactive import is_inactive
-from bc211.import_icarol_xml.parser import parse_agency
+from bc211.import_icarol_xml.parser import parse_agency, parse_optional_field
 from bc211.import_icarol_xml.organization import update_entire_organization
 from django.contrib.gis.geos import Point
+from django.db import transaction
 from bc211.import_icarol_xml.exceptions import XmlParseException
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -16,20 +23,71 @@ def parse_csv(csv_path):
         return city_to_latlong
 
 
-def update_all_organizations(nodes, city_latlong_map, counts):
+def iterparse_agencies(path, use_lxml=True):
+    """Yields ('end', element) for each Agency element in an iCarol XML file, like iterparse
+    does. Each Agency is cleared and removed from the document once it has been processed,
+    when the next one is asked for, so memory use doesn't grow with the size of the file.
+    The lxml parser is used when it is installed, reading only Agency elements."""
+    if use_lxml and lxml_etree:
+        return iterparse_agencies_with_lxml(path)
+    return iterparse_agencies_with_element_tree(path)
+
+
+def iterparse_agencies_with_lxml(path):
+    for _, elem in lxml_etree.iterparse(path, events=('end',), tag='Agency'):
+        yield 'end', elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def iterparse_agencies_with_element_tree(path):
+    nodes = etree.iterparse(path, events=('start', 'end'))
+    _, root = next(nodes)
+    for event, elem in nodes:
+        if event == 'end' and elem.tag == 'Agency':
+            yield event, elem
+            elem.clear()
+            root.clear()
+
+
+def update_all_organizations(nodes, city_latlong_map, counts, checkpoint=None):
     last_organization = None
-    for _, elem in nodes:
-        if elem.tag == 'Agency':
-            try:
-                agency = parse_agency(elem)
-                if is_inactive(agency.description):
-                    continue
-                last_organization = agency.id
+    agencies = (elem for _, elem in nodes if elem.tag == 'Agency')
+    if checkpoint and checkpoint.last_key:
+        agencies = skip_committed_agencies(agencies, checkpoint.last_key)
+    for elem in agencies:
+        try:
+            agency = parse_agency(elem)
+            if is_inactive(agency.description):
+                continue
+            last_organization = agency.id
+            if checkpoint:
+                update_organization_and_checkpoint(agency, city_latlong_map, counts, checkpoint)
+            else:
                 update_entire_organization(agency, city_latlong_map, counts)
-            except XmlParseException as error:
-                handle_xml_parser_exception(error, last_organization)
-            except AttributeError as error:
-                handle_attribute_error(error, last_organization)
+        except XmlParseException as error:
+            handle_xml_parser_exception(error, last_organization)
+        except AttributeError as error:
+            handle_attribute_error(error, last_organization)
+
+
+def skip_committed_agencies(agencies, last_key):
+    for elem in agencies:
+        if parse_optional_field(elem, 'Key') == last_key:
+            LOGGER.info('Resuming import after the organization with id "%s"', last_key)
+            yield from agencies
+            return
+    LOGGER.warning('Organization with id "%s" to resume the import from was not found', last_key)
+
+
+def update_organization_and_checkpoint(agency, city_latlong_map, counts, checkpoint):
+    # The organization is written in one transaction with the checkpoint, so resuming
+    # never imports part of an organization a second time
+    with transaction.atomic():
+        update_entire_organization(agency, city_latlong_map, counts)
+        checkpoint.last_key = agency.id
+        checkpoint.save()
 
 
 def handle_xml_parser_exception(error, last_agency_id):
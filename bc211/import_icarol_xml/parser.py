@@ -1,3 +1,4 @@
+import functools
 import itertools
 import logging
 import re
@@ -12,6 +13,22 @@ from bc211.import_icarol_xml.exceptions import MissingRequiredFieldXmlParseExcep
 
 LOGGER = logging.getLogger(__name__)
 
+PHONE_NUMBERS_SEPARATOR = re.compile('/|or|;')
+PHONE_EXTENSION = re.compile(r'([Ll]ocals?|[Ee]xt\.?|Option|NIS).*')
+PHONE_MNEMONIC_LETTER = re.compile('[a-zA-Z]')
+PHONE_MNEMONIC_BRACKETED_SUFFIX = re.compile(r'\([^(\n]*$', re.MULTILINE)
+TOLL_FREE_PHONE_NUMBER = re.compile(r'1-8\d{2}-\d{3}-\d{4}')
+PHONE_KEYPAD = {'2': 'abc', '3': 'def', '4': 'ghi', '5': 'jkl', '6': 'mno', '7': 'pqrs', '8': 'tuv', '9': 'wxyz'}
+PHONE_DIGITS_TABLE = str.maketrans(
+    {letter: digit for digit, letters in PHONE_KEYPAD.items() for letter in letters + letters.upper()})
+PHONE_DIGITS_TABLE.update(str.maketrans('', '', '- ().,'))
+
+# Short values such as city names are often repeated, so markup is removed from them once
+CACHED_MARKUP_VALUE_LENGTH = 100
+# Values that only contain these tags don't need the HTML parser, the tags are removed as the parser would
+SIMPLE_HTML_TAG = re.compile(r'<(?:/(?:{0}) *|(?:{0}) */?)>'.format('b|strong|i|em|u|br|p|ul|ol|li|span|div'),
+                             re.IGNORECASE)
+
 
 def parse_agency(agency):
     id = parse_agency_key(agency)
@@ -292,14 +309,14 @@ def parse_postal_code(address):
 
 
 def parse_site_phone_number_list(site, site_id):
-    valid_phones = filter(is_valid_phonenumber, site.findall('Phone'))
-    return [parse_site_phone(phone, site_id) for phone in valid_phones]
+    valid_phones = [phone for phone in site.findall('Phone') if is_valid_phonenumber(phone)]
+    phone_numbers = clean_phone_number_column([phone.find('PhoneNumber').text for phone in valid_phones])
+    return [parse_site_phone(phone, site_id, phone_number) for phone, phone_number in zip(valid_phones, phone_numbers)]
 
 
-def parse_site_phone(phone, site_id):
+def parse_site_phone(phone, site_id, phone_number):
     location_id = site_id
     phone_number_type_id = phone.find('Type').text
-    phone_number = clean_phone_numbers(phone.find('PhoneNumber').text)
     return dtos.PhoneAtLocation(
         location_id=location_id,
         phone_number_type_id=phone_number_type_id,
@@ -307,8 +324,19 @@ def parse_site_phone(phone, site_id):
     )
 
 
+def clean_phone_number_column(phone_number_strings, clean=None):
+    clean = clean or clean_phone_numbers
+    cleaned = {}
+    result = []
+    for phone_number_string in phone_number_strings:
+        if phone_number_string not in cleaned:
+            cleaned[phone_number_string] = clean(phone_number_string)
+        result.append(cleaned[phone_number_string])
+    return result
+
+
 def clean_phone_numbers(phone_number_string):
-    phone_numbers = re.split("/|or|;", phone_number_string)
+    phone_numbers = PHONE_NUMBERS_SEPARATOR.split(phone_number_string)
     cleaned_phone_numbers = [clean_one_phone_number(phone_number) for phone_number in phone_numbers]
     toll_free_number = find_toll_free_number(cleaned_phone_numbers)
     if toll_free_number:
@@ -318,70 +346,38 @@ def clean_phone_numbers(phone_number_string):
 
 def clean_one_phone_number(phone_number):
     no_extension_phone_number, extension = separate_phone_number_from_extensions(phone_number)
-    no_alphabet_phone_number = convert_phone_mnemonic(no_extension_phone_number)
-    just_digit_phone_number = remove_separator_characters(no_alphabet_phone_number)
-    truncated_phone_number = truncate_phone_numbers(just_digit_phone_number)
-    if len(truncated_phone_number) == 11:
-        formatted_phone_number = format_eleven_digit_phone_number(truncated_phone_number)
-    elif len(truncated_phone_number) == 10:
-        formatted_phone_number = format_ten_digit_phone_number(truncated_phone_number)
-    else:
-        formatted_phone_number = truncated_phone_number
-    full_phone_number = add_extension_to_phone_number(formatted_phone_number, extension)
-    return full_phone_number
+    just_digit_phone_number = convert_phone_number_to_digits(no_extension_phone_number)
+    formatted_phone_number = format_phone_number(just_digit_phone_number[:11])
+    return add_extension_to_phone_number(formatted_phone_number, extension)
 
 
 def separate_phone_number_from_extensions(phone_number):
-    extension_format = r'([Ll]ocals?|[Ee]xt\.?|Option|NIS).*'
-    found_extension = re.search(extension_format, phone_number)
-    if found_extension:
-        extension = found_extension[0]
-    else:
-        extension = None
-    phone_number = re.sub(extension_format, '', phone_number)
-    return phone_number, extension
-
-
-def convert_phone_mnemonic(phone_number):
-    if re.search(r'[a-zA-Z]', phone_number):
-        phone_number = re.sub(r'[a-cA-C]', '2', phone_number)
-        phone_number = re.sub(r'[d-fD-F]', '3', phone_number)
-        phone_number = re.sub(r'[g-iG-I]', '4', phone_number)
-        phone_number = re.sub(r'[j-lJ-L]', '5', phone_number)
-        phone_number = re.sub(r'[m-oM-O]', '6', phone_number)
-        phone_number = re.sub(r'[p-sP-S]', '7', phone_number)
-        phone_number = re.sub(r'[t-vT-V]', '8', phone_number)
-        phone_number = re.sub(r'[w-zW-Z]', '9', phone_number)
-        separate_number_from_mnenomic_format = r'(\(?.*\)?.*)(\(.*\)?)'
-        phone_number = re.sub(separate_number_from_mnenomic_format, r'\1', phone_number)
-    return phone_number
+    found_extension = PHONE_EXTENSION.search(phone_number)
+    if not found_extension:
+        return phone_number, None
+    return PHONE_EXTENSION.sub('', phone_number), found_extension[0]
 
 
-def remove_separator_characters(phone_number):
-    phone_digit_separator = r'[- \(\)\.,]'
-    phone_number = re.sub(phone_digit_separator, '', phone_number)
-    return phone_number
+def convert_phone_number_to_digits(phone_number):
+    if PHONE_MNEMONIC_LETTER.search(phone_number):
+        # Drops the number in brackets after a mnemonic, as in 1-800-222-TIPS (8477)
+        phone_number = PHONE_MNEMONIC_BRACKETED_SUFFIX.sub('', phone_number)
+    return phone_number.translate(PHONE_DIGITS_TABLE)
 
 
-def truncate_phone_numbers(phone_number):
-    if len(phone_number) > 11:
-        return phone_number[0:11]
-    else:
+def format_phone_number(phone_number):
+    if not phone_number.isdecimal():
         return phone_number
-
-
-def format_eleven_digit_phone_number(phone_number):
-    return re.sub(r'(\d)(\d{3})(\d{3})(\d{4})', r'\1-\2-\3-\4', phone_number)
-
-
-def format_ten_digit_phone_number(phone_number):
-    return re.sub(r'(\d{3})(\d{3})(\d{4})', r'\1-\2-\3', phone_number)
+    if len(phone_number) == 11:
+        return '{0}-{1}-{2}-{3}'.format(phone_number[0], phone_number[1:4], phone_number[4:7], phone_number[7:])
+    if len(phone_number) == 10:
+        return '{0}-{1}-{2}'.format(phone_number[0:3], phone_number[3:6], phone_number[6:])
+    return phone_number
 
 
 def find_toll_free_number(phone_numbers):
-    toll_free_format = r'1-8[\d]{2}-[\d]{3}-[\d]{4}'
     for phone_number in phone_numbers:
-        if re.search(toll_free_format, phone_number):
+        if TOLL_FREE_PHONE_NUMBER.search(phone_number):
             return phone_number
     return None
 
@@ -400,13 +396,29 @@ def is_valid_phonenumber(phone):
 def remove_double_escaped_html_markup(data):
     if data is None:
         return None
+    if not may_contain_markup(data):
+        return data
+    if len(data) <= CACHED_MARKUP_VALUE_LENGTH:
+        return remove_markup_from_short_value(data)
+    return remove_markup(data)
+
 
+def may_contain_markup(data):
+    return '&' in data or '<' in data
+
+
+@functools.lru_cache(maxsize=4096)
+def remove_markup_from_short_value(data):
+    return remove_markup(data)
+
+
+def remove_markup(data):
     unescaped_once = html.unescape(data)
     unescaped_twice = html.unescape(unescaped_once)
-
-    remover = HTMLRemover()
-    remover.feed(unescaped_twice)
-    return remover.get_data()
+    without_simple_tags = SIMPLE_HTML_TAG.sub('', unescaped_twice)
+    if not may_contain_markup(without_simple_tags):
+        return without_simple_tags
+    return HTML_REMOVER.remove_markup(unescaped_twice)
 
 
 class HTMLRemover(HTMLParser):
@@ -415,8 +427,16 @@ class HTMLRemover(HTMLParser):
         self.reset()
         self.strict = False
         self.convert_charrefs = False
+
+    def reset(self):
+        super().reset()
         self.handled_data = []
 
+    def remove_markup(self, data):
+        self.reset()
+        self.feed(data)
+        return self.get_data()
+
     def handle_data(self, data):
         self.handled_data.append(data)
 
@@ -432,6 +452,10 @@ class HTMLRemover(HTMLParser):
     def error(self, message):
         raise RuntimeError(message)
 
+
+HTML_REMOVER = HTMLRemover()
+
+
 # TODO Once csv_import is merged, use the function from there logic is similar.
 def compute_address_id(address_dto):
     return compute_hash(
@@ -0,0 +1,102 @@
+import logging
+import xml.etree.ElementTree as etree
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.db import connections, transaction
+from bc211.is_inactive import is_inactive
+from bc211.import_icarol_xml.exceptions import XmlParseException
+from bc211.import_icarol_xml.importer import (iterparse_agencies, skip_committed_agencies,
+                                              handle_xml_parser_exception, handle_attribute_error,
+                                              lxml_etree)
+from bc211.import_icarol_xml.organization import update_entire_organization
+from bc211.import_icarol_xml.parser import parse_agency
+
+LOGGER = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 50
+PENDING_AGENCIES_PER_JOB = 8
+
+
+def update_all_organizations_in_parallel(path, city_latlong_map, counts, jobs, checkpoint=None):
+    """Parses the agencies of an iCarol XML file in worker processes and writes them in
+    this process, in the order they appear in the file. At most a fixed number of
+    agencies per worker are waiting to be parsed or written, so reading the file
+    doesn't get ahead of writing to the database."""
+    agencies = (elem for _, elem in iterparse_agencies(path))
+    if checkpoint and checkpoint.last_key:
+        agencies = skip_committed_agencies(agencies, checkpoint.last_key)
+    fragments = (to_fragment(elem) for elem in agencies)
+    # Worker processes don't use the database, but must not share the connection of this process
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        parsed_agencies = parse_in_order(executor, fragments, jobs * PENDING_AGENCIES_PER_JOB)
+        write_in_batches(parsed_agencies, city_latlong_map, counts, checkpoint)
+
+
+def to_fragment(elem):
+    if lxml_etree and isinstance(elem, lxml_etree._Element):
+        return lxml_etree.tostring(elem)
+    return etree.tostring(elem)
+
+
+def parse_in_order(executor, fragments, max_pending):
+    pending = deque()
+    for fragment in fragments:
+        pending.append(executor.submit(parse_agency_fragment, fragment))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def parse_agency_fragment(fragment):
+    try:
+        organization = parse_agency(etree.fromstring(fragment))
+    except (XmlParseException, AttributeError) as error:
+        return None, error
+    try:
+        # Sites, services and taxonomy terms are parsed lazily, they must be parsed here
+        organization.locations = parse_all_locations(organization)
+    except (XmlParseException, AttributeError) as error:
+        # As when importing in one process, the organization is saved without its locations
+        organization.locations = []
+        return organization, error
+    return organization, None
+
+
+def parse_all_locations(organization):
+    locations = list(organization.locations)
+    for location in locations:
+        for service in location.services:
+            service.taxonomy_terms = list(service.taxonomy_terms)
+    return locations
+
+
+def write_in_batches(parsed_agencies, city_latlong_map, counts, checkpoint):
+    last_organization = None
+    batch = []
+    for organization, error in parsed_agencies:
+        if organization and not is_inactive(organization.description):
+            last_organization = organization.id
+            batch.append(organization)
+        if isinstance(error, XmlParseException):
+            handle_xml_parser_exception(error, last_organization)
+        elif isinstance(error, AttributeError):
+            handle_attribute_error(error, last_organization)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            write_batch(batch, city_latlong_map, counts, checkpoint)
+            batch = []
+    write_batch(batch, city_latlong_map, counts, checkpoint)
+
+
+@transaction.atomic
+def write_batch(organizations, city_latlong_map, counts, checkpoint):
+    for organization in organizations:
+        try:
+            with transaction.atomic():
+                update_entire_organization(organization, city_latlong_map, counts)
+        except AttributeError as error:
+            handle_attribute_error(error, organization.id)
+    if checkpoint and organizations:
+        checkpoint.last_key = organizations[-1].id
+        checkpoint.save()
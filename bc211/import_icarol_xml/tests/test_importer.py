@@ -1,5 +1,7 @@
 import logging
-from bc211.import_icarol_xml.importer import handle_parser_errors, update_entire_organization
+import unittest
+from bc211.import_icarol_xml.importer import (handle_parser_errors, iterparse_agencies, lxml_etree,
+                                              update_entire_organization)
 from bc211.service import update_services_for_location
 from bc211.import_icarol_xml.location import update_locations
 from bc211.import_icarol_xml.import_counters import ImportCounters
@@ -270,3 +272,25 @@ class FullDataImportTests(TestCase):
         self.assertEqual(self.counts.address_count, 35)
         self.assertEqual(self.counts.phone_number_types_count, 5)
         self.assertEqual(self.counts.phone_at_location_count, 84)
+
+
+class IterparseAgenciesTests(TestCase):
+    def read_agency_keys(self, use_lxml):
+        return [agency.find('Key').text for _, agency in iterparse_agencies(MULTI_AGENCY_FIXTURE, use_lxml)]
+
+    def test_reads_all_agencies(self):
+        keys = self.read_agency_keys(use_lxml=False)
+        self.assertEqual(len(keys), 15)
+        self.assertEqual(keys[0], '9487364')
+
+    @unittest.skipUnless(lxml_etree, 'lxml is not installed')
+    def test_reads_same_agencies_with_either_parser(self):
+        self.assertEqual(self.read_agency_keys(use_lxml=True), self.read_agency_keys(use_lxml=False))
+
+    def test_clears_agencies_already_processed(self):
+        for use_lxml in ((True, False) if lxml_etree else (False,)):
+            agencies = iterparse_agencies(MULTI_AGENCY_FIXTURE, use_lxml)
+            _, first_agency = next(agencies)
+            self.assertIsNotNone(first_agency.find('Key'))
+            next(agencies)
+            self.assertIsNone(first_agency.find('Key'))
@@ -2,6 +2,9 @@ from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 from six import StringIO
+from human_services.locations.models import ServiceAtLocation
+from newcomers_guide.tests.helpers import create_topic
+from search.models import TaskServiceSimilarityScore, TaskServiceAtLocationSimilarityScore
 
 ONE_AGENCY_FIXTURE = 'bc211/import_icarol_xml/tests/data/BC211_data_one_agency.xml'
 MULTI_AGENCY_FIXTURE = 'bc211/import_icarol_xml/tests/data/BC211_data_excerpt.xml'
@@ -24,3 +27,15 @@ class TestImportBc211Data(TestCase):
         out = StringIO()
         with self.assertRaises(CommandError):
             call_command('import_icarol_xml', 'NonExistentFile', stdout=out)
+
+    def test_import_rebuilds_topic_scores_of_services_at_location(self):
+        call_command('import_icarol_xml', ONE_AGENCY_FIXTURE, stdout=StringIO())
+        service = ServiceAtLocation.objects.first().service
+        topic = create_topic('the-topic')
+        TaskServiceSimilarityScore.objects.create(task=topic, service=service, similarity_score=0.5)
+
+        call_command('import_icarol_xml', ONE_AGENCY_FIXTURE, stdout=StringIO())
+
+        expected = {(record.id, record.location.point) for record in ServiceAtLocation.objects.filter(service=service)}
+        scores = TaskServiceAtLocationSimilarityScore.objects.filter(task=topic)
+        self.assertEqual({(score.service_at_location_id, score.point) for score in scores}, expected)
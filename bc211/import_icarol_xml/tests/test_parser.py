@@ -895,6 +895,43 @@ class PhoneNumberParserTests(unittest.TestCase):
             </Site>'''.format(phone_number, phone_number_type)
 
 
+# Outputs of the phone number cleaner before its patterns were precompiled
+GOLDEN_PHONE_NUMBERS = [
+    ('604-555-1234', '604-555-1234'),
+    ('1.604.608.9468', '1-604-608-9468'),
+    ('(604) 555-1234 ext. 22', '604-555-1234 ext. 22'),
+    ('1-800-663-1441 / 604-555-1234', '1-800-663-1441'),
+    ('604-555-1234 or 1-877-555-1234', '1-877-555-1234'),
+    ('604-555-1234; 250-555-9876', '604-555-1234'),
+    ('1-800-SUICIDE', '1-800-784-2433'),
+    ('1-844-START11 (782-7811)', '1-844-782-7811'),
+    ('(250) 555-HELP (4357) (Ext 2)', '2-505-554-3574 Ext 2)'),
+    ('911', '911'),
+    ('12345678901234', '1-234-567-8901'),
+    ('604 555 1234 Option 2 or 3', '604-555-1234 Option 2 '),
+    ('1-800-O-CANADA\n(1-800-622-6232)', '1-800-622-6232'),
+    ('\u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669\u0660',
+     '\u0661\u0662\u0663-\u0664\u0665\u0666-\u0667\u0668\u0669\u0660'),
+    ('', ''),
+]
+
+
+class CleanPhoneNumbersTests(unittest.TestCase):
+    def test_matches_golden_output(self):
+        for phone_number, expected in GOLDEN_PHONE_NUMBERS:
+            with self.subTest(phone_number=phone_number):
+                self.assertEqual(parser.clean_phone_numbers(phone_number), expected)
+
+    def test_cleans_column_of_phone_numbers_in_order(self):
+        phone_numbers = [phone_number for phone_number, _ in GOLDEN_PHONE_NUMBERS]
+        expected = [cleaned for _, cleaned in GOLDEN_PHONE_NUMBERS]
+        self.assertEqual(parser.clean_phone_number_column(phone_numbers + phone_numbers), expected + expected)
+
+    def test_cleans_column_with_given_cleaner(self):
+        cleaned = parser.clean_phone_number_column(['(604) 555-1234', '(604) 555-1234'], parser.clean_one_phone_number)
+        self.assertEqual(cleaned, ['604-555-1234', '604-555-1234'])
+
+
 class HTMLMarkupParserTests(unittest.TestCase):
     def test_removes_doubly_escaped_bold_markup_from_required_field(self):
         xml_agency_key = '''
@@ -943,3 +980,19 @@ class HTMLMarkupParserTests(unittest.TestCase):
         root = etree.fromstring(xml_address)
         address_lines = parser.parse_address_lines(root.find('MailingAddress'))
         self.assertEqual(address_lines, 'Line1')
+
+    def test_returns_value_without_markup_unchanged(self):
+        value = a_string()
+        self.assertEqual(parser.remove_double_escaped_html_markup(value), value)
+
+    def test_removes_markup_and_keeps_escaped_ampersand(self):
+        value = '&amp;lt;p&amp;gt;Parks &amp;amp; Recreation&amp;lt;/p&amp;gt;'
+        self.assertEqual(parser.remove_double_escaped_html_markup(value), 'Parks & Recreation')
+
+    def test_removes_markup_with_attributes(self):
+        value = '&lt;a href="http://www.example.org"&gt;link&lt;/a&gt;'
+        self.assertEqual(parser.remove_double_escaped_html_markup(value), 'link')
+
+    def test_does_not_keep_unfinished_markup_for_next_value(self):
+        self.assertEqual(parser.remove_double_escaped_html_markup('a &lt;b'), 'a ')
+        self.assertEqual(parser.remove_double_escaped_html_markup('c &amp;amp; d'), 'c & d')
@@ -0,0 +1,65 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.test import TestCase
+from bc211.import_checkpoints import ImportCheckpoints
+from bc211.import_icarol_xml.exceptions import XmlParseException
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_icarol_xml.importer import iterparse_agencies
+from bc211.import_icarol_xml.pipelined_importer import (parse_agency_fragment, parse_in_order, to_fragment,
+                                                        write_in_batches)
+from bc211.models import ImportCheckpoint
+from common.testhelpers.random_test_values import a_string
+from human_services.organizations.models import Organization
+
+logging.disable(logging.ERROR)
+
+ONE_AGENCY_FIXTURE = 'bc211/import_icarol_xml/tests/data/BC211_data_one_agency.xml'
+MULTI_AGENCY_FIXTURE = 'bc211/import_icarol_xml/tests/data/BC211_data_excerpt.xml'
+
+
+def read_fragments(path):
+    return [to_fragment(elem) for _, elem in iterparse_agencies(path)]
+
+
+def parse_fragments(path):
+    return [parse_agency_fragment(fragment) for fragment in read_fragments(path)]
+
+
+class ParseAgencyFragmentTests(TestCase):
+    def test_parses_organization_with_all_its_locations(self):
+        organization, error = parse_agency_fragment(read_fragments(ONE_AGENCY_FIXTURE)[0])
+        self.assertIsNone(error)
+        self.assertEqual(organization.id, '9487364')
+        self.assertIsInstance(organization.locations, list)
+        self.assertEqual(len(organization.locations), 1)
+
+    def test_returns_error_for_invalid_agency(self):
+        organization, error = parse_agency_fragment(b'<Agency><Name>' + a_string().encode() + b'</Name></Agency>')
+        self.assertIsNone(organization)
+        self.assertIsInstance(error, XmlParseException)
+
+    def test_keeps_order_of_agencies_in_file(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parsed = list(parse_in_order(executor, read_fragments(MULTI_AGENCY_FIXTURE), 3))
+        expected = [organization.id for organization, _ in parse_fragments(MULTI_AGENCY_FIXTURE)]
+        self.assertEqual([organization.id for organization, _ in parsed], expected)
+
+
+class WriteInBatchesTests(TestCase):
+    def test_counts_records_created(self):
+        counts = ImportCounters()
+        write_in_batches(parse_fragments(MULTI_AGENCY_FIXTURE), {}, counts, None)
+        self.assertEqual(counts.organizations_created, 15)
+        self.assertEqual(counts.locations_created, 39)
+
+    def test_skips_agencies_with_errors(self):
+        parsed = [(None, XmlParseException(a_string()))] + parse_fragments(ONE_AGENCY_FIXTURE)
+        write_in_batches(parsed, {}, ImportCounters(), None)
+        self.assertEqual(Organization.objects.count(), 1)
+
+    def test_saves_key_of_last_organization_written(self):
+        checkpoint = ImportCheckpoints(a_string()).for_file(a_string())
+        parsed = parse_fragments(MULTI_AGENCY_FIXTURE)
+        write_in_batches(parsed, {}, ImportCounters(), checkpoint)
+        last_organization, _ = parsed[-1]
+        self.assertEqual(ImportCheckpoint.objects.get(name=checkpoint.name).last_key, last_organization.id)
@@ -1,12 +1,15 @@
 from django.db import connection
 from django.test import TestCase
 from django.utils import translation
+from bc211.import_checkpoints import ImportCheckpoints
 from bc211.import_icarol_xml import dtos
+from bc211.models import ImportCheckpoint
 from bc211.import_icarol_xml.importer import update_entire_organization, update_all_organizations
 from bc211.import_icarol_xml.location import update_locations
 from bc211.import_icarol_xml.import_counters import ImportCounters
 from human_services.addresses.models import Address, AddressType
 from human_services.addresses.tests.helpers import AddressBuilder
+from human_services.organizations.models import Organization
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
 from human_services.locations.tests.helpers import LocationBuilder
@@ -37,6 +40,25 @@ class UpdateOrganizationTests(TestCase):
 
         self.assertEqual(counters.organizations_created, 1)
 
+    def test_resumes_after_last_organization_committed(self):
+        BASELINE = 'bc211/import_icarol_xml/tests/data/BC211_data_excerpt.xml'
+        checkpoint = ImportCheckpoints(a_string()).for_file('BC211_data_excerpt.xml')
+        checkpoint.last_key = '9487364'
+        nodes = etree.iterparse(BASELINE, events=('end',))
+        update_all_organizations(nodes, {}, ImportCounters(), checkpoint)
+
+        self.assertFalse(Organization.objects.filter(id='9487364').exists())
+        self.assertTrue(Organization.objects.filter(id='9487365').exists())
+
+    def test_saves_key_of_last_organization_committed(self):
+        BASELINE = 'bc211/import_icarol_xml/tests/data/BC211_data_one_agency.xml'
+        checkpoint = ImportCheckpoints(a_string()).for_file('BC211_data_one_agency.xml')
+        nodes = etree.iterparse(BASELINE, events=('end',))
+        update_all_organizations(nodes, {}, ImportCounters(), checkpoint)
+
+        saved = ImportCheckpoint.objects.get(name=checkpoint.name)
+        self.assertEqual(saved.last_key, Organization.objects.get().id)
+
 
 class LocationsUnderOrganizationTests(TestCase):
 
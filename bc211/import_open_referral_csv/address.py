@@ -1,7 +1,7 @@
 import csv
 import os
 import logging
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.exceptions import ValidationError
 from human_services.addresses.models import Address, AddressType
 from human_services.locations.models import LocationAddress, Location
 from bc211.import_open_referral_csv import parser
@@ -9,17 +9,21 @@ from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
 from bc211.import_open_referral_csv.exceptions import CsvParseException
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_addresses_file(root_folder, collector, counters):
+def import_addresses_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'addresses.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -27,38 +31,87 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector, counters)
+        read_and_import_rows(reader, collector, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'type', 'location_id', 'attention', 'address_1', 'address_2', 'address_3',
                 'address_4', 'city', 'region', 'state_province', 'postal_code', 'country']
 
 
-def read_and_import_rows(reader, collector, counters):
-    for row in reader:
-        if not row:
-            continue
-        address_active_record = get_or_create_address(row, counters)
-        import_location_address(row, address_active_record, collector, counters)
-
-
-def get_or_create_address(row, counters):
-    if Address.objects.filter(pk=row[0]).exists():
-        return Address.objects.get(pk=row[0])
-    else:
-        return import_address(row, counters)
+def read_and_import_rows(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    importer = AddressImporter(counters, lookups)
+
+    def add_row(row):
+        address_id = importer.add_address_if_new(row)
+        importer.add_location_address(row, address_id, collector)
+
+    import_rows(reader, add_row, [importer], checkpoint, collector)
+
+
+class AddressImporter:
+    """Writes addresses and location addresses in batches, addresses are written before
+    the location addresses that refer to them."""
+
+    def __init__(self, counters, lookups):
+        self.address_ids = lookups.ids_of(Address)
+        self.location_ids = lookups.ids_of(Location)
+        self.address_type_ids = lookups.ids_of(AddressType)
+        self.location_address_types = lookups.location_address_types_in_use()
+        self.address_writer = BatchWriter(Address, counters.count_address, delta=lookups.delta)
+        self.compare = lookups.compares_with_previous_import()
+        self.added_address_ids = set()
+        self.location_address_writer = BatchWriter(LocationAddress, counters.count_location_address,
+                                                   flush_first=[self.address_writer], delta=lookups.delta)
+
+    def add_address_if_new(self, row):
+        address_id = row[0]
+        # When comparing, addresses already in the database are compared by the delta so
+        # that changed ones are updated, each address is still only added once per run
+        if address_id in self.added_address_ids or (address_id in self.address_ids and not self.compare):
+            return address_id
+        try:
+            active_record = build_address_active_record(row)
+            self.address_writer.add(active_record)
+            self.address_ids.add(active_record.id)
+            self.added_address_ids.add(active_record.id)
+            return active_record.id
+        except ValidationError as error:
+            LOGGER.warning('%s', error.__str__())
+        except CsvParseException as error:
+            LOGGER.warning('%s', error.__str__())
+        return address_id if address_id in self.address_ids else None
+
+    def add_location_address(self, row, address_id, collector):
+        location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[2])
+        if collector.has_inactive_location_id(location_id):
+            return
+        try:
+            address_type = parser.parse_required_field_with_double_escaped_html('address_type', row[1])
+            active_record = LocationAddress(address_id=address_id,
+                                            location_id=location_id,
+                                            address_type_id=address_type)
+            check_foreign_key(active_record, 'address', self.address_ids)
+            check_foreign_key(active_record, 'location', self.location_ids)
+            check_foreign_key(active_record, 'address_type', self.address_type_ids)
+            if (location_id, address_type) in self.location_address_types:
+                raise ValidationError('Location address with this Location and Address type already exists.')
+            self.location_address_writer.add(active_record)
+            self.location_address_types.add((location_id, address_type))
+        except ValidationError as error:
+            LOGGER.warning(
+                'ValidationError in row with location id "%s" and address "%s": %s',
+                location_id, address_id, error)
+
+    def flush(self):
+        self.location_address_writer.flush()
 
 
 def import_address(row, counters):
-    try:
-        address_active_record = build_address_active_record(row)
-        address_active_record.save()
-        counters.count_address()
-        return address_active_record
-    except ValidationError as error:
-        LOGGER.warning('%s', error.__str__())
-    except CsvParseException as error:
-        LOGGER.warning('%s', error.__str__())
+    importer = AddressImporter(counters, ImportLookups())
+    address_id = importer.add_address_if_new(row)
+    importer.flush()
+    return Address.objects.filter(pk=address_id).first() if address_id else None
 
 
 def build_address_active_record(row):
@@ -75,31 +128,6 @@ def build_address_active_record(row):
 
 
 def import_location_address(row, address, collector, counters):
-    location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[2])
-    if collector.has_inactive_location_id(location_id):
-        return
-    create_location_address_active_record(row, address, location_id, counters)
-
-
-def create_location_address_active_record(row, address, location_id, counters):
-    try:
-        address_type = parser.parse_required_field_with_double_escaped_html('address_type', row[1])
-        location_active_record = get_active_record_or_raise(location_id, Location)
-        address_type_active_record = get_active_record_or_raise(address_type, AddressType)
-        LocationAddress(
-                address=address,
-                location=location_active_record,
-                address_type=address_type_active_record
-        ).save()
-        counters.count_location_address()
-    except ValidationError as error:
-        LOGGER.warning(
-            'ValidationError in row with location id "%s" and address "%s": %s',
-            location_id, address, error)
-
-
-def get_active_record_or_raise(active_record_id, model):
-    try:
-        return model.objects.get(pk=active_record_id)
-    except ObjectDoesNotExist as error:
-        LOGGER.warning('Record with id %s does not exist. %s', active_record_id, error)
+    importer = AddressImporter(counters, ImportLookups())
+    importer.add_location_address(row, address.id if address else None, collector)
+    importer.flush()
@@ -0,0 +1,148 @@
+import logging
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from common.models import ValidateOnSaveMixin
+from bc211.import_open_referral_csv import import_delta
+from bc211.import_open_referral_csv.translations import get_translations
+
+LOGGER = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class BatchWriter:
+    """Collects active records of one model and writes them with bulk_create, one
+    transaction per batch, together with their parler translations. Records are validated
+    in Python when they are added, except for their foreign keys, which callers check
+    against sets of known ids with check_foreign_key() instead of one query per row.
+
+    If a batch can't be inserted, for example because some records already exist, the
+    records in it are saved one by one, so that invalid ones and ones that already exist are
+    logged and skipped, as when importing row by row. Only the records created are counted.
+    Writers which update existing records, by default those comparing with the previous
+    import, update the ones that already exist instead of skipping them.
+
+    With a delta, the content hash of each record written is saved, and records that are
+    unchanged since the previous import are skipped and changed ones replaced."""
+
+    def __init__(self, model, count_record=None, flush_first=(), batch_size=BATCH_SIZE,
+                 ignore_conflicts=False, delta=None, update_existing=None):
+        self.model = model
+        self.count_record = count_record
+        self.flush_first = flush_first
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.delta = delta
+        if update_existing is None:
+            update_existing = bool(delta and delta.compare)
+        self.update_existing = update_existing
+        self.foreign_key_names = [field.name for field in model._meta.fields if field.is_relation]
+        self.records = []
+        self.changed_records = []
+
+    def add(self, active_record):
+        validate_active_record(active_record, self.foreign_key_names)
+        status = self.delta.compare_record(active_record) if self.delta else import_delta.CREATED
+        if status == import_delta.UNCHANGED:
+            return
+        if status == import_delta.UPDATED:
+            self.changed_records.append(active_record)
+        else:
+            self.records.append(active_record)
+        if len(self.records) + len(self.changed_records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for writer in self.flush_first:
+            writer.flush()
+        if self.changed_records:
+            self.replace_changed_records()
+        if not self.records:
+            return
+        records, self.records = self.records, []
+        updated = []
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(records, ignore_conflicts=self.ignore_conflicts)
+                translations = [t for record in records for t in get_translations(record)]
+                if translations:
+                    translations[0].__class__.objects.bulk_create(translations)
+        except IntegrityError as error:
+            LOGGER.info('Saving %d %s records one by one: %s', len(records), self.model.__name__, error)
+            records, updated = self.save_one_by_one(records)
+        self.count_records(records)
+        if self.delta:
+            import_delta.save_hashes(records + updated)
+
+    def save_one_by_one(self, records):
+        if not self.update_existing:
+            return save_one_by_one(records), []
+        ids = [record.pk for record in records if record.pk is not None]
+        existing_ids = set(self.model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        new_records = [record for record in records if record.pk not in existing_ids]
+        existing_records = [record for record in records if record.pk in existing_ids]
+        return save_one_by_one(new_records), update_one_by_one(existing_records)
+
+    def replace_changed_records(self):
+        records, self.changed_records = self.changed_records, []
+        if import_delta.has_generated_primary_key(self.model):
+            # Records without a key of their own are replaced by new ones
+            import_delta.delete_previous_records(self.model, records)
+            self.records += records
+            return
+        import_delta.save_hashes(update_one_by_one(records))
+
+    def count_records(self, records):
+        if self.count_record:
+            for _ in records:
+                self.count_record()
+
+
+def validate_active_record(active_record, foreign_key_names):
+    # Only models with ValidateOnSaveMixin are validated when saved one by one
+    if not isinstance(active_record, ValidateOnSaveMixin):
+        return
+    try:
+        active_record.full_clean(exclude=foreign_key_names, validate_unique=False)
+        for translation in get_translations(active_record):
+            translation.full_clean(exclude=['master'], validate_unique=False)
+    except ValidationError as error:
+        raise active_record.build_validation_error_no_throw(error)
+
+
+def save_one_by_one(records):
+    saved = []
+    for record in records:
+        try:
+            with transaction.atomic():
+                record.save()
+            saved.append(record)
+        except (ValidationError, IntegrityError) as error:
+            LOGGER.warning('%s', error.__str__())
+    return saved
+
+
+def update_one_by_one(records):
+    updated = []
+    for record in records:
+        try:
+            with transaction.atomic():
+                # The translations are saved again as new ones
+                if hasattr(record, '_parler_meta'):
+                    import_delta.delete_translations(record.__class__, [record.pk])
+                record._state.adding = False
+                record.save()
+            updated.append(record)
+        except (ValidationError, IntegrityError) as error:
+            LOGGER.warning('%s', error.__str__())
+    return updated
+
+
+def check_foreign_key(active_record, field_name, known_ids):
+    value = getattr(active_record, field_name + '_id')
+    if value not in known_ids:
+        error = ValidationError({field_name: ['{0} instance with id "{1}" does not exist.'.format(
+            field_name, value)]})
+        if isinstance(active_record, ValidateOnSaveMixin):
+            raise active_record.build_validation_error_no_throw(error)
+        raise error
@@ -0,0 +1,191 @@
+import json
+import logging
+from collections import Counter, defaultdict
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Q
+from bc211.import_icarol_xml.parser import compute_hash
+from bc211.import_open_referral_csv.translations import get_translations
+from bc211.models import ImportedRecordHash
+from human_services.addresses.models import Address
+from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+from search.models import TaskServiceSimilarityScore
+
+LOGGER = logging.getLogger(__name__)
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DELETED = 'deleted'
+
+HASH_SEPARATOR = '\x1f'
+DELETE_CHUNK_SIZE = 500
+
+SERVICE_LABEL = Service._meta.label_lower
+ADDRESS_LABEL = Address._meta.label_lower
+
+# Records are identified by the values of their primary key, or of the fields that identify
+# them for models with generated primary keys. Records that are no longer imported are deleted in
+# this order, so that records are deleted before the records they refer to
+KEY_FIELDS = {
+    Service.taxonomy_terms.through._meta.label_lower: ['service_id', 'taxonomyterm_id'],
+    PhoneAtLocation._meta.label_lower: ['location_id', 'phone_number_type_id', 'phone_number'],
+    LocationAddress._meta.label_lower: ['location_id', 'address_type_id'],
+    ADDRESS_LABEL: ['id'],
+    ServiceAtLocation._meta.label_lower: ['service_id', 'location_id'],
+    Service._meta.label_lower: ['id'],
+    Location._meta.label_lower: ['id'],
+    Organization._meta.label_lower: ['id'],
+}
+
+
+class ImportDelta:
+    """Records the content hash of each record written by an import. When comparing with
+    the previous import, records whose hash hasn't changed are not written again, records
+    whose hash has changed are updated, and records that are no longer imported are
+    deleted once all files have been imported."""
+
+    def __init__(self, compare=False):
+        self.compare = compare
+        self.previous_hashes = {}
+        self.current_keys = defaultdict(set)
+        self.counts = Counter()
+        self.changed_service_ids = set()
+        self.removed_service_ids = set()
+
+    def compare_record(self, record):
+        label = record._meta.label_lower
+        key = compute_record_key(record)
+        keys = self.current_keys[label]
+        if self.compare and key in keys:
+            return UNCHANGED
+        keys.add(key)
+        previous_hash = self.previous_hashes_of(label).get(key) if self.compare else None
+        if previous_hash is None:
+            status = CREATED
+        elif previous_hash == compute_record_hash(record):
+            status = UNCHANGED
+        else:
+            status = UPDATED
+        self.counts[label, status] += 1
+        if label == SERVICE_LABEL and status != UNCHANGED:
+            self.changed_service_ids.add(get_id(key))
+        return status
+
+    def previous_hashes_of(self, label):
+        if label not in self.previous_hashes:
+            self.previous_hashes[label] = {
+                tuple(key_values): content_hash for key_values, content_hash in
+                ImportedRecordHash.objects.filter(model=label).values_list('key_values', 'content_hash')}
+        return self.previous_hashes[label]
+
+    def add_delta(self, other):
+        for label, keys in other.current_keys.items():
+            self.current_keys[label] |= keys
+        self.counts.update(other.counts)
+        self.changed_service_ids |= other.changed_service_ids
+        self.removed_service_ids |= other.removed_service_ids
+
+    @transaction.atomic
+    def delete_removed_records(self):
+        if not self.compare:
+            return
+        self.previous_hashes = {}
+        for label, key_fields in KEY_FIELDS.items():
+            removed_keys = set(self.previous_hashes_of(label)) - self.current_keys[label]
+            if label == ADDRESS_LABEL:
+                # Addresses are protected while locations imported otherwise still refer to them
+                removed_keys -= {(address_id,) for address_id in LocationAddress.objects.filter(
+                    address_id__in=map(get_id, removed_keys)).values_list('address_id', flat=True)}
+            if not removed_keys:
+                continue
+            LOGGER.info('Deleting %d %s records that are no longer imported', len(removed_keys), label)
+            if label == SERVICE_LABEL:
+                removed_ids = set(map(get_id, removed_keys))
+                self.removed_service_ids |= removed_ids
+                TaskServiceSimilarityScore.objects.filter(service_id__in=removed_ids).delete()
+            delete_records_by_keys(apps.get_model(label), key_fields, removed_keys)
+            delete_hashes(label, removed_keys)
+            self.counts[label, DELETED] += len(removed_keys)
+
+    def summary(self):
+        lines = []
+        for label in reversed(list(KEY_FIELDS)):
+            counts = ', '.join('{0} {1}'.format(self.counts[label, status], status)
+                               for status in (CREATED, UPDATED, DELETED, UNCHANGED))
+            lines.append('{0}: {1}'.format(label, counts))
+        return lines
+
+
+def compute_record_key(record):
+    key_fields = KEY_FIELDS[record._meta.label_lower]
+    return tuple(str(getattr(record, field)) for field in key_fields)
+
+
+def compute_key_digest(key):
+    # Keys made of several text fields can be longer than an index entry can hold, so the
+    # hashes are looked up by a digest of the key, the key itself is kept for deleting
+    return compute_hash(json.dumps(key))
+
+
+def get_id(key):
+    return key[0]
+
+
+def compute_record_hash(record):
+    values = [to_hash_value(getattr(record, field.attname))
+              for field in record._meta.concrete_fields if not field.primary_key]
+    for translation in get_translations(record):
+        values.append(translation.language_code)
+        values += [to_hash_value(getattr(translation, name)) for name in translation.get_translated_fields()]
+    return compute_hash(HASH_SEPARATOR.join(values))
+
+
+def to_hash_value(value):
+    return '' if value is None else str(value)
+
+
+def has_generated_primary_key(model):
+    return KEY_FIELDS[model._meta.label_lower] != ['id']
+
+
+def delete_records_by_keys(model, key_fields, keys):
+    if key_fields == ['id']:
+        model.objects.filter(id__in=[get_id(key) for key in keys]).delete()
+        return
+    keys = list(keys)
+    for start in range(0, len(keys), DELETE_CHUNK_SIZE):
+        query = Q()
+        for key in keys[start:start + DELETE_CHUNK_SIZE]:
+            query |= Q(**dict(zip(key_fields, key)))
+        model.objects.filter(query).delete()
+
+
+def delete_previous_records(model, records):
+    key_fields = KEY_FIELDS[model._meta.label_lower]
+    delete_records_by_keys(model, key_fields, [compute_record_key(record) for record in records])
+
+
+def delete_translations(model, ids):
+    for meta in model._parler_meta:
+        meta.model.objects.filter(master_id__in=ids).delete()
+
+
+def save_hashes(records):
+    if not records:
+        return
+    label = records[0]._meta.label_lower
+    hashes = {compute_record_key(record): compute_record_hash(record) for record in records}
+    delete_hashes(label, hashes)
+    ImportedRecordHash.objects.bulk_create(
+        [ImportedRecordHash(model=label, key=compute_key_digest(key), key_values=list(key), content_hash=content_hash)
+         for key, content_hash in hashes.items()])
+
+
+def delete_hashes(label, keys):
+    digests = [compute_key_digest(key) for key in keys]
+    for start in range(0, len(digests), DELETE_CHUNK_SIZE):
+        ImportedRecordHash.objects.filter(model=label, key__in=digests[start:start + DELETE_CHUNK_SIZE]).delete()
@@ -0,0 +1,40 @@
+from human_services.locations.models import LocationAddress
+from taxonomies.models import TaxonomyTerm
+
+
+class ImportLookups:
+    """Keys of the records in the database, shared by all the files of one import run.
+    Each set is read with one query the first time it is needed and is then kept up to
+    date by the importers as they add records, so that foreign keys can be checked and
+    existing records skipped without querying for each row.
+
+    When the run is compared with the previous import, existing addresses and location
+    addresses are compared by the delta, and changed taxonomy terms are updated, instead
+    of being skipped."""
+
+    def __init__(self, delta=None):
+        self.delta = delta
+        self.ids = {}
+        self.location_address_types = None
+        self.taxonomy_terms = None
+
+    def ids_of(self, model):
+        if model not in self.ids:
+            self.ids[model] = set(model.objects.values_list('pk', flat=True))
+        return self.ids[model]
+
+    def compares_with_previous_import(self):
+        return bool(self.delta and self.delta.compare)
+
+    def location_address_types_in_use(self):
+        if self.location_address_types is None and self.compares_with_previous_import():
+            self.location_address_types = set()
+        if self.location_address_types is None:
+            self.location_address_types = set(
+                LocationAddress.objects.values_list('location_id', 'address_type_id'))
+        return self.location_address_types
+
+    def existing_taxonomy_terms(self):
+        if self.taxonomy_terms is None:
+            self.taxonomy_terms = set(TaxonomyTerm.objects.values_list('id', 'name', 'taxonomy_id'))
+        return self.taxonomy_terms
@@ -0,0 +1,39 @@
+from itertools import islice
+from django.db import transaction
+
+CHECKPOINT_ROWS = 1000
+
+
+def import_rows(reader, add_row, writers, checkpoint=None, collector=None):
+    if checkpoint is None:
+        for row in reader:
+            if row:
+                add_row(row)
+        flush_all(writers)
+        return
+    import_rows_with_checkpoint(reader, add_row, writers, checkpoint, collector)
+
+
+def import_rows_with_checkpoint(reader, add_row, writers, checkpoint, collector):
+    # Each chunk of rows is written in one transaction together with the checkpoint, so
+    # after an interruption either all of it or none of it is in the database, and the
+    # import resumes with the first row of the chunk that wasn't committed
+    rows = islice(reader, checkpoint.rows_committed, None)
+    while True:
+        chunk = list(islice(rows, CHECKPOINT_ROWS))
+        if not chunk:
+            return
+        with transaction.atomic():
+            for row in chunk:
+                if row:
+                    add_row(row)
+            flush_all(writers)
+            checkpoint.rows_committed += len(chunk)
+            if collector is not None:
+                checkpoint.inactive_records = collector.as_dict()
+            checkpoint.save()
+
+
+def flush_all(writers):
+    for writer in writers:
+        writer.flush()
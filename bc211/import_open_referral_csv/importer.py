@@ -7,15 +7,37 @@ from bc211.import_open_referral_csv.phone import import_phones_file
 from bc211.import_open_referral_csv.taxonomy import import_taxonomy_file
 from bc211.import_open_referral_csv.service_taxonomy import import_services_taxonomy_file
 from bc211.import_open_referral_csv.import_missing_coordinates import import_missing_coordinates
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
 
-def import_open_referral_files(root_folder, collector, counters, city_latlong_map):
-    import_organizations_file(root_folder, collector, counters)
-    import_services_file(root_folder, collector, counters)
-    import_locations_file(root_folder, collector, counters)
-    import_services_at_location_file(root_folder, collector, counters)
-    import_addresses_file(root_folder, collector, counters)
-    import_phones_file(root_folder, collector, counters)
-    import_taxonomy_file(root_folder, counters)
-    import_services_taxonomy_file(root_folder, collector)
+
+def import_taxonomy_stage(root_folder, collector, counters, lookups, checkpoints=None):
+    import_taxonomy_file(root_folder, counters, lookups, checkpoints)
+
+
+def import_services_taxonomy_stage(root_folder, collector, counters, lookups, checkpoints=None):
+    import_services_taxonomy_file(root_folder, collector, lookups, checkpoints)
+
+
+# Each stage imports one file, and must run after the stages for the files that it refers
+# to, both for the foreign keys and for the ids of inactive records that they collect
+IMPORT_STAGES = {
+    'organizations': ([], import_organizations_file),
+    'services': (['organizations'], import_services_file),
+    'locations': (['organizations'], import_locations_file),
+    'services_at_location': (['services', 'locations'], import_services_at_location_file),
+    'addresses': (['locations'], import_addresses_file),
+    'phones': (['locations'], import_phones_file),
+    'taxonomy': ([], import_taxonomy_stage),
+    'services_taxonomy': (['services', 'taxonomy'], import_services_taxonomy_stage),
+}
+
+
+def import_open_referral_files(root_folder, collector, counters, city_latlong_map, checkpoints=None,
+                               delta=None):
+    lookups = ImportLookups(delta)
+    for _, import_stage in IMPORT_STAGES.values():
+        import_stage(root_folder, collector, counters, lookups, checkpoints)
+    if delta:
+        delta.delete_removed_records()
     if city_latlong_map:
         import_missing_coordinates(city_latlong_map)
@@ -1,20 +1,21 @@
+import json
 from bc211.is_inactive import is_inactive
 
 
 class InactiveRecordsCollector:
     def __init__(self):
-        self.inactive_organizations_ids = []
-        self.inactive_services_ids = []
-        self.inactive_locations_ids = []
+        self.inactive_organizations_ids = set()
+        self.inactive_services_ids = set()
+        self.inactive_locations_ids = set()
 
     def add_inactive_organization_id(self, organization_id):
-        self.inactive_organizations_ids.append(organization_id)
+        self.inactive_organizations_ids.add(organization_id)
 
     def add_inactive_service_id(self, service_id):
-        self.inactive_services_ids.append(service_id)
+        self.inactive_services_ids.add(service_id)
 
     def add_inactive_location_id(self, location_id):
-        self.inactive_locations_ids.append(location_id)
+        self.inactive_locations_ids.add(location_id)
 
     def organization_has_inactive_data(self, organization_id, description):
         if is_inactive(description):
@@ -42,3 +43,32 @@ class InactiveRecordsCollector:
 
     def has_inactive_location_id(self, location_id):
         return location_id in self.inactive_locations_ids
+
+    def add_inactive_ids(self, other):
+        self.inactive_organizations_ids |= other.inactive_organizations_ids
+        self.inactive_services_ids |= other.inactive_services_ids
+        self.inactive_locations_ids |= other.inactive_locations_ids
+
+    def as_dict(self):
+        return {
+            'organizations': sorted(self.inactive_organizations_ids),
+            'services': sorted(self.inactive_services_ids),
+            'locations': sorted(self.inactive_locations_ids),
+        }
+
+    def write_to_file(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.as_dict(), file, indent=1)
+
+
+def read_inactive_records_file(path):
+    with open(path, 'r') as file:
+        return build_collector_from_dict(json.load(file))
+
+
+def build_collector_from_dict(content):
+    collector = InactiveRecordsCollector()
+    collector.inactive_organizations_ids = set(content['organizations'])
+    collector.inactive_services_ids = set(content['services'])
+    collector.inactive_locations_ids = set(content['locations'])
+    return collector
@@ -4,22 +4,27 @@ import logging
 from django.utils import translation
 from django.contrib.gis.geos import Point
 from django.core.exceptions import ValidationError
+from human_services.organizations.models import Organization
 from human_services.locations.models import Location
 from bc211.import_open_referral_csv import parser
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_locations_file(root_folder, collector, counters):
+def import_locations_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'location.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -27,21 +32,24 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_row(reader, collector, counters)
+        read_and_import_row(reader, collector, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'organization_id', 'name', 'alternate_name', 'description',
                 'transportation', 'latitude', 'longitude']
 
 
-def read_and_import_row(reader, collector, counters):
-    for row in reader:
-        if not row:
-            continue
-        import_location(row, collector, counters)
+def read_and_import_row(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    writer = BatchWriter(Location, counters.count_locations_created, delta=lookups.delta)
 
+    def add_row(row):
+        add_location(row, collector, lookups, writer)
 
-def import_location(row, collector, counters):
+    import_rows(reader, add_row, [writer], checkpoint, collector)
+
+
+def add_location(row, collector, lookups, writer):
     try:
         translation.activate('en')
         location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[0])
@@ -53,12 +61,19 @@ def import_location(row, collector, counters):
         if collector.location_has_inactive_data(organization_id, location_id, description):
             return
         active_record = build_location_active_record(row, location_id, organization_id, description)
-        active_record.save()
-        counters.count_locations_created()
+        check_foreign_key(active_record, 'organization', lookups.ids_of(Organization))
+        writer.add(active_record)
+        lookups.ids_of(Location).add(active_record.id)
     except ValidationError as error:
         LOGGER.warning('%s', error.__str__())
 
 
+def import_location(row, collector, counters):
+    writer = BatchWriter(Location, counters.count_locations_created)
+    add_location(row, collector, ImportLookups(), writer)
+    writer.flush()
+
+
 def build_location_active_record(row, location_id, organization_id, description):
     location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[0])
     active_record = Location()
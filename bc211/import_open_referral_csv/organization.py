@@ -8,17 +8,21 @@ from bc211.import_open_referral_csv import parser
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_organizations_file(root_folder, collector, counters):
+def import_organizations_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'organizations.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -26,21 +30,24 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector, counters)
+        read_and_import_rows(reader, collector, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'name', 'alternate_name', 'description', 'email', 'url',
                 'tax_status', 'tax_id', 'year_incorporated', 'legal_status']
 
 
-def read_and_import_rows(reader, collector, counters):
-    for row in reader:
-        if not row:
-            continue
-        import_organization(row, collector, counters)
+def read_and_import_rows(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    writer = BatchWriter(Organization, counters.count_organization_created, delta=lookups.delta)
 
+    def add_row(row):
+        add_organization(row, collector, lookups, writer)
 
-def import_organization(row, collector, counters):
+    import_rows(reader, add_row, [writer], checkpoint, collector)
+
+
+def add_organization(row, collector, lookups, writer):
     try:
         translation.activate('en')
         organization_id = parser.parse_required_field_with_double_escaped_html(
@@ -50,13 +57,18 @@ def import_organization(row, collector, counters):
         description = parser.parse_optional_field_with_double_escaped_html(row[3])
         if collector.organization_has_inactive_data(organization_id, description):
             return
-        active_record = build_active_record(row, organization_id, description)
-        active_record.save()
-        counters.count_organization_created()
+        writer.add(build_active_record(row, organization_id, description))
+        lookups.ids_of(Organization).add(organization_id)
     except ValidationError as error:
         LOGGER.warning('%s', error.__str__())
 
 
+def import_organization(row, collector, counters):
+    writer = BatchWriter(Organization, counters.count_organization_created)
+    add_organization(row, collector, ImportLookups(), writer)
+    writer.flush()
+
+
 def build_active_record(row, organization_id, description):
     active_record = Organization()
     active_record.id = organization_id
@@ -0,0 +1,58 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.db import connections
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.importer import IMPORT_STAGES
+from bc211.import_open_referral_csv.import_delta import ImportDelta
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_missing_coordinates import import_missing_coordinates
+
+LOGGER = logging.getLogger(__name__)
+
+
+def import_open_referral_files_in_parallel(root_folder, collector, counters, city_latlong_map, jobs,
+                                           checkpoints=None, delta=None):
+    # Worker processes must not share the database connection of this process, closing
+    # it here makes each of them open its own
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=close_database_connections) as executor:
+        done = set()
+        running = {}
+        while len(done) < len(IMPORT_STAGES):
+            for stage in find_ready_stages(done, running.values()):
+                LOGGER.info('Starting import of %s', stage)
+                stage_delta = ImportDelta(delta.compare) if delta else None
+                future = executor.submit(run_stage, stage, root_folder, collector, checkpoints, stage_delta)
+                running[future] = stage
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                stage_counters, stage_collector, stage_delta = future.result()
+                counters.add_counts(stage_counters)
+                collector.add_inactive_ids(stage_collector)
+                if delta:
+                    delta.add_delta(stage_delta)
+                done.add(stage)
+                LOGGER.info('Finished import of %s', stage)
+    if delta:
+        delta.delete_removed_records()
+    if city_latlong_map:
+        import_missing_coordinates(city_latlong_map)
+
+
+def find_ready_stages(done, running):
+    return [stage for stage, (dependencies, _) in IMPORT_STAGES.items()
+            if stage not in done and
+            stage not in running and
+            all(dependency in done for dependency in dependencies)]
+
+
+def run_stage(stage, root_folder, collector, checkpoints=None, delta=None):
+    counters = ImportCounters()
+    _, import_stage = IMPORT_STAGES[stage]
+    import_stage(root_folder, collector, counters, ImportLookups(delta), checkpoints)
+    return (counters, collector, delta)
+
+
+def close_database_connections():
+    connections.close_all()
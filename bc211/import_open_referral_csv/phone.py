@@ -2,25 +2,29 @@ import csv
 import os
 import logging
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
 from bc211.import_open_referral_csv import parser
 from bc211.import_open_referral_csv.exceptions import CsvParseException
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
+from human_services.locations.models import Location
 from human_services.phone_at_location.models import PhoneNumberType, PhoneAtLocation
 
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_phones_file(root_folder, collector, counters):
+def import_phones_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'phones.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -28,7 +32,7 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector, counters)
+        read_and_import_rows(reader, collector, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'location_id', 'service_id', 'organization_id', 'contact_id',
@@ -36,36 +40,64 @@ expected_headers = ['id', 'location_id', 'service_id', 'organization_id', 'conta
                     'description', 'department']
 
 
-def read_and_import_rows(reader, collector, counters):
-    for row in reader:
-        if not row:
-            continue
-        import_phone(row, collector, counters)
+def read_and_import_rows(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    importer = PhoneImporter(counters, lookups)
+
+    def add_row(row):
+        importer.add_phone(row, collector)
+
+    import_rows(reader, add_row, [importer], checkpoint, collector)
+
+
+class PhoneImporter:
+    """Writes phone number types and phones at location in batches, new phone number
+    types are written before the phones that refer to them."""
+
+    def __init__(self, counters, lookups):
+        self.counters = counters
+        self.location_ids = lookups.ids_of(Location)
+        self.phone_type_ids = lookups.ids_of(PhoneNumberType)
+        self.phone_type_writer = BatchWriter(PhoneNumberType, ignore_conflicts=True)
+        self.phone_writer = BatchWriter(PhoneAtLocation, counters.count_phone_at_location,
+                                        flush_first=[self.phone_type_writer], delta=lookups.delta)
+
+    def add_phone(self, row, collector):
+        try:
+            location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[1])
+            self.add_phone_number_type_if_new(row)
+            self.counters.count_phone_number_types()
+            if collector.has_inactive_location_id(location_id):
+                return
+            active_record = build_phone_at_location_active_record(row)
+            check_foreign_key(active_record, 'location', self.location_ids)
+            self.phone_writer.add(active_record)
+        except ValidationError as error:
+            LOGGER.warning('%s', error.__str__())
+        except CsvParseException:
+            # Phone types are missing in many csv rows
+            pass
+
+    def add_phone_number_type_if_new(self, row):
+        active_record = build_phone_number_type_active_record(row)
+        if active_record.id not in self.phone_type_ids:
+            self.phone_type_writer.add(active_record)
+            self.phone_type_ids.add(active_record.id)
+
+    def flush(self):
+        self.phone_writer.flush()
 
 
 def import_phone(row, collector, counters):
-    try:
-        location_id = parser.parse_required_field_with_double_escaped_html('location_id', row[1])
-        create_phone_number_type_active_record(row)
-        counters.count_phone_number_types()
-        if collector.has_inactive_location_id(location_id):
-            return
-        phone_at_location_active_record = build_phone_at_location_active_record(row)
-        phone_at_location_active_record.save()
-        counters.count_phone_at_location()
-    except ValidationError as error:
-        LOGGER.warning('%s', error.__str__())
-    except IntegrityError as error:
-        LOGGER.warning('%s', error.__str__())
-        # Phone types are missing in many csv rows
-    except CsvParseException as error:
-        pass
-
-
-def create_phone_number_type_active_record(row):
+    importer = PhoneImporter(counters, ImportLookups())
+    importer.add_phone(row, collector)
+    importer.flush()
+
+
+def build_phone_number_type_active_record(row):
     active_record = PhoneNumberType()
     active_record.id = parser.parse_required_field_with_double_escaped_html('phone_type', row[8])
-    active_record.save()
+    return active_record
 
 
 def build_phone_at_location_active_record(row):
@@ -75,6 +107,8 @@ def build_phone_at_location_active_record(row):
         row[1]
     )
     active_record.phone_number = parser.parse_phone_number(row[6])
-    phone_type = parser.parse_required_field_with_double_escaped_html('phone_type', row[8])
-    active_record.phone_number_type = PhoneNumberType.objects.get(pk=phone_type)
+    active_record.phone_number_type_id = parser.parse_required_field_with_double_escaped_html(
+        'phone_type',
+        row[8]
+    )
     return active_record
@@ -7,18 +7,23 @@ from bc211.import_open_referral_csv import parser
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
+from human_services.organizations.models import Organization
 from human_services.services.models import Service
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_services_file(root_folder, collector, counters):
+def import_services_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'services.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -26,7 +31,7 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector, counters)
+        read_and_import_rows(reader, collector, counters, lookups, checkpoint)
 
 
 
@@ -36,14 +41,17 @@ expected_headers = ['id', 'organization_id', 'program_id', 'name', 'alternate_na
                 'licenses', 'taxonomy_ids', 'last_verified_on-x']
 
 
-def read_and_import_rows(reader, collector, counters):
-    for row in reader:
-        if not row:
-            continue
-        import_service(row, collector, counters)
+def read_and_import_rows(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    writer = BatchWriter(Service, counters.count_service, delta=lookups.delta)
 
+    def add_row(row):
+        add_service(row, collector, lookups, writer)
 
-def import_service(row, collector, counters):
+    import_rows(reader, add_row, [writer], checkpoint, collector)
+
+
+def add_service(row, collector, lookups, writer):
     try:
         translation.activate('en')
         service_id = parser.parse_required_field_with_double_escaped_html('service_id', row[0])
@@ -55,12 +63,19 @@ def import_service(row, collector, counters):
         if collector.service_has_inactive_data(organization_id, service_id, description):
             return
         active_record = build_service_active_record(row, service_id, organization_id, description)
-        active_record.save()
-        counters.count_service()
+        check_foreign_key(active_record, 'organization', lookups.ids_of(Organization))
+        writer.add(active_record)
+        lookups.ids_of(Service).add(active_record.id)
     except ValidationError as error:
         LOGGER.warning('%s', error.__str__())
 
 
+def import_service(row, collector, counters):
+    writer = BatchWriter(Service, counters.count_service)
+    add_service(row, collector, ImportLookups(), writer)
+    writer.flush()
+
+
 def build_service_active_record(row, service_id, organization_id, description):
     active_record = Service()
     active_record.id = service_id
@@ -6,18 +6,23 @@ from bc211.import_open_referral_csv import parser
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
-from human_services.locations.models import ServiceAtLocation
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
+from human_services.locations.models import Location, ServiceAtLocation
+from human_services.services.models import Service
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_services_at_location_file(root_folder, collector, counters):
+def import_services_at_location_file(root_folder, collector, counters, lookups=None, checkpoints=None):
     filename = 'services_at_location.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, counters, lookups, checkpoint)
 
 
-def read_file(path, collector, counters):
+def read_file(path, collector, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -25,17 +30,31 @@ def read_file(path, collector, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector, counters)
+        read_and_import_rows(reader, collector, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'service_id', 'location_id', 'description']
 
 
-def read_and_import_rows(reader, collector, counters):
-    for row in reader:
-        if not row or service_at_location_has_inactive_data(row, collector):
-            continue
-        import_service_at_location(row, counters)
+def read_and_import_rows(reader, collector, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    writer = BatchWriter(ServiceAtLocation, counters.count_service_at_location, delta=lookups.delta)
+
+    def add_row(row):
+        if not service_at_location_has_inactive_data(row, collector):
+            add_service_at_location(row, lookups, writer)
+
+    import_rows(reader, add_row, [writer], checkpoint, collector)
+
+
+def add_service_at_location(row, lookups, writer):
+    try:
+        active_record = build_service_at_location_active_record(row)
+        check_foreign_key(active_record, 'service', lookups.ids_of(Service))
+        check_foreign_key(active_record, 'location', lookups.ids_of(Location))
+        writer.add(active_record)
+    except ValidationError as error:
+        LOGGER.warning('%s', error.__str__())
 
 
 def service_at_location_has_inactive_data(row, collector):
@@ -46,12 +65,9 @@ def service_at_location_has_inactive_data(row, collector):
 
 
 def import_service_at_location(row, counters):
-    try:
-        active_record = build_service_at_location_active_record(row)
-        active_record.save()
-        counters.count_service_at_location()
-    except ValidationError as error:
-        LOGGER.warning('%s', error.__str__())
+    writer = BatchWriter(ServiceAtLocation, counters.count_service_at_location)
+    add_service_at_location(row, ImportLookups(), writer)
+    writer.flush()
 
 
 def build_service_at_location_active_record(row):
@@ -1,24 +1,30 @@
 import csv
 import os
 import logging
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.exceptions import ValidationError
 from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
 from bc211.import_open_referral_csv import parser
 from human_services.services.models import Service
 from taxonomies.models import TaxonomyTerm
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
+
+ServiceTaxonomyTerm = Service.taxonomy_terms.through
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_services_taxonomy_file(root_folder, collector):
+def import_services_taxonomy_file(root_folder, collector, lookups=None, checkpoints=None):
     filename = 'services_taxonomy.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, collector)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, collector, lookups, checkpoint)
 
 
-def read_file(path, collector):
+def read_file(path, collector, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -26,33 +32,33 @@ def read_file(path, collector):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, collector)
+        read_and_import_rows(reader, collector, lookups, checkpoint)
 
 
 expected_headers = ['id', 'service_id', 'taxonomy_id', 'taxonomy_detail']
 
 
-def read_and_import_rows(reader, collector):
-    service = None
-    for row in reader:
-        if not row:
-            continue
+def read_and_import_rows(reader, collector, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    writer = BatchWriter(ServiceTaxonomyTerm, ignore_conflicts=True, delta=lookups.delta)
+
+    def add_row(row):
         service_id = parser.parse_required_field_with_double_escaped_html('service_id', row[1])
-        if collector.has_inactive_service_id(service_id):
-            continue
-        service = Service.objects.get(pk=service_id)
-        import_service_taxonomy(row, service)
+        if not collector.has_inactive_service_id(service_id):
+            add_service_taxonomy(row, service_id, lookups, writer)
 
+    import_rows(reader, add_row, [writer], checkpoint, collector)
 
-def import_service_taxonomy(row, service):
+
+def add_service_taxonomy(row, service_id, lookups, writer):
     try:
         taxonomy_id = parser.parse_required_field_with_double_escaped_html('taxonomy_id', row[2])
-        taxonomy_term = get_taxonomy_term_active_record_or_raise(taxonomy_id)
-        service.taxonomy_terms.add(taxonomy_term)
+        active_record = ServiceTaxonomyTerm(service_id=service_id, taxonomyterm_id=taxonomy_id)
+        check_foreign_key(active_record, 'service', lookups.ids_of(Service))
+        check_foreign_key(active_record, 'taxonomyterm', lookups.ids_of(TaxonomyTerm))
+        writer.add(active_record)
     except ValidationError as error:
         LOGGER.warning('%s', error.__str__())
-    except ObjectDoesNotExist as error:
-        LOGGER.warning('%s', error.__str__())
 
 
 def build_service_taxonomy_active_record(service_id, taxonomy_term):
@@ -6,18 +6,22 @@ from bc211.import_open_referral_csv.headers_match_expected_format import (
     headers_match_expected_format)
 from bc211.import_open_referral_csv.exceptions import InvalidFileCsvImportException
 from bc211.import_open_referral_csv import parser
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.import_rows import import_rows
+from bc211.import_open_referral_csv.batch_writer import BatchWriter
 from taxonomies.models import TaxonomyTerm
 
 LOGGER = logging.getLogger(__name__)
 
 
-def import_taxonomy_file(root_folder, counters):
+def import_taxonomy_file(root_folder, counters, lookups=None, checkpoints=None):
     filename = 'taxonomy.csv'
     path = os.path.join(root_folder, filename)
-    read_file(path, counters)
+    checkpoint = checkpoints.for_file(filename) if checkpoints else None
+    read_file(path, counters, lookups, checkpoint)
 
 
-def read_file(path, counters):
+def read_file(path, counters, lookups=None, checkpoint=None):
     with open(path, 'r', newline='') as file:
         reader = csv.reader(file)
         headers = reader.__next__()
@@ -25,35 +29,44 @@ def read_file(path, counters):
             raise InvalidFileCsvImportException(
                 'The headers in "{0}": does not match open referral standards.'.format(path)
             )
-        read_and_import_rows(reader, counters)
+        read_and_import_rows(reader, counters, lookups, checkpoint)
 
 
 expected_headers = ['id', 'name', 'parent_id', 'parent_name', 'vocabulary']
 
 
-def read_and_import_rows(reader, counters):
-    for row in reader:
-        if not row:
-            continue
-        existing = get_existing_taxonomy_or_none(row)
-        if not existing:
-            import_taxonomy(row, counters)
+def read_and_import_rows(reader, counters, lookups=None, checkpoint=None):
+    lookups = lookups or ImportLookups()
+    existing_terms = lookups.existing_taxonomy_terms()
+    # Terms whose name or vocabulary has changed are updated when comparing with the
+    # previous import, they are not deleted when no longer imported as topics refer to them
+    writer = BatchWriter(TaxonomyTerm, counters.count_taxonomy_term,
+                         update_existing=lookups.compares_with_previous_import())
 
+    def add_row(row):
+        term = (row[0], row[1], row[4])
+        if term not in existing_terms:
+            add_taxonomy(row, lookups, writer)
+            existing_terms.add(term)
 
-def get_existing_taxonomy_or_none(row):
-    result = TaxonomyTerm.objects.filter(id=row[0], name=row[1], taxonomy_id=row[4]).all()
-    return result[0] if result else None
+    import_rows(reader, add_row, [writer], checkpoint)
 
 
-def import_taxonomy(row, counters):
+def add_taxonomy(row, lookups, writer):
     try:
         active_record = build_taxonomy_active_record(row)
-        active_record.save()
-        counters.count_taxonomy_term()
+        writer.add(active_record)
+        lookups.ids_of(TaxonomyTerm).add(active_record.id)
     except ValidationError as error:
         LOGGER.warning('%s', error.__str__())
 
 
+def import_taxonomy(row, counters):
+    writer = BatchWriter(TaxonomyTerm, counters.count_taxonomy_term)
+    add_taxonomy(row, ImportLookups(), writer)
+    writer.flush()
+
+
 def build_taxonomy_active_record(row):
     active_record = TaxonomyTerm()
     active_record.id = row[0]
@@ -0,0 +1,99 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.batch_writer import BatchWriter, check_foreign_key
+from common.testhelpers.random_test_values import a_string
+from human_services.organizations.models import Organization
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.services.models import Service
+from human_services.services.tests.helpers import ServiceBuilder
+
+
+class BatchWriterTests(TestCase):
+    def setUp(self):
+        self.counters = ImportCounters()
+        self.writer = BatchWriter(Organization, self.counters.count_organization_created, batch_size=2)
+
+    def test_writes_records_when_flushed(self):
+        self.writer.add(OrganizationBuilder().build())
+        self.assertEqual(Organization.objects.count(), 0)
+
+        self.writer.flush()
+        self.assertEqual(Organization.objects.count(), 1)
+
+    def test_writes_records_when_batch_is_full(self):
+        self.writer.add(OrganizationBuilder().build())
+        self.writer.add(OrganizationBuilder().build())
+        self.assertEqual(Organization.objects.count(), 2)
+
+    def test_writes_translated_fields(self):
+        the_name = a_string()
+        the_description = a_string()
+        self.writer.add(OrganizationBuilder().with_name(the_name).with_description(the_description).build())
+        self.writer.flush()
+
+        organization = Organization.objects.get()
+        self.assertEqual(organization.name, the_name)
+        self.assertEqual(organization.description, the_description)
+
+    def test_counts_written_records(self):
+        self.writer.add(OrganizationBuilder().build())
+        self.writer.add(OrganizationBuilder().build())
+        self.writer.add(OrganizationBuilder().build())
+        self.writer.flush()
+        self.assertEqual(self.counters.organizations_created, 3)
+
+    def test_saves_records_one_by_one_when_batch_conflicts_with_existing_records(self):
+        existing_id = a_string()
+        OrganizationBuilder().with_id(existing_id).create()
+        new_id = a_string()
+
+        self.writer.add(OrganizationBuilder().with_id(new_id).build())
+        self.writer.add(OrganizationBuilder().with_id(existing_id).build())
+
+        self.assertTrue(Organization.objects.filter(pk=new_id).exists())
+
+    def test_skips_and_does_not_count_existing_records_when_saving_one_by_one(self):
+        existing_id = a_string()
+        the_name = a_string()
+        OrganizationBuilder().with_id(existing_id).with_name(the_name).create()
+
+        self.writer.add(OrganizationBuilder().build())
+        self.writer.add(OrganizationBuilder().with_id(existing_id).with_name(a_string()).build())
+
+        self.assertEqual(Organization.objects.get(pk=existing_id).name, the_name)
+        self.assertEqual(self.counters.organizations_created, 1)
+
+    def test_updates_existing_records_when_saving_one_by_one_if_updating_existing(self):
+        existing_id = a_string()
+        OrganizationBuilder().with_id(existing_id).create()
+        the_name = a_string()
+        writer = BatchWriter(Organization, self.counters.count_organization_created, batch_size=2,
+                             update_existing=True)
+
+        writer.add(OrganizationBuilder().build())
+        writer.add(OrganizationBuilder().with_id(existing_id).with_name(the_name).build())
+
+        self.assertEqual(Organization.objects.count(), 2)
+        self.assertEqual(Organization.objects.get(pk=existing_id).name, the_name)
+        self.assertEqual(self.counters.organizations_created, 1)
+
+    def test_rejects_invalid_record(self):
+        with self.assertRaises(ValidationError):
+            self.writer.add(OrganizationBuilder().with_id('not a valid id').build())
+
+    def test_rejects_record_with_unknown_foreign_key(self):
+        organization = OrganizationBuilder().build()
+        service = ServiceBuilder(organization).build()
+        with self.assertRaises(ValidationError):
+            check_foreign_key(service, 'organization', set())
+
+    def test_accepts_record_with_known_foreign_key(self):
+        organization = OrganizationBuilder().create()
+        service = ServiceBuilder(organization).build()
+        check_foreign_key(service, 'organization', {organization.id})
+
+        writer = BatchWriter(Service)
+        writer.add(service)
+        writer.flush()
+        self.assertEqual(Service.objects.count(), 1)
@@ -0,0 +1,230 @@
+from django.test import TestCase
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.address import read_and_import_rows as import_addresses
+from bc211.import_open_referral_csv.import_delta import ImportDelta
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.inactive_records_collector import InactiveRecordsCollector
+from bc211.import_open_referral_csv.organization import read_and_import_rows as import_organizations
+from bc211.import_open_referral_csv.phone import read_and_import_rows as import_phones
+from bc211.import_open_referral_csv.service import read_and_import_rows as import_services
+from bc211.import_open_referral_csv.taxonomy import read_and_import_rows as import_taxonomy_terms
+from bc211.import_open_referral_csv.tests.helpers import (OpenReferralCsvAddressBuilder,
+                                                          OpenReferralCsvOrganizationBuilder,
+                                                          OpenReferralCsvPhoneBuilder,
+                                                          OpenReferralCsvServiceBuilder,
+                                                          OpenReferralCsvTaxonomyBuilder)
+from bc211.models import ImportedRecordHash
+from common.testhelpers.random_test_values import a_string
+from human_services.addresses.models import Address
+from human_services.locations.models import LocationAddress
+from human_services.locations.tests.helpers import LocationBuilder
+from human_services.organizations.models import Organization
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+from taxonomies.models import TaxonomyTerm
+
+
+class ImportDeltaTests(TestCase):
+    def setUp(self):
+        self.organization_id = a_string()
+        self.organization = OpenReferralCsvOrganizationBuilder().with_id(self.organization_id).build()
+
+    def import_organizations(self, rows, compare):
+        delta = ImportDelta(compare)
+        import_organizations(rows, InactiveRecordsCollector(), ImportCounters(), ImportLookups(delta))
+        return delta
+
+    def test_saves_hash_of_imported_records(self):
+        self.import_organizations([self.organization], compare=False)
+        saved = ImportedRecordHash.objects.get()
+        self.assertEqual(saved.model, 'organizations.organization')
+        self.assertEqual(saved.key_values, [self.organization_id])
+        self.assertEqual(len(saved.key), 40)
+
+    def test_does_not_write_unchanged_records(self):
+        self.import_organizations([self.organization], compare=False)
+        Organization.objects.filter(id=self.organization_id).update(email='changed@example.com')
+
+        delta = self.import_organizations([self.organization], compare=True)
+
+        self.assertEqual(Organization.objects.get().email, 'changed@example.com')
+        self.assertEqual(delta.counts['organizations.organization', 'unchanged'], 1)
+
+    def test_updates_changed_records(self):
+        self.import_organizations([self.organization], compare=False)
+        new_name = a_string()
+        changed = OpenReferralCsvOrganizationBuilder().with_id(self.organization_id).with_name(new_name).build()
+
+        delta = self.import_organizations([changed], compare=True)
+
+        self.assertEqual(Organization.objects.get().name, new_name)
+        self.assertEqual(delta.counts['organizations.organization', 'updated'], 1)
+
+    def test_deletes_records_that_are_no_longer_imported(self):
+        other = OpenReferralCsvOrganizationBuilder().build()
+        self.import_organizations([self.organization, other], compare=False)
+
+        delta = self.import_organizations([self.organization], compare=True)
+        delta.delete_removed_records()
+
+        self.assertEqual(list(Organization.objects.values_list('id', flat=True)), [self.organization_id])
+        self.assertEqual(delta.counts['organizations.organization', 'deleted'], 1)
+
+    def test_keeps_all_records_without_comparing(self):
+        other = OpenReferralCsvOrganizationBuilder().build()
+        self.import_organizations([self.organization, other], compare=False)
+
+        delta = self.import_organizations([self.organization], compare=False)
+        delta.delete_removed_records()
+
+        self.assertEqual(Organization.objects.count(), 2)
+
+
+class ChangedServicesTests(TestCase):
+    def setUp(self):
+        import_organizations([OpenReferralCsvOrganizationBuilder().build()],
+                             InactiveRecordsCollector(), ImportCounters())
+        self.organization = Organization.objects.get()
+
+    def import_services(self, rows, compare):
+        delta = ImportDelta(compare)
+        import_services(rows, InactiveRecordsCollector(), ImportCounters(), ImportLookups(delta))
+        return delta
+
+    def test_lists_changed_services(self):
+        service_id = a_string()
+        self.import_services([OpenReferralCsvServiceBuilder(self.organization).with_id(service_id).build()],
+                             compare=False)
+        changed = OpenReferralCsvServiceBuilder(self.organization).with_id(service_id).with_name(a_string()).build()
+
+        delta = self.import_services([changed], compare=True)
+
+        self.assertEqual(delta.changed_service_ids, {service_id})
+
+    def test_does_not_list_unchanged_services(self):
+        service = OpenReferralCsvServiceBuilder(self.organization).build()
+        self.import_services([service], compare=False)
+
+        delta = self.import_services([service], compare=True)
+
+        self.assertEqual(delta.changed_service_ids, set())
+
+    def test_lists_removed_services(self):
+        service_id = a_string()
+        self.import_services([OpenReferralCsvServiceBuilder(self.organization).with_id(service_id).build()],
+                             compare=False)
+
+        delta = self.import_services([], compare=True)
+        delta.delete_removed_records()
+
+        self.assertEqual(delta.removed_service_ids, {service_id})
+        self.assertEqual(Service.objects.count(), 0)
+
+    def test_merges_deltas_of_separate_files(self):
+        delta = ImportDelta(compare=True)
+        service_id = a_string()
+        other = self.import_services([OpenReferralCsvServiceBuilder(self.organization).with_id(service_id).build()],
+                                     compare=True)
+        delta.add_delta(other)
+        self.assertEqual(delta.changed_service_ids, {service_id})
+        self.assertEqual(delta.counts['services.service', 'created'], 1)
+
+
+class ChangedAddressesTests(TestCase):
+    def setUp(self):
+        self.location = LocationBuilder(OrganizationBuilder().create()).create()
+        self.address_id = a_string()
+
+    def import_addresses(self, rows, compare):
+        delta = ImportDelta(compare)
+        import_addresses(rows, InactiveRecordsCollector(), ImportCounters(), ImportLookups(delta))
+        return delta
+
+    def build_address(self, city):
+        return OpenReferralCsvAddressBuilder(self.location).with_address_id(self.address_id).with_city(city).build()
+
+    def test_updates_changed_address(self):
+        self.import_addresses([self.build_address(a_string())], compare=False)
+        new_city = a_string()
+
+        delta = self.import_addresses([self.build_address(new_city)], compare=True)
+
+        self.assertEqual(Address.objects.get().city, new_city)
+        self.assertEqual(LocationAddress.objects.get().address_id, self.address_id)
+        self.assertEqual(delta.counts['addresses.address', 'updated'], 1)
+
+    def test_updates_changed_address_imported_before_its_hash_was_saved(self):
+        self.import_addresses([self.build_address(a_string())], compare=False)
+        ImportedRecordHash.objects.filter(model='addresses.address').delete()
+        new_city = a_string()
+
+        self.import_addresses([self.build_address(new_city)], compare=True)
+
+        self.assertEqual(Address.objects.get().city, new_city)
+        self.assertEqual(ImportedRecordHash.objects.filter(model='addresses.address').count(), 1)
+
+    def test_does_not_update_existing_address_without_comparing(self):
+        the_city = a_string()
+        self.import_addresses([self.build_address(the_city)], compare=False)
+
+        self.import_addresses([self.build_address(a_string())], compare=False)
+
+        self.assertEqual(Address.objects.get().city, the_city)
+
+
+class ChangedTaxonomyTermsTests(TestCase):
+    def import_taxonomy_terms(self, rows, compare):
+        import_taxonomy_terms(rows, ImportCounters(), ImportLookups(ImportDelta(compare)))
+
+    def test_updates_changed_taxonomy_term(self):
+        term_id = a_string()
+        self.import_taxonomy_terms([OpenReferralCsvTaxonomyBuilder().with_taxonomy_term_id(term_id).build()],
+                                   compare=False)
+        new_name = a_string()
+        changed = OpenReferralCsvTaxonomyBuilder().with_taxonomy_term_id(term_id).with_name(new_name).build()
+
+        self.import_taxonomy_terms([changed], compare=True)
+
+        self.assertEqual(TaxonomyTerm.objects.get().name, new_name)
+
+
+class LongKeysTests(TestCase):
+    def setUp(self):
+        # Phones are identified by their location id, phone type and number, which can
+        # together be longer than an index entry, and contain any character
+        location_id = a_string(100) + '-' + a_string(99)
+        self.location = LocationBuilder(OrganizationBuilder().create()).with_id(location_id).create()
+        self.phone_type = a_string(100) + '|' + a_string(99)
+
+    def import_phones(self, rows, compare):
+        delta = ImportDelta(compare)
+        import_phones(rows, InactiveRecordsCollector(), ImportCounters(), ImportLookups(delta))
+        return delta
+
+    def test_saves_digest_of_long_key(self):
+        self.import_phones([OpenReferralCsvPhoneBuilder(self.location).with_phone_type(self.phone_type).build()],
+                           compare=False)
+
+        saved = ImportedRecordHash.objects.get()
+        phone = PhoneAtLocation.objects.get()
+        self.assertEqual(len(saved.key), 40)
+        self.assertEqual(saved.key_values, [self.location.id, self.phone_type, phone.phone_number])
+
+    def test_does_not_write_unchanged_record_with_long_key(self):
+        phone = OpenReferralCsvPhoneBuilder(self.location).with_phone_type(self.phone_type).build()
+        self.import_phones([phone], compare=False)
+
+        delta = self.import_phones([phone], compare=True)
+
+        self.assertEqual(delta.counts['phone_at_location.phoneatlocation', 'unchanged'], 1)
+
+    def test_deletes_removed_record_with_long_key(self):
+        self.import_phones([OpenReferralCsvPhoneBuilder(self.location).with_phone_type(self.phone_type).build()],
+                           compare=False)
+
+        delta = self.import_phones([], compare=True)
+        delta.delete_removed_records()
+
+        self.assertEqual(PhoneAtLocation.objects.count(), 0)
+        self.assertEqual(ImportedRecordHash.objects.count(), 0)
@@ -0,0 +1,42 @@
+from django.test import TestCase
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.import_lookups import ImportLookups
+from bc211.import_open_referral_csv.inactive_records_collector import InactiveRecordsCollector
+from bc211.import_open_referral_csv.organization import read_and_import_rows as import_organizations
+from bc211.import_open_referral_csv.service import read_and_import_rows as import_services
+from bc211.import_open_referral_csv.tests.helpers import (OpenReferralCsvOrganizationBuilder,
+                                                          OpenReferralCsvServiceBuilder)
+from common.testhelpers.random_test_values import a_string
+from human_services.organizations.models import Organization
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.services.models import Service
+
+
+class ImportLookupsTests(TestCase):
+    def test_reads_ids_from_database(self):
+        organization = OrganizationBuilder().create()
+        self.assertIn(organization.id, ImportLookups().ids_of(Organization))
+
+    def test_reads_ids_only_once(self):
+        lookups = ImportLookups()
+        lookups.ids_of(Organization)
+        OrganizationBuilder().create()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(lookups.ids_of(Organization)), 0)
+
+    def test_is_updated_with_imported_records(self):
+        lookups = ImportLookups()
+        organization_id = a_string()
+        organization_data = OpenReferralCsvOrganizationBuilder().with_id(organization_id).build()
+        import_organizations([organization_data], InactiveRecordsCollector(), ImportCounters(), lookups)
+        self.assertIn(organization_id, lookups.ids_of(Organization))
+
+    def test_imported_records_can_be_referred_to_without_reading_ids_again(self):
+        lookups = ImportLookups()
+        collector = InactiveRecordsCollector()
+        organization = OpenReferralCsvOrganizationBuilder().build()
+        import_organizations([organization], collector, ImportCounters(), lookups)
+
+        service_data = OpenReferralCsvServiceBuilder(Organization.objects.get()).build()
+        import_services([service_data], collector, ImportCounters(), lookups)
+        self.assertEqual(Service.objects.count(), 1)
@@ -0,0 +1,73 @@
+from django.test import TestCase
+from bc211.import_checkpoints import ImportCheckpoints
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.inactive_records_collector import InactiveRecordsCollector
+from bc211.import_open_referral_csv.organization import read_and_import_rows
+from bc211.import_open_referral_csv.tests.helpers import OpenReferralCsvOrganizationBuilder
+from bc211.models import ImportCheckpoint
+from common.testhelpers.random_test_values import a_string
+from human_services.organizations.models import Organization
+
+
+class ImportRowsWithCheckpointTests(TestCase):
+    def setUp(self):
+        self.checkpoint = ImportCheckpoints(a_string()).for_file('organizations.csv')
+
+    def import_rows(self, rows, collector=None):
+        collector = collector or InactiveRecordsCollector()
+        read_and_import_rows(rows, collector, ImportCounters(), checkpoint=self.checkpoint)
+
+    def test_saves_number_of_rows_committed(self):
+        rows = [OpenReferralCsvOrganizationBuilder().build(), OpenReferralCsvOrganizationBuilder().build()]
+        self.import_rows(rows)
+        saved = ImportCheckpoint.objects.get(name=self.checkpoint.name)
+        self.assertEqual(saved.rows_committed, 2)
+
+    def test_skips_rows_already_committed(self):
+        first_id = a_string()
+        second_id = a_string()
+        rows = [OpenReferralCsvOrganizationBuilder().with_id(first_id).build(),
+                OpenReferralCsvOrganizationBuilder().with_id(second_id).build()]
+        self.checkpoint.rows_committed = 1
+        self.import_rows(rows)
+        self.assertEqual(list(Organization.objects.values_list('id', flat=True)), [second_id])
+
+    def test_saves_ids_of_inactive_records(self):
+        organization_id = a_string()
+        rows = [OpenReferralCsvOrganizationBuilder().
+                with_id(organization_id).
+                with_description('DEL ' + a_string()).
+                build()]
+        self.import_rows(rows)
+        saved = ImportCheckpoint.objects.get(name=self.checkpoint.name)
+        self.assertEqual(saved.inactive_records['organizations'], [organization_id])
+
+    def test_imports_all_rows_without_checkpoint(self):
+        rows = [OpenReferralCsvOrganizationBuilder().build(), OpenReferralCsvOrganizationBuilder().build()]
+        read_and_import_rows(rows, InactiveRecordsCollector(), ImportCounters())
+        self.assertEqual(Organization.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.count(), 0)
+
+
+class ImportCheckpointsTests(TestCase):
+    def test_new_checkpoint_starts_at_beginning_of_file(self):
+        checkpoint = ImportCheckpoints(a_string()).for_file(a_string())
+        self.assertEqual(checkpoint.rows_committed, 0)
+        self.assertEqual(checkpoint.last_key, '')
+
+    def test_returns_saved_checkpoint(self):
+        checkpoints = ImportCheckpoints(a_string())
+        filename = a_string()
+        checkpoint = checkpoints.for_file(filename)
+        checkpoint.rows_committed = 5
+        checkpoint.save()
+        self.assertEqual(checkpoints.for_file(filename).rows_committed, 5)
+
+    def test_clears_only_own_checkpoints(self):
+        checkpoints = ImportCheckpoints(a_string())
+        other_checkpoints = ImportCheckpoints(a_string())
+        checkpoints.for_file(a_string()).save()
+        other_checkpoints.for_file(a_string()).save()
+        checkpoints.clear()
+        self.assertEqual(checkpoints.all().count(), 0)
+        self.assertEqual(other_checkpoints.all().count(), 1)
@@ -1,6 +1,9 @@
+import os
+from tempfile import TemporaryDirectory
 from django.test import TestCase
 from common.testhelpers.random_test_values import a_string, an_integer
-from bc211.import_open_referral_csv.inactive_records_collector import InactiveRecordsCollector
+from bc211.import_open_referral_csv.inactive_records_collector import (InactiveRecordsCollector,
+                                                                       read_inactive_records_file)
 from human_services.organizations.tests.helpers import OrganizationBuilder
 
 #  TODO are there even inactive locations? verify
@@ -14,12 +17,12 @@ class TestInactiveRecordsCollector(TestCase):
     def test_can_add_inactive_organization_id(self):
         the_id = a_string()
         self.collector.organization_has_inactive_data(the_id, self.the_description)
-        self.assertEqual(self.collector.inactive_organizations_ids[0], the_id)
+        self.assertIn(the_id, self.collector.inactive_organizations_ids)
 
     def test_can_add_inactive_service_id(self):
         the_id = a_string()
         self.collector.service_has_inactive_data(self.organization_id, the_id, self.the_description)
-        self.assertEqual(self.collector.inactive_services_ids[0], the_id)
+        self.assertIn(the_id, self.collector.inactive_services_ids)
 
     def test_can_add_inactive_location_id(self):
         the_id = a_string()
@@ -27,7 +30,7 @@ class TestInactiveRecordsCollector(TestCase):
             self.organization_id,
             the_id,
             self.the_description)
-        self.assertEqual(self.collector.inactive_locations_ids[0], the_id)
+        self.assertIn(the_id, self.collector.inactive_locations_ids)
 
     def test_returns_true_when_organization_id_is_in_inactive_organizations_list(self):
         organization_id = a_string()
@@ -49,3 +52,29 @@ class TestInactiveRecordsCollector(TestCase):
         self.collector.add_inactive_location_id(a_string())
         self.collector.add_inactive_location_id(location_id)
         self.assertTrue(self.collector.has_inactive_location_id(location_id))
+
+
+class TestInactiveRecordsFile(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'inactive_records.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reads_back_inactive_ids(self):
+        organization_id = a_string()
+        service_id = a_string()
+        location_id = a_string()
+        collector = InactiveRecordsCollector()
+        collector.add_inactive_organization_id(organization_id)
+        collector.add_inactive_service_id(service_id)
+        collector.add_inactive_location_id(location_id)
+
+        collector.write_to_file(self.path)
+        from_file = read_inactive_records_file(self.path)
+
+        self.assertTrue(from_file.has_inactive_organization_id(organization_id))
+        self.assertTrue(from_file.has_inactive_service_id(service_id))
+        self.assertTrue(from_file.has_inactive_location_id(location_id))
+        self.assertFalse(from_file.has_inactive_location_id(a_string()))
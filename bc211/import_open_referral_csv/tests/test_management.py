@@ -0,0 +1,72 @@
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from six import StringIO
+from bc211.convert_icarol_csv.csv_file_sink import CsvFileSink
+from bc211.convert_icarol_csv.parser import parse
+from bc211.convert_icarol_csv.tests.helpers import Bc211CsvDataBuilder
+from bc211.models import ImportedRecordHash
+from common.testhelpers.random_test_values import a_string
+from human_services.locations.models import ServiceAtLocation
+from newcomers_guide.tests.helpers import create_topic
+from search.models import TaskServiceSimilarityScore, TaskServiceAtLocationSimilarityScore
+
+
+def write_open_referral_files(folder):
+    organization_id = a_string()
+    bc211_csv_data = (Bc211CsvDataBuilder().
+                      as_organization().
+                      with_field('ResourceAgencyNum', organization_id).
+                      with_field('PublicName', a_string()).
+                      next_row().
+                      as_service().
+                      with_field('PublicName', a_string()).
+                      with_field('ParentAgencyNum', organization_id).
+                      with_field('PhysicalAddress1', a_string()).
+                      with_field('PhysicalCity', a_string()).
+                      with_field('PhysicalCountry', 'CA').
+                      with_field('Latitude', '49.2827').
+                      with_field('Longitude', '-123.1207').
+                      build())
+    with CsvFileSink(folder) as sink:
+        parse(sink, bc211_csv_data)
+
+
+class TestImportOpenReferralData(TestCase):
+    def test_import_rebuilds_topic_scores_of_services_at_location(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+            call_command('import_open_referral_csv', folder, stdout=StringIO())
+            service = ServiceAtLocation.objects.first().service
+            topic = create_topic('the-topic')
+            TaskServiceSimilarityScore.objects.create(task=topic, service=service, similarity_score=0.5)
+
+            call_command('import_open_referral_csv', folder, stdout=StringIO())
+
+        expected = {(record.id, record.location.point) for record in ServiceAtLocation.objects.filter(service=service)}
+        scores = TaskServiceAtLocationSimilarityScore.objects.filter(task=topic)
+        self.assertEqual({(score.service_at_location_id, score.point) for score in scores}, expected)
+        self.assertNotEqual(expected, set())
+
+    def test_import_does_not_record_hashes(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+            call_command('import_open_referral_csv', folder, stdout=StringIO())
+
+        self.assertEqual(ImportedRecordHash.objects.count(), 0)
+
+    def test_import_records_hashes_when_asked_to(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+            call_command('import_open_referral_csv', folder, '--record_hashes', stdout=StringIO())
+
+        self.assertNotEqual(ImportedRecordHash.objects.count(), 0)
+
+    def test_changed_services_file_needs_hashes(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+            with self.assertRaises(CommandError):
+                call_command('import_open_referral_csv', folder, '--changed_services_file',
+                             os.path.join(folder, 'changed.txt'), stdout=StringIO())
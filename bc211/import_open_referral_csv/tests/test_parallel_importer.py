@@ -0,0 +1,168 @@
+import os
+import tempfile
+from django.test import TestCase, TransactionTestCase
+from bc211.convert_icarol_csv.csv_file_sink import CsvFileSink
+from bc211.convert_icarol_csv.parser import parse
+from bc211.convert_icarol_csv.tests.helpers import Bc211CsvDataBuilder
+from bc211.import_icarol_xml.import_counters import ImportCounters
+from bc211.import_open_referral_csv.importer import IMPORT_STAGES, import_open_referral_files
+from bc211.import_open_referral_csv.inactive_records_collector import (InactiveRecordsCollector,
+                                                                        read_inactive_records_file)
+from bc211.import_open_referral_csv.parallel_importer import (find_ready_stages,
+                                                              import_open_referral_files_in_parallel)
+from common.testhelpers.random_test_values import a_phone_number, a_string
+from human_services.addresses.models import Address
+from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+from taxonomies.models import TaxonomyTerm
+
+
+class FindReadyStagesTests(TestCase):
+    def test_stages_without_dependencies_are_ready_at_start(self):
+        self.assertCountEqual(find_ready_stages(set(), []), ['organizations', 'taxonomy'])
+
+    def test_running_stages_are_not_ready(self):
+        self.assertCountEqual(find_ready_stages(set(), ['organizations']), ['taxonomy'])
+
+    def test_stages_are_ready_when_their_dependencies_are_done(self):
+        ready = find_ready_stages({'organizations', 'taxonomy'}, [])
+        self.assertCountEqual(ready, ['services', 'locations'])
+
+    def test_stage_waits_for_all_its_dependencies(self):
+        ready = find_ready_stages({'organizations', 'taxonomy', 'services'}, ['locations'])
+        self.assertCountEqual(ready, ['services_taxonomy'])
+
+    def test_no_stages_are_ready_when_all_are_done(self):
+        self.assertEqual(find_ready_stages(set(IMPORT_STAGES), []), [])
+
+    def test_every_dependency_is_a_stage(self):
+        for dependencies, _ in IMPORT_STAGES.values():
+            for dependency in dependencies:
+                self.assertIn(dependency, IMPORT_STAGES)
+
+
+class MergeStageResultsTests(TestCase):
+    def test_adds_counts(self):
+        counters = ImportCounters()
+        counters.count_organization_created()
+        other = ImportCounters()
+        other.count_organization_created()
+        other.count_service()
+        counters.add_counts(other)
+        self.assertEqual(counters.organizations_created, 2)
+        self.assertEqual(counters.services_created, 1)
+
+    def test_adds_inactive_ids(self):
+        collector = InactiveRecordsCollector()
+        other = InactiveRecordsCollector()
+        service_id = a_string()
+        other.add_inactive_service_id(service_id)
+        collector.add_inactive_ids(other)
+        self.assertIn(service_id, collector.inactive_services_ids)
+
+
+def write_open_referral_files(folder):
+    active_organization_id = a_string()
+    inactive_organization_id = a_string()
+    bc211_csv_data = (Bc211CsvDataBuilder().
+                      as_organization().
+                      with_field('ResourceAgencyNum', active_organization_id).
+                      with_field('PublicName', a_string()).
+                      next_row().
+                      as_service().
+                      with_field('PublicName', a_string()).
+                      with_field('ParentAgencyNum', active_organization_id).
+                      with_field('PhysicalAddress1', a_string()).
+                      with_field('PhysicalCity', a_string()).
+                      with_field('PhysicalCountry', 'CA').
+                      with_field('Latitude', '49.2827').
+                      with_field('Longitude', '-123.1207').
+                      with_field('Phone1Number', a_phone_number()).
+                      with_field('TaxonomyTerm', 'Food Banks').
+                      next_row().
+                      as_service().
+                      with_field('PublicName', a_string()).
+                      with_field('ParentAgencyNum', active_organization_id).
+                      with_field('AgencyStatus', 'Inactive').
+                      next_row().
+                      as_organization().
+                      with_field('ResourceAgencyNum', inactive_organization_id).
+                      with_field('PublicName', a_string()).
+                      with_field('AgencyStatus', 'Inactive').
+                      next_row().
+                      as_service().
+                      with_field('PublicName', a_string()).
+                      with_field('ParentAgencyNum', inactive_organization_id).
+                      with_field('PhysicalAddress1', a_string()).
+                      with_field('PhysicalCity', a_string()).
+                      with_field('PhysicalCountry', 'CA').
+                      build())
+    with CsvFileSink(folder) as sink:
+        parse(sink, bc211_csv_data)
+
+
+def imported_records():
+    return {
+        'organizations': set(Organization.objects.values_list('id', 'translations__name')),
+        'services': set(Service.objects.values_list('id', 'organization_id', 'translations__name')),
+        'locations': {(location.id, location.organization_id, location.point) for location in Location.objects.all()},
+        'services_at_location': set(ServiceAtLocation.objects.values_list('service_id', 'location_id')),
+        'addresses': set(LocationAddress.objects.values_list('location_id', 'address_type_id', 'address__address',
+                                                             'address__city')),
+        'phones': set(PhoneAtLocation.objects.values_list('location_id', 'phone_number_type_id', 'phone_number')),
+        'taxonomy': set(TaxonomyTerm.objects.values_list('taxonomy_id', 'name')),
+        'services_taxonomy': set(Service.taxonomy_terms.through.objects.values_list('service_id',
+                                                                                   'taxonomyterm__name')),
+    }
+
+
+def delete_imported_records():
+    LocationAddress.objects.all().delete()
+    Address.objects.all().delete()
+    Location.objects.all().delete()
+    Service.objects.all().delete()
+    Organization.objects.all().delete()
+    TaxonomyTerm.objects.all().delete()
+
+
+class ImportInParallelTests(TransactionTestCase):
+    # The stages run in worker processes with their own database connections, so they
+    # only see records that are committed. The address types created by migrations are
+    # restored after the test
+    serialized_rollback = True
+
+    def test_imports_the_same_records_as_the_sequential_import(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+
+            sequential_collector = InactiveRecordsCollector()
+            import_open_referral_files(folder, sequential_collector, ImportCounters(), {})
+            expected = imported_records()
+            delete_imported_records()
+
+            collector = InactiveRecordsCollector()
+            import_open_referral_files_in_parallel(folder, collector, ImportCounters(), {}, jobs=2)
+
+        self.assertEqual(imported_records(), expected)
+        self.assertNotEqual(expected['services_at_location'], set())
+        self.assertNotEqual(expected['services_taxonomy'], set())
+
+    def test_collects_the_same_inactive_records_as_the_sequential_import(self):
+        with tempfile.TemporaryDirectory() as folder:
+            write_open_referral_files(folder)
+
+            sequential_collector = InactiveRecordsCollector()
+            import_open_referral_files(folder, sequential_collector, ImportCounters(), {})
+            delete_imported_records()
+
+            collector = InactiveRecordsCollector()
+            import_open_referral_files_in_parallel(folder, collector, ImportCounters(), {}, jobs=2)
+            inactive_records_file = os.path.join(folder, 'inactive_records.json')
+            collector.write_to_file(inactive_records_file)
+            read_collector = read_inactive_records_file(inactive_records_file)
+
+        self.assertEqual(read_collector.as_dict(), sequential_collector.as_dict())
+        self.assertEqual(len(sequential_collector.inactive_organizations_ids), 1)
+        self.assertEqual(len(sequential_collector.inactive_services_ids), 2)
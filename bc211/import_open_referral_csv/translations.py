@@ -0,0 +1,15 @@
+from parler.cache import is_missing
+
+
+def get_translations(active_record):
+    translations_cache = getattr(active_record, '_translations_cache', None)
+    if not translations_cache:
+        return []
+    result = []
+    for meta in active_record._parler_meta:
+        for translation in translations_cache[meta.model].values():
+            if is_missing(translation):
+                continue
+            translation.master_id = active_record.pk
+            result.append(translation)
+    return result
@@ -0,0 +1,101 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from bc211.import_icarol_xml.importer import iterparse_agencies
+from bc211.import_icarol_xml.parser import clean_phone_number_column, clean_phone_numbers, is_valid_phonenumber
+from common.management.commands.benchmark_renderers import median_milliseconds
+
+# invoke as follows:
+# python manage.py benchmark_phone_cleaner --copies 100 --repeat 5
+# python manage.py benchmark_phone_cleaner path/to/bc211.xml --copies 1
+
+DEFAULT_FILE = 'bc211/import_icarol_xml/tests/data/BC211_data_excerpt.xml'
+
+
+class Command(BaseCommand):
+    help = ('Measure the time to clean the phone numbers of an iCarol XML file with the cleaner '
+            'from before the patterns were precompiled, with the current cleaner, and with the '
+            'current cleaner applied to the whole column of phone numbers')
+
+    def add_arguments(self, parser):
+        parser.add_argument('file',
+                            nargs='?',
+                            default=DEFAULT_FILE,
+                            metavar='file',
+                            help='Path to XML file containing BC-211 data, defaults to the test fixture')
+        parser.add_argument('--copies',
+                            metavar='copies',
+                            type=int,
+                            default=100,
+                            help='Number of copies of the phone numbers in the file that are cleaned')
+        parser.add_argument('--repeat',
+                            metavar='repeat',
+                            type=int,
+                            default=5,
+                            help='Number of times each measurement is repeated, the median time is reported')
+
+    def handle(self, *args, **options):
+        phone_numbers = read_phone_numbers(options['file']) * options['copies']
+        if not phone_numbers:
+            raise CommandError('{0}: No phone numbers found'.format(options['file']))
+        before = [clean_phone_numbers_before(phone_number) for phone_number in phone_numbers]
+        if [clean_phone_numbers(phone_number) for phone_number in phone_numbers] != before:
+            raise CommandError('The current cleaner gives different output than the previous one')
+
+        before_time = median_milliseconds(
+            lambda: [clean_phone_numbers_before(phone_number) for phone_number in phone_numbers],
+            options['repeat'])
+        after_time = median_milliseconds(
+            lambda: [clean_phone_numbers(phone_number) for phone_number in phone_numbers],
+            options['repeat'])
+        column_time = median_milliseconds(lambda: clean_phone_number_column(phone_numbers), options['repeat'])
+
+        self.stdout.write('{0} phone numbers, {1} distinct'.format(len(phone_numbers), len(set(phone_numbers))))
+        self.stdout.write('{:<24} {:>12} {:>10}'.format('cleaner', 'ms', 'speedup'))
+        for name, milliseconds in (('before', before_time), ('after', after_time), ('after, column', column_time)):
+            self.stdout.write('{:<24} {:>12.2f} {:>9.1f}x'.format(name, milliseconds, before_time / milliseconds))
+
+
+def read_phone_numbers(path):
+    phone_numbers = []
+    for _, agency in iterparse_agencies(path):
+        for phone in agency.iter('Phone'):
+            if is_valid_phonenumber(phone):
+                phone_numbers.append(phone.find('PhoneNumber').text)
+    return phone_numbers
+
+
+# The phone number cleaner as it was before its patterns were precompiled, kept here as
+# the baseline of the benchmark
+
+def clean_phone_numbers_before(phone_number_string):
+    phone_numbers = re.split("/|or|;", phone_number_string)
+    cleaned_phone_numbers = [clean_one_phone_number_before(phone_number) for phone_number in phone_numbers]
+    for phone_number in cleaned_phone_numbers:
+        if re.search(r'1-8[\d]{2}-[\d]{3}-[\d]{4}', phone_number):
+            return phone_number
+    return cleaned_phone_numbers[0]
+
+
+def clean_one_phone_number_before(phone_number):
+    extension_format = r'([Ll]ocals?|[Ee]xt\.?|Option|NIS).*'
+    found_extension = re.search(extension_format, phone_number)
+    extension = found_extension[0] if found_extension else None
+    phone_number = re.sub(extension_format, '', phone_number)
+    if re.search(r'[a-zA-Z]', phone_number):
+        phone_number = re.sub(r'[a-cA-C]', '2', phone_number)
+        phone_number = re.sub(r'[d-fD-F]', '3', phone_number)
+        phone_number = re.sub(r'[g-iG-I]', '4', phone_number)
+        phone_number = re.sub(r'[j-lJ-L]', '5', phone_number)
+        phone_number = re.sub(r'[m-oM-O]', '6', phone_number)
+        phone_number = re.sub(r'[p-sP-S]', '7', phone_number)
+        phone_number = re.sub(r'[t-vT-V]', '8', phone_number)
+        phone_number = re.sub(r'[w-zW-Z]', '9', phone_number)
+        phone_number = re.sub(r'(\(?.*\)?.*)(\(.*\)?)', r'\1', phone_number)
+    phone_number = re.sub(r'[- \(\)\.,]', '', phone_number)
+    if len(phone_number) > 11:
+        phone_number = phone_number[0:11]
+    if len(phone_number) == 11:
+        phone_number = re.sub(r'(\d)(\d{3})(\d{3})(\d{4})', r'\1-\2-\3-\4', phone_number)
+    elif len(phone_number) == 10:
+        phone_number = re.sub(r'(\d{3})(\d{3})(\d{4})', r'\1-\2-\3', phone_number)
+    return phone_number + ' ' + extension if extension else phone_number
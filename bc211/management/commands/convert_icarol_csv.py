@@ -19,4 +19,5 @@ class Command(BaseCommand):
         parser.add_argument('--vocabulary', default=None, help='the vocabulary id for taxonomy terms, defaults to BC211 or AIRS')
 
     def handle(self, *args, **options):
-        parse(CsvFileSink(options['path']), options['file'], options['vocabulary'])
+        with CsvFileSink(options['path']) as sink:
+            parse(sink, options['file'], options['vocabulary'])
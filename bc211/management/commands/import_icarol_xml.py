@@ -1,8 +1,12 @@
 import argparse
+import os
 from django.core.management.base import BaseCommand
-from bc211.import_icarol_xml.importer import parse_csv, update_all_organizations
+from bc211.import_icarol_xml.importer import iterparse_agencies, parse_csv, update_all_organizations
 from bc211.import_icarol_xml.import_counters import ImportCounters
-import xml.etree.ElementTree as etree
+from bc211.import_icarol_xml.pipelined_importer import update_all_organizations_in_parallel
+from bc211.import_checkpoints import ImportCheckpoints
+from common.cache import bump_cache_generation
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 
 # invoke as follows:
 # python manage.py import_icarol_xml path/to/bc211.xml
@@ -19,6 +23,16 @@ class Command(BaseCommand):
         parser.add_argument('--cityLatLongs',
                             metavar='cityLatLongs',
                             help='Path to CSV file containing city to latlong dictionary')
+        parser.add_argument('--jobs',
+                            metavar='jobs',
+                            type=int,
+                            default=1,
+                            help=('Number of processes for parsing agencies, the parsed agencies are '
+                                  'written to the database in batches by the main process'))
+        parser.add_argument('--resume',
+                            action='store_true',
+                            help=('Continue an import that was interrupted after the last organization '
+                                  'it committed, instead of starting from the beginning of the file'))
 
     def handle(self, *args, **options):
         file = options['file']
@@ -27,8 +41,19 @@ class Command(BaseCommand):
         else:
             city_latlong_map = {}
         counts = ImportCounters()
-        nodes = etree.iterparse(file, events=('end',))
-        update_all_organizations(nodes, city_latlong_map, counts)
+        checkpoints = ImportCheckpoints('icarol_xml')
+        if not options['resume']:
+            checkpoints.clear()
+        checkpoint = checkpoints.for_file(os.path.basename(file.name))
+        if options['jobs'] > 1:
+            update_all_organizations_in_parallel(file.name, city_latlong_map, counts, options['jobs'], checkpoint)
+        else:
+            nodes = iterparse_agencies(file.name)
+            update_all_organizations(nodes, city_latlong_map, counts, checkpoint)
+        checkpoints.clear()
+        # Locations may have moved and services may be at new locations
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
         self.print_status_message(counts)
 
     def print_status_message(self, counts):
@@ -1,8 +1,14 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from bc211.import_icarol_xml.importer import parse_csv
 from bc211.import_icarol_xml.import_counters import ImportCounters
 from bc211.import_open_referral_csv.importer import import_open_referral_files
-from bc211.import_open_referral_csv.inactive_records_collector import InactiveRecordsCollector
+from bc211.import_open_referral_csv.parallel_importer import import_open_referral_files_in_parallel
+from bc211.import_open_referral_csv.import_delta import ImportDelta
+from bc211.import_open_referral_csv.inactive_records_collector import (InactiveRecordsCollector,
+                                                                        build_collector_from_dict)
+from bc211.import_checkpoints import ImportCheckpoints
+from common.cache import bump_cache_generation
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 
 # invoke as follows:
 # python manage.py import_open_referral_csv_data path/to/open/referral/files
@@ -18,9 +24,47 @@ class Command(BaseCommand):
         parser.add_argument('--cityLatLongs',
                             metavar='cityLatLongs',
                             help='Path to CSV file containing city to latlong dictionary')
+        parser.add_argument('--jobs',
+                            metavar='jobs',
+                            type=int,
+                            default=1,
+                            help=('Number of files to import at the same time, each in its own process. '
+                                  'Files are imported after the files they refer to'))
+        parser.add_argument('--resume',
+                            action='store_true',
+                            help=('Continue an import that was interrupted from the last rows it committed, '
+                                  'instead of starting from the beginning of each file'))
+        parser.add_argument('--only_changes',
+                            action='store_true',
+                            help=('Compare with the records written by the previous import, and only write '
+                                  'records that were added or changed, and delete records that were removed. '
+                                  'The previous imports of the files must have been run with --record_hashes '
+                                  'or --only_changes'))
+        parser.add_argument('--record_hashes',
+                            action='store_true',
+                            help=('Save a hash of each record written, so that the next import can be run '
+                                  'with --only_changes'))
+        parser.add_argument('--changed_services_file',
+                            metavar='changed_services_file',
+                            help=('Path to file for saving the ids of services added or changed by this import, '
+                                  'one per line, for compute_text_similarity_scores --changed_services'))
+        parser.add_argument('--removed_services_file',
+                            metavar='removed_services_file',
+                            help=('Path to file for saving the ids of services removed by this import, '
+                                  'one per line, for compute_text_similarity_scores --removed_services'))
+        parser.add_argument('--inactive_records_file',
+                            metavar='inactive_records_file',
+                            help=('Path to file for saving the ids of inactive organizations, services '
+                                  'and locations, for use by later imports of individual files'))
 
     def handle(self, *args, **options):
         root_folder = options['path']
+        if options['resume'] and options['only_changes']:
+            raise CommandError('--only_changes needs all the rows of each file, it can\'t be used with --resume')
+        record_hashes = options['only_changes'] or options['record_hashes']
+        if not record_hashes and (options['changed_services_file'] or options['removed_services_file']):
+            raise CommandError('--changed_services_file and --removed_services_file need --only_changes '
+                               'or --record_hashes')
 
         if options['cityLatLongs']:
             city_latlong_map = parse_csv(options['cityLatLongs'])
@@ -30,8 +74,32 @@ class Command(BaseCommand):
         self.stdout.write('Importing open referral CSV data from {}'.format(root_folder))
         collector = InactiveRecordsCollector()
         counters = ImportCounters()
-        import_open_referral_files(root_folder, collector, counters, city_latlong_map)
+        checkpoints = ImportCheckpoints('open_referral_csv')
+        delta = ImportDelta(compare=options['only_changes']) if record_hashes else None
+        if options['resume']:
+            self.stdout.write('Resuming from the last rows committed')
+            restore_inactive_records(checkpoints, collector)
+        else:
+            checkpoints.clear()
+        if options['jobs'] > 1:
+            import_open_referral_files_in_parallel(root_folder, collector, counters,
+                                                   city_latlong_map, options['jobs'], checkpoints, delta)
+        else:
+            import_open_referral_files(root_folder, collector, counters, city_latlong_map, checkpoints, delta)
+        checkpoints.clear()
+        if options['changed_services_file']:
+            write_ids_one_per_line(options['changed_services_file'], delta.changed_service_ids)
+        if options['removed_services_file']:
+            write_ids_one_per_line(options['removed_services_file'], delta.removed_service_ids)
+        if options['inactive_records_file']:
+            collector.write_to_file(options['inactive_records_file'])
+        # Locations may have moved and services may be at new locations
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
         self.print_status_message(counters)
+        if options['only_changes']:
+            for line in delta.summary():
+                self.stdout.write(line)
 
     def print_status_message(self, counters):
         message = f'{counters.organizations_created} organizations created. '
@@ -45,3 +113,14 @@ class Command(BaseCommand):
         message += f'and {counters.phone_number_types_count} phone number types created. '
 
         self.stdout.write(self.style.SUCCESS(message))
+
+
+def restore_inactive_records(checkpoints, collector):
+    for inactive_records in checkpoints.inactive_records():
+        collector.add_inactive_ids(build_collector_from_dict(inactive_records))
+
+
+def write_ids_one_per_line(path, ids):
+    with open(path, 'w') as file:
+        for the_id in sorted(ids):
+            file.write(the_id + '\n')
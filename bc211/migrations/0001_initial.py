@@ -0,0 +1,23 @@
+# Generated by Django 3.1.5 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('name', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('rows_committed', models.PositiveIntegerField(default=0)),
+                ('last_key', models.CharField(blank=True, max_length=200)),
+                ('inactive_records', models.JSONField(default=dict)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.1.5 on 2026-10-18 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bc211', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedRecordHash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=1000)),
+                ('content_hash', models.CharField(max_length=40)),
+            ],
+            options={
+                'unique_together': {('model', 'key')},
+            },
+        ),
+    ]
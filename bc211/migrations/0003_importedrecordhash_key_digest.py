@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def delete_imported_record_hashes(apps, schema_editor):
+    # The saved hashes have no key values, the next import with --only_changes writes all
+    # records and saves their hashes again
+    apps.get_model('bc211', 'ImportedRecordHash').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bc211', '0002_importedrecordhash'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_imported_record_hashes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='importedrecordhash',
+            name='key',
+            field=models.CharField(max_length=40),
+        ),
+        migrations.AddField(
+            model_name='importedrecordhash',
+            name='key_values',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class ImportCheckpoint(models.Model):
+    """How far an import of one file has got, as the number of rows committed for CSV
+    files or the key of the last agency committed for XML files, so that an interrupted
+    import can be resumed from there."""
+    name = models.CharField(primary_key=True, max_length=200)
+    rows_committed = models.PositiveIntegerField(default=0)
+    last_key = models.CharField(max_length=200, blank=True)
+    inactive_records = models.JSONField(default=dict)
+
+
+class ImportedRecordHash(models.Model):
+    """Hash of the content of a record as written by the last open referral CSV import,
+    so that importing the data again only writes the records that changed. The record is
+    identified by the values of its key fields, and looked up by their digest."""
+    model = models.CharField(max_length=100)
+    key = models.CharField(max_length=40)
+    key_values = models.JSONField(default=list)
+    content_hash = models.CharField(max_length=40)
+
+    class Meta:
+        unique_together = ('model', 'key')
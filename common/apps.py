@@ -1,4 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save
 
 class CommonConfig(AppConfig):
     name = 'common'
+
+    def ready(self):
+        from django.contrib.admin.models import LogEntry
+        from common.cache import bump_table_generation_for_log_entry
+        post_save.connect(bump_table_generation_for_log_entry, sender=LogEntry,
+                          dispatch_uid='bump_table_generation_for_log_entry')
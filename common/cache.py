@@ -0,0 +1,215 @@
+import functools
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import translation
+from django.utils.http import parse_etags
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+GENERATION_KEY = 'response_cache_generation'
+TABLE_GENERATION_KEY_PREFIX = 'table_generation'
+RESPONSE_KEY_PREFIX = 'response'
+
+
+def get_cache_generation():
+    return get_generations([GENERATION_KEY])[GENERATION_KEY]
+
+
+def bump_cache_generation():
+    # Cached responses are keyed on the generation, so bumping it makes all existing
+    # entries unreachable, they then expire from the cache on their own
+    return bump_generation(GENERATION_KEY)
+
+
+def get_table_generation_key(table):
+    return '{0}:{1}'.format(TABLE_GENERATION_KEY_PREFIX, table)
+
+
+def bump_table_generation(table):
+    # Like bump_cache_generation(), but only for the responses built from the given table
+    return bump_generation(get_table_generation_key(table))
+
+
+def bump_table_generation_for_log_entry(sender, instance, **kwargs):
+    # The admin logs every addition, change and deletion it makes
+    model = instance.content_type.model_class() if instance.content_type else None
+    if model:
+        bump_table_generation(model._meta.db_table)
+
+
+def new_generation():
+    # Generations are random rather than counted, a generation lost from the cache, when
+    # evicted or when the cache is restarted, then can't start again from a value that
+    # responses and ETags were built with before
+    return uuid.uuid4().hex
+
+
+def bump_generation(key):
+    generation = new_generation()
+    cache.set(key, generation, timeout=None)
+    return generation
+
+
+def get_generations(keys):
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        # Generations never set or lost are given a new value, add() leaves the value set
+        # by another process in the meantime so that all processes read the same one
+        for key in missing:
+            cache.add(key, new_generation(), timeout=None)
+        generations.update(cache.get_many(missing))
+    return generations
+
+
+def get_data_version(tables):
+    keys = [GENERATION_KEY] + [get_table_generation_key(table) for table in tables]
+    generations = get_generations(keys)
+    return '.'.join(generations[key] for key in keys)
+
+
+def is_response_cache_enabled():
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', False)
+
+
+def compute_response_cache_key(request, view_name, action, view_kwargs, data_version):
+    hasher = hashlib.sha1()
+    # The data version is hashed too, it is one generation per table the data is built from
+    for part in [data_version,
+                 request.build_absolute_uri(request.path),
+                 view_name,
+                 action,
+                 normalize_view_kwargs(view_kwargs),
+                 normalize_query_params(request.query_params),
+                 get_request_locale(request)]:
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b'\0')
+    return '{0}:{1}'.format(RESPONSE_KEY_PREFIX, hasher.hexdigest())
+
+
+def compute_etag(response_cache_key, request):
+    # The same data is rendered differently by the JSON and browsable API renderers
+    hasher = hashlib.sha1(response_cache_key.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(request.accepted_media_type.encode('utf-8'))
+    return '"{0}"'.format(hasher.hexdigest())
+
+
+def etag_matches(request, etag):
+    # If-None-Match uses the weak comparison
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    etags = [tag[2:] if tag.startswith('W/') else tag for tag in etags]
+    return etag in etags or '*' in etags
+
+
+def normalize_query_params(query_params):
+    pairs = [(key, value) for key in sorted(query_params.keys())
+             for value in sorted(query_params.getlist(key))]
+    return '&'.join('{0}={1}'.format(key, value) for key, value in pairs)
+
+
+def normalize_view_kwargs(view_kwargs):
+    return '&'.join('{0}={1}'.format(key, view_kwargs[key]) for key in sorted(view_kwargs))
+
+
+def get_request_locale(request):
+    return getattr(request, 'LANGUAGE_CODE', None) or translation.get_language() or ''
+
+
+class CachedResponseMixin:
+    """Read-only viewset mixin which caches the data and pagination headers of list and
+    retrieve responses, and gives them a strong ETag. The data served by these viewsets
+    only changes when an import command is run or when a record is saved in the admin.
+    The import commands call bump_cache_generation() when they are done, and admin saves
+    bump the generation of the table of the saved model. The models that the serializer
+    reads are found from its fields, viewsets list the other models their data is built
+    from, such as those used by filters, ordering and method fields, in data_models.
+    Requests with a matching If-None-Match header get a 304 response without running any
+    query."""
+
+    cache_timeout = 60 * 60 * 24
+    cached_headers = ('Link', 'Count')
+    data_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_data_models(self):
+        return get_serializer_models(self.get_serializer_class()) | set(self.data_models)
+
+    def get_data_tables(self):
+        # Sorted, so that all processes build the same data version
+        return sorted(model._meta.db_table for model in self.get_data_models())
+
+    def get_cached_response(self, build_response, request, *args, **kwargs):
+        if not is_response_cache_enabled():
+            return build_response(request, *args, **kwargs)
+
+        data_version = get_data_version(self.get_data_tables())
+        key = compute_response_cache_key(request, type(self).__name__, self.action, self.kwargs, data_version)
+        etag = compute_etag(key, request)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        cached = cache.get(key)
+        if cached:
+            data, headers = cached
+            response = Response(data, headers=headers)
+        else:
+            response = build_response(request, *args, **kwargs)
+            if response.status_code == 200:
+                headers = {name: response[name] for name in self.cached_headers if response.has_header(name)}
+                cache.set(key, (response.data, headers), timeout=self.cache_timeout)
+
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
+
+
+@functools.lru_cache(maxsize=None)
+def get_serializer_models(serializer_class):
+    """The models whose records the data of a serializer is built from: the models of the
+    serializer and its nested serializers, the related models whose fields are read by
+    source, and the models that the records refer to by foreign key, since records can be
+    deleted along with the records they refer to without being logged by the admin."""
+    return frozenset(collect_serializer_models(serializer_class()))
+
+
+def collect_serializer_models(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    models = set()
+    if model:
+        models.add(model)
+        models |= get_referred_models(model)
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer):
+            models |= collect_serializer_models(field)
+        elif model:
+            models |= get_source_models(model, field.source_attrs)
+    return models
+
+
+def get_referred_models(model):
+    return {field.related_model for field in model._meta.concrete_fields if field.is_relation}
+
+
+def get_source_models(model, source_attrs):
+    models = set()
+    for attribute in source_attrs:
+        try:
+            field = model._meta.get_field(attribute)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        model = field.related_model
+        models.add(model)
+    return models
@@ -5,12 +5,16 @@ class ProximityParser:
         'exactly_two_values': 'Exactly two comma separated values expected for proximity',
         'invalid_latitude_value_type': 'Latitude value provided to proximity must be able to represent a float',
         'invalid_longitude_value_type': 'Longitude value provided to proximity must be able to represent a float',
+        'first_value_out_of_range': 'First value provided to proximity must be between -180 and 180',
+        'second_value_out_of_range': 'Second value provided to proximity must be between -90 and 90',
     }
 
-    def __init__(self, parameter_value):
+    def __init__(self, parameter_value, check_range=False):
         proximity_list = self.build_valid_proximity_list(parameter_value)
         self.latitude = self.build_valid_latitude_value(proximity_list[0])
         self.longitude = self.build_valid_longitude_value(proximity_list[1])
+        if check_range:
+            self.check_values_are_in_range()
 
     def build_valid_proximity_list(self, parameter_value):
         split_values = ([value.strip() for value
@@ -32,6 +36,14 @@ class ProximityParser:
         except ValueError:
             raise (ParseError(self.errors['invalid_longitude_value_type']))
 
+    def check_values_are_in_range(self):
+        # Points are built with the first value as x and the second as y, out of these
+        # ranges they can't be cast to the geography type
+        if not -180 <= self.latitude <= 180:
+            raise (ParseError(self.errors['first_value_out_of_range']))
+        if not -90 <= self.longitude <= 90:
+            raise (ParseError(self.errors['second_value_out_of_range']))
+
     @classmethod
     def errors_to_list(cls):
         return list(cls.errors.values())
@@ -1,7 +1,8 @@
 from rest_framework import filters, serializers
 from config.settings.base import SRID
+from django.contrib.gis.db.models import PointField
 from django.contrib.gis.geos import Point
-from django.db.models import F
+from django.db.models import BooleanField, F, Func, Value
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.measure import Distance as DistanceMeasure
 from content.models import Alert
@@ -71,9 +72,9 @@ class TopicSimilarityAndProximitySortFilter(filters.BaseFilterBackend):
     def sort_by_proximity_and_topic(self, queryset, proximity_parameter, topic_id):
         reference_point = self.to_point(proximity_parameter)
         return (queryset.
-                annotate(distance=Distance('location__point', reference_point)).
-                annotate(inverse_score=F('distance')/F('service__taskservicesimilarityscore__similarity_score')).
-                annotate(task_id=F('service__taskservicesimilarityscore__task_id')).
+                annotate(distance=Distance('task_scores__point', reference_point)).
+                annotate(inverse_score=F('distance')/F('task_scores__similarity_score')).
+                annotate(task_id=F('task_scores__task_id')).
                 filter(task_id__exact=topic_id).
                 order_by('inverse_score'))
 
@@ -95,6 +96,39 @@ class TopicSimilarityAndProximitySortFilter(filters.BaseFilterBackend):
                 .order_by('distance'))
 
 
+# ST_DWithin and ST_DistanceSphere use slightly different earth radii, the prefilter
+# must not drop locations that are within the cutoff distance
+PREFILTER_RADIUS_MARGIN = 1.01
+
+
+class AsGeography(Func):
+    template = '(%(expressions)s)::geography'
+    output_field = PointField(geography=True)
+
+
+class ColumnAsValidGeography(Func):
+    """A point column cast to geography, or null for points out of the range of the
+    geography type, which the cast rejects. Must match the expression of the spatial
+    index on location points, the column is repeated so it can't take parameters."""
+    template = ('(CASE WHEN ST_X(%(expressions)s) BETWEEN -180 AND 180 AND ST_Y(%(expressions)s) BETWEEN -90 AND 90 '
+                'THEN (%(expressions)s)::geography END)')
+    output_field = PointField(geography=True)
+
+
+class DWithinSphere(Func):
+    """True for points within the given distance in meters, on a sphere. Uses the
+    spatial index on the location point cast to geography, points out of range are
+    never within the distance."""
+    function = 'ST_DWithin'
+    output_field = BooleanField()
+
+    def __init__(self, column, point, distance_in_meters):
+        reference_point = Value(point, output_field=PointField(srid=point.srid))
+        use_spheroid = Value(False)
+        super().__init__(ColumnAsValidGeography(column), AsGeography(reference_point),
+                         Value(distance_in_meters), use_spheroid)
+
+
 class ProximityCutoffFilter(filters.BaseFilterBackend):
     filter_description = ('Exclude results more than a given distance in KM from a given point. '
                           'Accepts two comma separated values representing a longitude and a latitude. '
@@ -104,11 +138,14 @@ class ProximityCutoffFilter(filters.BaseFilterBackend):
         user_location = request.query_params.get('user_location', None)
         if user_location and queryset.model is ServiceAtLocation:
             radius_km = self.get_valid_radius_km(request)
-            location = ProximityParser(user_location)
+            location = ProximityParser(user_location, check_range=True)
             location_point = Point(location.latitude, location.longitude, srid=SRID)
+            radius = DistanceMeasure(km=radius_km)
+            # The index assisted prefilter drops most rows, the exact distance is only computed for the rest
             queryset = (queryset
+                        .filter(DWithinSphere('location__point', location_point, radius.m * PREFILTER_RADIUS_MARGIN))
                         .annotate(distance=Distance('location__point', location_point))
-                        .filter(distance__lte=DistanceMeasure(km=radius_km)))
+                        .filter(distance__lte=radius))
         return queryset
 
     def get_valid_radius_km(self, request):
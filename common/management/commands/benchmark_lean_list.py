@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from common.management.commands.benchmark_renderers import median_milliseconds
+from common.renderers import FastJSONRenderer
+from human_services.locations.models import ServiceAtLocation
+from human_services.services_at_location.json_aggregation import aggregate_services_at_location
+from human_services.services_at_location.lean_serializers import serialize_services_at_location
+from human_services.services_at_location.serializers import ServiceAtLocationSerializer
+from human_services.services_at_location.viewsets import ServiceAtLocationViewSet
+
+# invoke as follows:
+# python manage.py benchmark_lean_list --per_page 100 --repeat 20
+
+
+class Command(BaseCommand):
+    help = ('Measure the CPU and wall clock time to build and render one page of services at location '
+            'with ServiceAtLocationSerializer, with the lean list serializer and rendered by PostgreSQL')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--per_page',
+                            metavar='per_page',
+                            type=int,
+                            default=100,
+                            help='Number of services at location on the measured page')
+        parser.add_argument('--repeat',
+                            metavar='repeat',
+                            type=int,
+                            default=20,
+                            help='Number of times each measurement is repeated, the median time is reported')
+
+    def handle(self, *args, **options):
+        ids = list(ServiceAtLocation.objects.order_by('id').values_list('id', flat=True)[:options['per_page']])
+        if not ids:
+            raise CommandError('There are no services at location to measure')
+        paths = self.build_paths(ids)
+        expected = paths[0][1]()
+        for name, build_page in paths[1:]:
+            if build_page() != expected:
+                raise CommandError('{0} renders different JSON than the serializer'.format(name))
+
+        self.stdout.write('{0} services at location on the page'.format(len(ids)))
+        self.stdout.write('{:<24} {:>12} {:>12}'.format('path', 'cpu ms', 'wall ms'))
+        for name, build_page in paths:
+            cpu_time = median_milliseconds(build_page, options['repeat'], clock=time.process_time)
+            wall_time = median_milliseconds(build_page, options['repeat'])
+            self.stdout.write('{:<24} {:>12.2f} {:>12.2f}'.format(name, cpu_time, wall_time))
+
+    def build_paths(self, ids):
+        def serialize():
+            records = ServiceAtLocationViewSet.queryset.filter(id__in=ids).order_by('id')
+            return FastJSONRenderer().render(ServiceAtLocationSerializer(records, many=True).data)
+
+        def serialize_lean():
+            return FastJSONRenderer().render(serialize_services_at_location(ids))
+
+        def aggregate():
+            return FastJSONRenderer().render(aggregate_services_at_location(ids))
+
+        return [('serializer', serialize), ('lean', serialize_lean), ('json aggregation', aggregate)]
@@ -0,0 +1,97 @@
+import random
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import Distance as DistanceMeasure
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from common.filters import ProximityCutoffFilter
+from common.management.commands.benchmark_renderers import median_milliseconds
+from config.settings.base import SRID
+from human_services.locations.models import Location, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.services.models import Service
+
+# invoke as follows:
+# python manage.py benchmark_proximity_cutoff --locations 100000 --radius_km 25 --repeat 10
+
+# Locations are spread over roughly the populated south of British Columbia
+LONGITUDE_RANGE = (-128.0, -116.0)
+LATITUDE_RANGE = (48.3, 51.0)
+VANCOUVER = (-123.1207, 49.2827)
+
+
+class Command(BaseCommand):
+    help = ('Measure the time to find the services at location within a radius of a point, with '
+            'the index assisted prefilter and with the exact distance only. The locations are '
+            'created in a transaction that is rolled back, the database is left unchanged')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations',
+                            metavar='locations',
+                            type=int,
+                            default=100000,
+                            help='Number of locations, each with one service, to create for the measurement')
+        parser.add_argument('--radius_km',
+                            metavar='radius_km',
+                            type=float,
+                            default=25,
+                            help='Radius around Vancouver in which services at location are found')
+        parser.add_argument('--repeat',
+                            metavar='repeat',
+                            type=int,
+                            default=10,
+                            help='Number of times each measurement is repeated, the median time is reported')
+        parser.add_argument('--explain',
+                            action='store_true',
+                            help='Also print the query plan of both queries')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_services_at_location(options['locations'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE locations_location')
+            self.measure(options['radius_km'], options['repeat'], options['explain'])
+            transaction.set_rollback(True)
+
+    def measure(self, radius_km, repeat, explain):
+        user_location = '{0},{1}'.format(*VANCOUVER)
+        request = Request(APIRequestFactory().get('/', {'user_location': user_location, 'radius_km': radius_km}))
+        queryset = ServiceAtLocation.objects.all()
+        prefiltered = ProximityCutoffFilter().filter_queryset(request, queryset, None).values_list('id', flat=True)
+        point = Point(*VANCOUVER, srid=SRID)
+        exact = (queryset
+                 .annotate(distance=Distance('location__point', point))
+                 .filter(distance__lte=DistanceMeasure(km=radius_km))
+                 .values_list('id', flat=True))
+
+        count = len(list(prefiltered))
+        if count != len(list(exact)):
+            self.stderr.write('The prefiltered query found a different number of services at location')
+        self.stdout.write('{0} services at location within {1} km of {2}'.format(count, radius_km, user_location))
+        self.stdout.write('{:<24} {:>12}'.format('query', 'ms'))
+        for name, query in (('exact distance only', exact), ('prefiltered', prefiltered)):
+            milliseconds = median_milliseconds(lambda: list(query.all()), repeat)
+            self.stdout.write('{:<24} {:>12.2f}'.format(name, milliseconds))
+            if explain:
+                self.stdout.write(query.explain(analyze=True))
+
+
+def create_services_at_location(location_count):
+    # The same locations are created on every run so that measurements can be compared
+    generator = random.Random(0)
+    organization = Organization(id='benchmark-proximity-cutoff')
+    Organization.objects.bulk_create([organization])
+    locations = [Location(id='benchmark-location-{0}'.format(i),
+                          organization=organization,
+                          point=Point(generator.uniform(*LONGITUDE_RANGE), generator.uniform(*LATITUDE_RANGE),
+                                      srid=SRID))
+                 for i in range(location_count)]
+    services = [Service(id='benchmark-service-{0}'.format(i), organization=organization)
+                for i in range(location_count)]
+    Location.objects.bulk_create(locations, batch_size=5000)
+    Service.objects.bulk_create(services, batch_size=5000)
+    ServiceAtLocation.objects.bulk_create(
+        [ServiceAtLocation(service=service, location=location) for service, location in zip(services, locations)],
+        batch_size=5000)
@@ -0,0 +1,74 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import resolve
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from common.renderers import FastJSONRenderer
+
+# invoke as follows:
+# python manage.py benchmark_renderers --per_page 100 --repeat 10
+
+DEFAULT_PATHS = [
+    '/v1/organizations/',
+    '/v1/locations/',
+    '/v1/services/',
+    '/v1/services_at_location/',
+    '/v1/topics/',
+    '/v1/content/alerts/en/',
+]
+
+
+class Command(BaseCommand):
+    help = ('Measure the time to serialize one page of each list endpoint, and to render it '
+            'with the DRF JSON renderer and with the orjson based renderer')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path',
+                            metavar='path',
+                            action='append',
+                            help='Path of a list endpoint to measure, can be repeated, defaults to all list endpoints')
+        parser.add_argument('--per_page',
+                            metavar='per_page',
+                            type=int,
+                            default=100,
+                            help='Number of records on the measured page')
+        parser.add_argument('--repeat',
+                            metavar='repeat',
+                            type=int,
+                            default=10,
+                            help='Number of times each measurement is repeated, the median time is reported')
+
+    def handle(self, *args, **options):
+        paths = options['path'] or DEFAULT_PATHS
+        self.stdout.write('{:<32} {:>8} {:>14} {:>14} {:>12} {:>10}'.format(
+            'path', 'records', 'serialize ms', 'render ms', 'orjson ms', 'bytes'))
+        # Measure the views, not the response cache
+        with override_settings(RESPONSE_CACHE_ENABLED=False):
+            for path in paths:
+                self.stdout.write(self.measure_path(path, options['per_page'], options['repeat']))
+
+    def measure_path(self, path, per_page, repeat):
+        match = resolve(path)
+        request = APIRequestFactory().get(path, {'per_page': per_page})
+
+        def serialize():
+            return match.func(request, *match.args, **match.kwargs).data
+
+        data = serialize()
+        serialize_time = median_milliseconds(serialize, repeat)
+        render_time = median_milliseconds(lambda: JSONRenderer().render(data), repeat)
+        orjson_time = median_milliseconds(lambda: FastJSONRenderer().render(data), repeat)
+        size = len(FastJSONRenderer().render(data))
+        return '{:<32} {:>8} {:>14.2f} {:>14.2f} {:>12.2f} {:>10}'.format(
+            path, len(data), serialize_time, render_time, orjson_time, size)
+
+
+def median_milliseconds(function, repeat, clock=time.perf_counter):
+    times = []
+    for _ in range(repeat):
+        start = clock()
+        function()
+        times.append((clock() - start) * 1000)
+    return statistics.median(times)
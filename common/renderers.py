@@ -0,0 +1,48 @@
+import json
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson:
+    # Dates and times go through the DRF encoder so they are formatted the same as with
+    # the stdlib json module, integer keys are written as strings as the json module does
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class RenderedJSON(bytes):
+    """Response data that is already rendered as compact JSON, the same as FastJSONRenderer
+    would render it, for example by the database."""
+
+
+def escape_line_separators(rendered):
+    # The DRF renderer escapes these two, they are valid JSON but not valid JavaScript
+    return rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer producing the same output as the DRF renderer using orjson, which is
+    several times faster for the nested data of the list endpoints. Only floats below 1e-4
+    or from 1e16 are written differently, without exponent or with a shorter one. Falls back
+    to the DRF renderer when orjson is not installed, and for indented or ASCII only output.
+    RenderedJSON data is passed through as is, or parsed for indented or ASCII only output."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renders_compact = self.renders_compact_json(accepted_media_type, renderer_context or {})
+        if isinstance(data, RenderedJSON):
+            if renders_compact:
+                return bytes(data)
+            data = json.loads(data)
+        if orjson is None or not renders_compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        rendered = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        return escape_line_separators(rendered)
+
+    def renders_compact_json(self, accepted_media_type, renderer_context):
+        if self.ensure_ascii or not self.compact:
+            return False
+        return self.get_indent(accepted_media_type, renderer_context) is None
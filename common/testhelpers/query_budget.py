@@ -0,0 +1,21 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+LIST_PAGE_SIZE = 100
+
+
+class QueryBudgetMixin:
+    """API test case mixin for checking that a full list page is served with at most a
+    fixed number of SQL queries. Related records that are fetched one row at a time make
+    the number of queries grow with the page size and go over the budget."""
+
+    def assert_list_page_within_query_budget(self, url, budget):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'per_page': LIST_PAGE_SIZE})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), LIST_PAGE_SIZE)
+        if len(context.captured_queries) > budget:
+            queries = '\n'.join(query['sql'] for query in context.captured_queries)
+            self.fail('{0} ran {1} queries, the budget is {2}:\n{3}'.format(
+                url, len(context.captured_queries), budget, queries))
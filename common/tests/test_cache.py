@@ -0,0 +1,220 @@
+from django.contrib.admin.models import ADDITION, CHANGE, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import resolve
+from rest_framework import test as rest_test
+from content.models import Alert
+from human_services.addresses.models import Address
+from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+from human_services.services_at_location.serializers import ServiceAtLocationSerializer
+from common.cache import bump_cache_generation, get_cache_generation, get_serializer_models
+from search.models import Task, TaskServiceSimilarityScore
+from search.serializers import RelatedTopicsForGivenServiceSerializer
+from users.tests.factories import UserFactory
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class TestResponseCache(rest_test.APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.organization = OrganizationBuilder().create()
+
+    def test_returns_cached_response_until_generation_is_bumped(self):
+        self.client.get('/v1/organizations/')
+        OrganizationBuilder().create()
+
+        cached_json = self.client.get('/v1/organizations/').json()
+        self.assertEqual(len(cached_json), 1)
+
+        bump_cache_generation()
+
+        fresh_json = self.client.get('/v1/organizations/').json()
+        self.assertEqual(len(fresh_json), 2)
+
+    def test_query_parameter_order_does_not_affect_cache_key(self):
+        self.client.get('/v1/organizations/?per_page=5&page=1')
+        OrganizationBuilder().create()
+
+        json = self.client.get('/v1/organizations/?page=1&per_page=5').json()
+        self.assertEqual(len(json), 1)
+
+    def test_caches_pagination_headers(self):
+        OrganizationBuilder().create()
+        first_response = self.client.get('/v1/organizations/?per_page=1')
+        cached_response = self.client.get('/v1/organizations/?per_page=1')
+
+        self.assertEqual(cached_response['Link'], first_response['Link'])
+        self.assertEqual(cached_response['Count'], first_response['Count'])
+
+    def test_does_not_cache_not_found_responses(self):
+        self.client.get('/v1/organizations/the-id/')
+        OrganizationBuilder().with_id('the-id').create()
+
+        response = self.client.get('/v1/organizations/the-id/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_bumping_generation_changes_it(self):
+        generation = get_cache_generation()
+        bump_cache_generation()
+        self.assertNotEqual(get_cache_generation(), generation)
+
+    def test_generation_lost_from_cache_starts_at_new_value(self):
+        generation = get_cache_generation()
+        cache.clear()
+        self.assertNotEqual(get_cache_generation(), generation)
+
+    def test_generation_is_kept_once_given(self):
+        self.assertEqual(get_cache_generation(), get_cache_generation())
+
+
+def log_admin_change(model, object_id, action_flag=CHANGE):
+    LogEntry.objects.log_action(user_id=UserFactory().id,
+                                content_type_id=ContentType.objects.get_for_model(model).id,
+                                object_id=object_id,
+                                object_repr=object_id,
+                                action_flag=action_flag)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class TestConditionalGet(rest_test.APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.organization = OrganizationBuilder().create()
+        self.etag = self.client.get('/v1/organizations/')['ETag']
+
+    def test_returns_not_modified_for_matching_etag_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response.content, b'')
+
+    def test_returns_not_modified_for_weak_form_of_etag(self):
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH='"other", W/' + self.etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_returns_data_for_other_etag(self):
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_etag_depends_on_url(self):
+        response = self.client.get('/v1/organizations/{0}/'.format(self.organization.id))
+        self.assertNotEqual(response['ETag'], self.etag)
+
+    def test_etag_changes_when_generation_is_bumped(self):
+        OrganizationBuilder().create()
+        bump_cache_generation()
+
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        self.assertNotEqual(response['ETag'], self.etag)
+
+    def test_etag_from_before_bump_does_not_match_after_generations_are_lost_from_cache(self):
+        OrganizationBuilder().create()
+        bump_cache_generation()
+        cache.clear()
+
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_etag_changes_when_data_model_is_saved_in_admin(self):
+        organization = OrganizationBuilder().create()
+        log_admin_change(Organization, organization.id, ADDITION)
+
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_etag_does_not_change_when_other_model_is_saved_in_admin(self):
+        log_admin_change(Alert, 'the-alert')
+
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_does_not_return_etag_when_response_cache_is_disabled(self):
+        response = self.client.get('/v1/organizations/', HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class TestSerializerModels(TestCase):
+    def test_includes_models_of_nested_serializers(self):
+        models = get_serializer_models(ServiceAtLocationSerializer)
+        for model in (ServiceAtLocation, Service, Location, LocationAddress, Address, PhoneAtLocation):
+            self.assertIn(model, models)
+
+    def test_includes_related_models_read_by_source(self):
+        self.assertIn(Organization, get_serializer_models(ServiceAtLocationSerializer))
+
+    def test_includes_models_referred_to_by_foreign_key(self):
+        models = get_serializer_models(RelatedTopicsForGivenServiceSerializer)
+        self.assertEqual(models, {TaskServiceSimilarityScore, Task, Service})
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class TestDataModelsOfCachedViews(rest_test.APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def assert_admin_change_to_each_data_model_changes_etag(self, url):
+        view = resolve(url).func.cls()
+        for model in view.get_data_models():
+            with self.subTest(model=model.__name__):
+                etag = self.client.get(url)['ETag']
+                log_admin_change(model, 'the-object')
+                self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_organizations(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/organizations/')
+
+    def test_locations_of_organization(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/organizations/the-organization/locations/')
+
+    def test_services(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/services/')
+
+    def test_topics_of_service(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/services/the-service/related_topics/')
+
+    def test_locations(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/locations/')
+
+    def test_services_at_location(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/services_at_location/')
+
+    def test_topics(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/topics/')
+
+    def test_related_topics(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/topics/the-topic/related_topics/')
+
+    def test_related_services(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/topics/the-topic/related_services/')
+
+    def test_alerts(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/v1/content/alerts/en/')
+
+    def test_algorithms(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/qa/v1/algorithms/')
+
+    def test_search_locations(self):
+        self.assert_admin_change_to_each_data_model_changes_etag('/qa/v1/searchlocations/')
+
+    def test_services_at_location_depend_on_models_of_filters_and_sorting(self):
+        view = resolve('/v1/services_at_location/').func.cls()
+        self.assertIn(Task, view.get_data_models())
+        self.assertIn(TaskServiceSimilarityScore, view.get_data_models())
+
+    def test_topics_of_service_depend_on_topics(self):
+        view = resolve('/v1/services/the-service/related_topics/').func.cls()
+        self.assertIn(Task, view.get_data_models())
@@ -30,6 +30,28 @@ class ProximityParserTests(TestCase):
              'Longitude value provided to proximity must be able to represent a float')):
             ProximityParser('1.1111,foo')
 
+    def test_accepts_values_out_of_range_without_checking_range(self):
+        proximity = ProximityParser('190,95')
+        self.assertEqual(proximity.latitude, 190)
+        self.assertEqual(proximity.longitude, 95)
+
+    def test_throws_when_checking_range_and_first_value_is_out_of_range(self):
+        with self.assertRaisesRegex(ParseError, 'First value provided to proximity must be between -180 and 180'):
+            ProximityParser('-180.5,49.2827', check_range=True)
+
+    def test_throws_when_checking_range_and_second_value_is_out_of_range(self):
+        with self.assertRaisesRegex(ParseError, 'Second value provided to proximity must be between -90 and 90'):
+            ProximityParser('10,95', check_range=True)
+
+    def test_throws_when_checking_range_and_value_is_not_a_number(self):
+        with self.assertRaisesRegex(ParseError, 'First value provided to proximity must be between -180 and 180'):
+            ProximityParser('nan,49.2827', check_range=True)
+
+    def test_accepts_values_at_bounds_of_range(self):
+        proximity = ProximityParser('-180,90', check_range=True)
+        self.assertEqual(proximity.latitude, -180)
+        self.assertEqual(proximity.longitude, 90)
+
 
 class TaxonomyParserTests(TestCase):
     def test_throws_when_too_many_field_separators(self):
@@ -0,0 +1,68 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import test as rest_test
+from rest_framework.renderers import JSONRenderer
+from common.renderers import FastJSONRenderer, RenderedJSON
+from human_services.organizations.tests.helpers import OrganizationBuilder
+
+
+class FastJSONRendererTests(TestCase):
+    def assert_renders_same_as_json_renderer(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        actual = FastJSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(actual, expected)
+
+    def test_renders_nested_data(self):
+        self.assert_renders_same_as_json_renderer([OrderedDict([
+            ('id', 'the-id'),
+            ('name', 'Café "Bistro"\n'),
+            ('latitude', 49.2827291),
+            ('longitude', -123.1207375),
+            ('count', 12),
+            ('valid', True),
+            ('description', None),
+            ('addresses', [{'address_type': 'physical_address', 'address': {'city': 'Vancouver'}}]),
+        ])])
+
+    def test_renders_values_handled_by_drf_encoder(self):
+        self.assert_renders_same_as_json_renderer({
+            'date': datetime.date(2020, 1, 31),
+            'datetime': datetime.datetime(2020, 1, 31, 12, 30, 15, 123456),
+            'decimal': decimal.Decimal('1.5'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Not found.'),
+        })
+
+    def test_renders_integer_keys_as_strings(self):
+        self.assert_renders_same_as_json_renderer({1: 'one', 2: 'two'})
+
+    def test_escapes_line_and_paragraph_separators(self):
+        self.assert_renders_same_as_json_renderer({'name': 'line\u2028paragraph\u2029end'})
+
+    def test_renders_none_as_empty_content(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_renders_indented_output_same_as_json_renderer(self):
+        self.assert_renders_same_as_json_renderer({'id': 1, 'names': ['a', 'b']}, 'application/json; indent=4')
+
+    def test_passes_rendered_json_through(self):
+        rendered = RenderedJSON(b'[{"id":1,"name":"Caf\xc3\xa9"}]')
+        self.assertEqual(FastJSONRenderer().render(rendered), bytes(rendered))
+
+    def test_parses_rendered_json_for_indented_output(self):
+        data = [{'id': 1, 'name': 'Café'}]
+        rendered = RenderedJSON(JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(rendered, 'application/json; indent=4'),
+                         JSONRenderer().render(data, 'application/json; indent=4'))
+
+
+class FastJSONRendererApiTests(rest_test.APITestCase):
+    def test_is_used_for_api_responses(self):
+        OrganizationBuilder().create()
+        response = self.client.get('/v1/organizations/')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
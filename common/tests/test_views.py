@@ -1,3 +1,5 @@
+import base64
+import json
 from rest_framework import test as rest_test
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.services.tests.helpers import ServiceBuilder
@@ -181,3 +183,99 @@ class TestPagination(rest_test.APITestCase):
 
         self.assertIn(response.json()[0]['id'], ids_on_the_first_page)
         self.assertIn(response.json()[1]['id'], ids_on_the_first_page)
+
+
+class TestCursorPagination(rest_test.APITestCase):
+    def setUp(self):
+        self.organization = OrganizationBuilder().create()
+        for i in range(0, 5):
+            ServiceBuilder(self.organization).with_id('00' + str(i + 1)).create()
+
+    def get_next_link(self, response):
+        links = [link.split(';') for link in response['Link'].split(',')]
+        return next(url.strip()[1:-1] for url, rel in links if 'rel="next"' in rel)
+
+    def test_returns_first_page_for_empty_cursor(self):
+        response = self.client.get('/v1/services/?per_page=2&cursor=')
+
+        self.assertEqual([service['id'] for service in response.json()], ['001', '002'])
+
+    def test_next_link_returns_following_page(self):
+        response = self.client.get('/v1/services/?per_page=2&cursor=')
+        response = self.client.get(self.get_next_link(response))
+
+        self.assertEqual([service['id'] for service in response.json()], ['003', '004'])
+
+    def test_includes_no_next_link_for_last_page(self):
+        response = self.client.get('/v1/services/?per_page=2&cursor=')
+        response = self.client.get(self.get_next_link(response))
+        response = self.client.get(self.get_next_link(response))
+
+        self.assertEqual([service['id'] for service in response.json()], ['005'])
+        self.assertIn('rel="first"', response['Link'])
+        self.assertNotIn('rel="next"', response['Link'])
+
+    def test_does_not_include_count(self):
+        response = self.client.get('/v1/services/?per_page=2&cursor=')
+
+        self.assertFalse(response.has_header('Count'))
+
+    def test_follows_sort_order_of_the_query(self):
+        response = self.client.get('/v1/services/?per_page=2&sort_by=-id&cursor=')
+        response = self.client.get(self.get_next_link(response))
+
+        self.assertEqual([service['id'] for service in response.json()], ['003', '002'])
+
+    def test_returns_400_for_sort_by_translated_field(self):
+        response = self.client.get('/v1/services/?per_page=2&sort_by=name&cursor=')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_400_for_sort_by_more_than_one_field(self):
+        response = self.client.get('/v1/services/?per_page=2&sort_by=organization_id,-id&cursor=')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_404_for_invalid_cursor(self):
+        response = self.client.get('/v1/services/?per_page=2&cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, 404)
+
+    def get_with_cursor(self, payload):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+        return self.client.get('/v1/services/?per_page=2&cursor=' + cursor)
+
+    def test_follows_cursor_with_valid_payload(self):
+        response = self.get_with_cursor(['value', None, '002'])
+
+        self.assertEqual([service['id'] for service in response.json()], ['003', '004'])
+
+    def test_returns_404_for_cursor_with_unknown_kind(self):
+        response = self.get_with_cursor(['other', None, '002'])
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_returns_404_for_cursor_with_non_numeric_distance(self):
+        response = self.get_with_cursor(['distance', 'far', '002'])
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_returns_404_for_cursor_with_structured_value(self):
+        response = self.get_with_cursor(['value', {'id__gt': ''}, '002'])
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_returns_404_for_cursor_with_structured_pk(self):
+        response = self.get_with_cursor(['value', None, ['002']])
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_returns_404_for_cursor_without_pk(self):
+        response = self.get_with_cursor(['value', None, None])
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_returns_404_for_cursor_with_wrong_number_of_values(self):
+        response = self.get_with_cursor(['value', '002'])
+
+        self.assertEqual(response.status_code, 404)
@@ -1,3 +1,9 @@
+import base64
+import binascii
+import json
+from django.contrib.gis.measure import Distance as DistanceMeasure
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.utils.urls import remove_query_param, replace_query_param
@@ -7,6 +13,17 @@ class Pagination(PageNumberPagination):
         self.page_query_param = 'page'
         self.page_size_query_param = 'per_page'
         self.max_page_size = 100
+        self.cursor_query_param = 'cursor'
+        self.cursor_page = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.cursor_page = CursorPage(queryset,
+                                      request.query_params.get(self.cursor_query_param),
+                                      self.get_page_size(request))
+        return self.cursor_page.items
 
     def get_paginated_response(self, data):
         response = Response(data)
@@ -15,6 +32,9 @@ class Pagination(PageNumberPagination):
         if links:
             response['Link'] = links
 
+        if self.cursor_page:
+            return response
+
         count = self.page.paginator.count
         if count:
             response['Count'] = count
@@ -22,10 +42,14 @@ class Pagination(PageNumberPagination):
         return response
 
     def build_link_headers(self):
-        links = [('first', self.get_first_link()),
-                 ('prev', self.get_previous_link()),
-                 ('next', self.get_next_link()),
-                 ('last', self.get_last_link())]
+        if self.cursor_page:
+            links = [('first', self.get_first_cursor_link()),
+                     ('next', self.get_next_cursor_link())]
+        else:
+            links = [('first', self.get_first_link()),
+                     ('prev', self.get_previous_link()),
+                     ('next', self.get_next_link()),
+                     ('last', self.get_last_link())]
 
         headers = ['<{0}>; rel="{1}"'.format(url, name) for name, url in links if url]
 
@@ -42,3 +66,141 @@ class Pagination(PageNumberPagination):
             return None
         url = self.request.build_absolute_uri()
         return replace_query_param(url, self.page_query_param, self.page.paginator.num_pages)
+
+    def get_first_cursor_link(self):
+        if self.cursor_page.is_first_page():
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, '')
+
+    def get_next_cursor_link(self):
+        if not self.cursor_page.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.cursor_page.next_cursor())
+
+
+class LeanListMixin:
+    """Read-only viewset mixin for serving list pages without model serializers. The
+    filtered queryset is only used to find the ids of the records on the page, then
+    lean_list_serializer builds their data from plain column values. Viewsets opt in
+    by setting lean_list_serializer to a function taking a list of ids."""
+    lean_list_serializer = None
+
+    def get_lean_list_serializer(self):
+        return type(self).lean_list_serializer
+
+    def list(self, request, *args, **kwargs):
+        lean_list_serializer = self.get_lean_list_serializer()
+        if lean_list_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None).only('pk')
+        page = self.paginate_queryset(queryset)
+        records = queryset if page is None else page
+        data = lean_list_serializer([record.pk for record in records])
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CursorPage:
+    """One page of a queryset, selected by keyset rather than by offset. The queryset is
+    ordered by its first ordering field with the primary key as tie breaker, and the cursor
+    holds the values of these for the last item on the previous page. Orderings by more than
+    one field, or by a field of a related model, such as the translated name, cannot be
+    followed and are rejected. The total count is never computed."""
+
+    def __init__(self, queryset, cursor, page_size):
+        self.cursor = cursor
+        self.ordering_field, self.descending = get_keyset_ordering(queryset)
+        self.queryset = self.order_queryset(queryset)
+        if cursor:
+            self.queryset = self.queryset.filter(self.build_after_cursor_filter(decode_cursor(cursor)))
+        items = list(self.queryset[:page_size + 1])
+        self.has_next = len(items) > page_size
+        self.items = items[:page_size]
+
+    def is_first_page(self):
+        return not self.cursor
+
+    def order_queryset(self, queryset):
+        prefix = '-' if self.descending else ''
+        if self.ordering_field == 'pk':
+            return queryset.order_by(prefix + 'pk')
+        return queryset.order_by(prefix + self.ordering_field, 'pk')
+
+    def next_cursor(self):
+        last_item = self.items[-1]
+        value = None if self.ordering_field == 'pk' else getattr(last_item, self.ordering_field)
+        return encode_cursor(value, last_item.pk)
+
+    def build_after_cursor_filter(self, values):
+        value, pk = values
+        if self.ordering_field == 'pk':
+            return Q(pk__lt=pk) if self.descending else Q(pk__gt=pk)
+
+        after_pk = Q(pk__gt=pk)
+
+        field = self.ordering_field
+        is_null = Q(**{field + '__isnull': True})
+        # PostgreSQL sorts nulls last in ascending order, first in descending order
+        if value is None:
+            return (is_null & after_pk) if not self.descending else ((is_null & after_pk) | ~is_null)
+        if self.descending:
+            return Q(**{field + '__lt': value}) | (Q(**{field: value}) & after_pk)
+        return Q(**{field + '__gt': value}) | (Q(**{field: value}) & after_pk) | is_null
+
+
+def get_keyset_ordering(queryset):
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    if not ordering:
+        return ('pk', False)
+    first = ordering[0]
+    if len(ordering) > 1 or not isinstance(first, str) or '__' in first:
+        raise ParseError('Sort order is not supported with cursor, sort by a single field of the record')
+    descending = first.startswith('-')
+    field = first.lstrip('-')
+    if field == queryset.model._meta.pk.name:
+        return ('pk', descending)
+    return (field, descending)
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, DistanceMeasure):
+        payload = ['distance', value.m, pk]
+    else:
+        payload = ['value', value, pk]
+    as_json = json.dumps(payload, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(as_json.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        kind, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise NotFound('Invalid cursor')
+    if not is_valid_cursor(kind, value, pk):
+        raise NotFound('Invalid cursor')
+    if kind == 'distance' and value is not None:
+        value = DistanceMeasure(m=value)
+    return (value, pk)
+
+
+def is_valid_cursor(kind, value, pk):
+    # The cursor comes from the client, so only values that encode_cursor can write are
+    # let through to the query
+    if not is_scalar(pk) or pk is None:
+        return False
+    if kind == 'distance':
+        return value is None or is_number(value)
+    if kind == 'value':
+        return is_scalar(value)
+    return False
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_scalar(value):
+    return value is None or isinstance(value, str) or is_number(value)
@@ -60,12 +60,21 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': ['common.renderers.FastJSONRenderer',
+                                 'rest_framework.renderers.BrowsableAPIRenderer', ],
     'DEFAULT_PAGINATION_CLASS': 'common.view.Pagination',
     'PAGE_SIZE': 30,
     'ORDERING_PARAM': 'sort_by',
     'DEFAULT_FILTER_BACKENDS': ['common.filters.SearchFilter', 'common.filters.MultiFieldOrderingFilter', ],
 }
 
+# Cache responses from the read-only human services and topic endpoints, requires a cache
+# shared between the web server and the import commands, i.e. not LocMemCache
+RESPONSE_CACHE_ENABLED = env.bool('DJANGO_RESPONSE_CACHE_ENABLED', default=False)
+
+# Have PostgreSQL build the data of services_at_location list pages as one JSON document
+SERVICES_AT_LOCATION_JSON_AGGREGATION = env.bool('DJANGO_SERVICES_AT_LOCATION_JSON_AGGREGATION', default=False)
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
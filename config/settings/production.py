@@ -79,6 +79,8 @@ CACHES = {
     }
 }
 
+RESPONSE_CACHE_ENABLED = env.bool('DJANGO_RESPONSE_CACHE_ENABLED', default=True)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': True,
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0021_auto_20201215_0024'),
+    ]
+
+    operations = [
+        # Distances in meters are computed on the geography type, this index lets
+        # ST_DWithin on the point cast to geography find nearby locations. Points out of
+        # the range of the geography type, which the cast rejects, are indexed as null so
+        # that existing and imported ones don't fail, the expression must match
+        # ColumnAsValidGeography in common/filters.py
+        migrations.RunSQL(
+            sql='CREATE INDEX locations_location_point_geography_idx '
+                'ON locations_location USING GIST ((CASE WHEN ST_X(point) BETWEEN -180 AND 180 '
+                'AND ST_Y(point) BETWEEN -90 AND 90 THEN (point)::geography END))',
+            reverse_sql='DROP INDEX locations_location_point_geography_idx',
+        ),
+    ]
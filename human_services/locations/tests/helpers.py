@@ -1,7 +1,10 @@
 from bc211.import_icarol_xml import dtos
 from common.testhelpers.random_test_values import a_string, a_point
 from django.contrib.gis.geos import Point
-from human_services.locations.models import Location
+from human_services.addresses.models import AddressType
+from human_services.addresses.tests.helpers import AddressBuilder
+from human_services.locations.models import Location, LocationAddress
+from human_services.phone_at_location.tests.helpers import PhoneAtLocationBuilder
 
 
 class LocationBuilder:
@@ -81,3 +84,12 @@ class LocationBuilder:
         result = self.build()
         result.save()
         return result
+
+
+def create_locations_with_address_and_phone_number(organization, count):
+    address_type = AddressType.objects.get(pk='physical_address')
+    locations = [LocationBuilder(organization).create() for _ in range(count)]
+    for location in locations:
+        LocationAddress(location=location, address=AddressBuilder().create(), address_type=address_type).save()
+        PhoneAtLocationBuilder(location).create()
+    return locations
@@ -1,13 +1,16 @@
 from rest_framework import test as rest_test
 from rest_framework import status
-from human_services.locations.tests.helpers import LocationBuilder
+from human_services.locations.tests.helpers import LocationBuilder, create_locations_with_address_and_phone_number
 from human_services.locations.models import Location, LocationAddress
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.addresses.tests.helpers import AddressBuilder
 from human_services.phone_at_location.tests.helpers import PhoneAtLocationBuilder
 from human_services.addresses.models import Address, AddressType
+from common.testhelpers.query_budget import LIST_PAGE_SIZE, QueryBudgetMixin
 from common.testhelpers.random_test_values import a_float
 
+LOCATION_LIST_QUERY_BUDGET = 8
+
 
 class LocationsApiTests(rest_test.APITestCase):
     def setUp(self):
@@ -126,3 +129,16 @@ class LocationsApiTests(rest_test.APITestCase):
                          phone_at_location.phone_number_type.id)
         self.assertEqual(response.json()[0]['phone_numbers'][0]['phone_number'],
                          phone_at_location.phone_number)
+
+
+class LocationsQueryBudgetTests(QueryBudgetMixin, rest_test.APITestCase):
+    def setUp(self):
+        self.organization = OrganizationBuilder().create()
+        create_locations_with_address_and_phone_number(self.organization, LIST_PAGE_SIZE)
+
+    def test_list_of_locations_is_within_query_budget(self):
+        self.assert_list_page_within_query_budget('/v1/locations/', LOCATION_LIST_QUERY_BUDGET)
+
+    def test_list_of_locations_under_organization_is_within_query_budget(self):
+        url = '/v1/organizations/{0}/locations/'.format(self.organization.id)
+        self.assert_list_page_within_query_budget(url, LOCATION_LIST_QUERY_BUDGET)
@@ -3,18 +3,22 @@ from django.utils.decorators import method_decorator
 from human_services.locations import models, serializers, documentation
 from common.filters import (SearchFilter, LocationIdFilter,
                             ServiceIdFilter, TaxonomyFilter)
+from common.cache import CachedResponseMixin
 
 # pylint: disable=too-many-ancestors
 @method_decorator(name='list', decorator=documentation.get_location_list_schema())
-class LocationViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = models.Location.objects.all()
+class LocationViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = (models.Location.objects.
+                prefetch_related('translations').
+                prefetch_related('location_addresses__address').
+                prefetch_related('phone_numbers'))
     serializer_class = serializers.LocationSerializer
 
 
 # pylint: disable=too-many-ancestors
-class LocationViewSetUnderOrganizations(viewsets.ReadOnlyModelViewSet):
+class LocationViewSetUnderOrganizations(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         organization_id = self.kwargs['organization_id']
-        return models.Location.objects.filter(organization=organization_id)
+        return LocationViewSet.queryset.filter(organization=organization_id)
 
     serializer_class = serializers.LocationSerializer
@@ -1,6 +1,9 @@
 from rest_framework import test as rest_test
 from rest_framework import status
 from human_services.organizations.tests.helpers import OrganizationBuilder
+from common.testhelpers.query_budget import LIST_PAGE_SIZE, QueryBudgetMixin
+
+ORGANIZATION_LIST_QUERY_BUDGET = 5
 
 
 class OrganizationsApiTests(rest_test.APITestCase):
@@ -47,3 +50,10 @@ class OrganizationsApiTests(rest_test.APITestCase):
         url = '/v1/organizations/{0}/'.format(organization.pk)
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class OrganizationsQueryBudgetTests(QueryBudgetMixin, rest_test.APITestCase):
+    def test_list_of_organizations_is_within_query_budget(self):
+        for _ in range(LIST_PAGE_SIZE):
+            OrganizationBuilder().create()
+        self.assert_list_page_within_query_budget('/v1/organizations/', ORGANIZATION_LIST_QUERY_BUDGET)
@@ -1,9 +1,10 @@
 from django.utils.decorators import method_decorator
 from rest_framework import viewsets
 from human_services.organizations import models, serializers, documentation
+from common.cache import CachedResponseMixin
 
 # pylint: disable=too-many-ancestors
 @method_decorator(name='list', decorator=documentation.get_organization_list_schema())
-class OrganizationViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = models.Organization.objects.all()
+class OrganizationViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = models.Organization.objects.prefetch_related('translations')
     serializer_class = serializers.OrganizationSerializer
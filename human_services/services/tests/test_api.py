@@ -3,6 +3,10 @@ from human_services.services.tests.helpers import ServiceBuilder, create_related
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from rest_framework import test as rest_test
 from rest_framework import status
+from common.testhelpers.query_budget import LIST_PAGE_SIZE, QueryBudgetMixin
+from human_services.locations.tests.helpers import LocationBuilder
+
+SERVICE_LIST_QUERY_BUDGET = 6
 
 class ServicesApiTests(rest_test.APITestCase):
     def setUp(self):
@@ -120,3 +124,22 @@ class ServicesApiTests(rest_test.APITestCase):
         self.assertEqual(response.json()[0]['similarity_score'], 2.0)
         self.assertEqual(response.json()[1]['similarity_score'], 1.0)
         self.assertEqual(response.json()[2]['similarity_score'], 0.0)
+
+
+class ServicesQueryBudgetTests(QueryBudgetMixin, rest_test.APITestCase):
+    def setUp(self):
+        self.organization = OrganizationBuilder().create()
+        self.location = LocationBuilder(self.organization).create()
+        for _ in range(LIST_PAGE_SIZE):
+            ServiceBuilder(self.organization).with_location(self.location).create()
+
+    def test_list_of_services_is_within_query_budget(self):
+        self.assert_list_page_within_query_budget('/v1/services/', SERVICE_LIST_QUERY_BUDGET)
+
+    def test_list_of_services_under_organization_is_within_query_budget(self):
+        url = '/v1/organizations/{0}/services/'.format(self.organization.id)
+        self.assert_list_page_within_query_budget(url, SERVICE_LIST_QUERY_BUDGET)
+
+    def test_list_of_services_under_location_is_within_query_budget(self):
+        url = '/v1/locations/{0}/services/'.format(self.location.id)
+        self.assert_list_page_within_query_budget(url, SERVICE_LIST_QUERY_BUDGET)
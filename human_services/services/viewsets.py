@@ -3,23 +3,31 @@ from django.utils.decorators import method_decorator
 from human_services.services import models, serializers, documentation
 from common.filters import (SearchFilter, OrganizationIdFilter, LocationIdFilter,
                             TaxonomyFilter, MultiFieldOrderingFilter)
+from common.cache import CachedResponseMixin
+from human_services.locations.models import ServiceAtLocation
 from search.models import TaskServiceSimilarityScore
 from search.serializers import RelatedTopicsForGivenServiceSerializer
+from taxonomies.models import TaxonomyTerm
 
 # pylint: disable=too-many-ancestors
 @method_decorator(name='list', decorator=documentation.get_service_list_schema())
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = models.Service.objects.all()
+class ServiceViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = (models.Service.objects.
+                select_related('organization').
+                prefetch_related('translations').
+                prefetch_related('organization__translations'))
     serializer_class = serializers.ServiceSerializer
     search_fields = ('translations__name', 'translations__description',)
     filter_backends = (MultiFieldOrderingFilter, SearchFilter, OrganizationIdFilter,
                        LocationIdFilter, TaxonomyFilter,)
     ordering_fields = '__all__'
+    # Used by the location and taxonomy filters
+    data_models = (ServiceAtLocation, TaxonomyTerm)
 
 
 # pylint: disable=too-many-ancestors
 @method_decorator(name='list', decorator=documentation.get_topic_list_schema())
-class ServiceTopicsViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceTopicsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         service_id = self.kwargs['service_id']
         return (TaskServiceSimilarityScore.objects.
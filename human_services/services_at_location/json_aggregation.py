@@ -0,0 +1,143 @@
+import re
+import struct
+from django.db import connection
+from parler.utils.i18n import get_active_language_choices
+from common.renderers import RenderedJSON, escape_line_separators
+from human_services.addresses.models import Address
+from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+
+# Control characters are always escaped in JSON strings, so these only appear where they
+# are written by the query. Coordinates are written as their 8 bytes in hex, because before
+# PostgreSQL 12 float8 values are written with 15 significant digits, and members whose
+# value is the missing marker are left out, as the serializers leave out coordinates of
+# locations without a point and translated fields of records without a translation
+FLOAT8_MARKER = '\x01'
+MISSING_MARKER = '\x02'
+FLOAT8_PATTERN = re.compile(b'\x01([0-9a-f]{16})')
+MISSING_MEMBER_PATTERN = re.compile(b',"[a-z_]+":\x02')
+
+TRANSLATION_SQL = '''LEFT JOIN LATERAL (
+        SELECT translation.language_code, {fields} FROM {table} AS translation
+        WHERE translation.master_id = {master}.id AND translation.language_code = ANY(%(languages)s::text[])
+        ORDER BY array_position(%(languages)s::text[], translation.language_code::text) LIMIT 1
+    ) AS {alias} ON TRUE'''
+
+SERVICES_AT_LOCATION_SQL = '''
+SELECT '[' || COALESCE(string_agg({service_at_location_json}, ',' ORDER BY page.position), '') || ']'
+FROM unnest(%(ids)s::integer[]) WITH ORDINALITY AS page(id, position)
+JOIN {service_at_location} AS service_at_location ON service_at_location.id = page.id
+JOIN {service} AS service ON service.id = service_at_location.service_id
+JOIN {organization} AS organization ON organization.id = service.organization_id
+JOIN {location} AS location ON location.id = service_at_location.location_id
+{service_translation}
+{organization_translation}
+{location_translation}
+'''
+
+JSON_ARRAY_SQL = '''(
+    SELECT '[' || COALESCE(string_agg({item_json}, ',' ORDER BY {order_by}), '') || ']'
+    FROM {from_sql}
+)'''
+
+
+def json_value(expression):
+    return "COALESCE(to_json({0})::text, 'null')".format(expression)
+
+
+def json_float8(expression):
+    return "COALESCE(chr({0}) || encode(float8send({1}), 'hex'), chr({2}))".format(
+        ord(FLOAT8_MARKER), expression, ord(MISSING_MARKER))
+
+
+def json_translated_value(alias, field):
+    return "CASE WHEN {0}.language_code IS NULL THEN chr({1}) ELSE {2} END".format(
+        alias, ord(MISSING_MARKER), json_value(alias + '.' + field))
+
+
+def json_object(members):
+    """SQL expression of the compact JSON text of an object, given its keys and the SQL
+    expressions of the JSON text of their values, in the order of the serializer."""
+    return " || ',' || ".join(["'{{' || '\"{0}\":' || {1}".format(*members[0])] +
+                              ["'\"{0}\":' || {1}".format(key, value) for key, value in members[1:]]) + " || '}'"
+
+
+def translation_join(model, master, alias, fields):
+    table = model._parler_meta.root_model._meta.db_table
+    fields = ', '.join('translation.' + field for field in fields)
+    return TRANSLATION_SQL.format(fields=fields, table=table, master=master, alias=alias)
+
+
+def build_services_at_location_sql():
+    address_json = json_object([(field, json_value('address.' + field)) for field in
+                                ('id', 'attention', 'address', 'city', 'state_province', 'postal_code', 'country')])
+    addresses_json = JSON_ARRAY_SQL.format(
+        item_json=json_object([('address_type', json_value('location_address.address_type_id')),
+                               ('address', address_json)]),
+        order_by='location_address.id',
+        from_sql=('{0} AS location_address JOIN {1} AS address ON address.id = location_address.address_id '
+                  'WHERE location_address.location_id = location.id').format(
+                      LocationAddress._meta.db_table, Address._meta.db_table))
+    phone_numbers_json = JSON_ARRAY_SQL.format(
+        item_json=json_object([('phone_number_type', json_value('phone.phone_number_type_id')),
+                               ('phone_number', json_value('phone.phone_number'))]),
+        order_by='phone.id',
+        from_sql='{0} AS phone WHERE phone.location_id = location.id'.format(PhoneAtLocation._meta.db_table))
+    service_json = json_object([
+        ('id', json_value('service.id')),
+        ('name', json_translated_value('service_translation', 'name')),
+        ('organization_id', json_value('service.organization_id')),
+        ('description', json_translated_value('service_translation', 'description')),
+        ('organization_url', json_value('organization.website')),
+        ('organization_email', json_value('organization.email')),
+        ('organization_name', json_translated_value('organization_translation', 'name')),
+        ('last_verified_date', json_value("to_char(service.last_verified_date, 'YYYY-MM-DD')")),
+    ])
+    location_json = json_object([
+        ('id', json_value('location.id')),
+        ('name', json_translated_value('location_translation', 'name')),
+        ('organization_id', json_value('location.organization_id')),
+        ('latitude', json_float8('ST_Y(location.point)')),
+        ('longitude', json_float8('ST_X(location.point)')),
+        ('description', json_translated_value('location_translation', 'description')),
+        ('addresses', addresses_json),
+        ('phone_numbers', phone_numbers_json),
+    ])
+    return SERVICES_AT_LOCATION_SQL.format(
+        service_at_location_json=json_object([('id', json_value('service_at_location.id')),
+                                              ('service', service_json),
+                                              ('location', location_json)]),
+        service_at_location=ServiceAtLocation._meta.db_table,
+        service=Service._meta.db_table,
+        organization=Organization._meta.db_table,
+        location=Location._meta.db_table,
+        service_translation=translation_join(Service, 'service', 'service_translation', ['name', 'description']),
+        organization_translation=translation_join(Organization, 'organization', 'organization_translation',
+                                                  ['name']),
+        location_translation=translation_join(Location, 'location', 'location_translation',
+                                              ['name', 'description']),
+    )
+
+
+def aggregate_services_at_location(ids):
+    """Has PostgreSQL render the data of ServiceAtLocationSerializer for the given services
+    at location as one compact JSON document, in the given order. The document is the same
+    as the one FastJSONRenderer renders from the serializer data, and is passed through by
+    it without being parsed."""
+    with connection.cursor() as cursor:
+        cursor.execute(build_services_at_location_sql(), {
+            'ids': list(ids),
+            'languages': list(get_active_language_choices()),
+        })
+        document, = cursor.fetchone()
+    document = MISSING_MEMBER_PATTERN.sub(b'', document.encode('utf-8'))
+    document = FLOAT8_PATTERN.sub(encode_float8, document)
+    return RenderedJSON(escape_line_separators(document))
+
+
+def encode_float8(match):
+    # As LocationSerializer, the stdlib json module writes floats with repr()
+    value, = struct.unpack('>d', bytes.fromhex(match.group(1).decode('ascii')))
+    return repr(value).encode('ascii')
@@ -0,0 +1,115 @@
+from parler.utils.i18n import get_active_language_choices
+from human_services.locations.models import Location, LocationAddress, ServiceAtLocation
+from human_services.organizations.models import Organization
+from human_services.phone_at_location.models import PhoneAtLocation
+from human_services.services.models import Service
+
+ADDRESS_FIELDS = ('id', 'attention', 'address', 'city', 'state_province', 'postal_code', 'country')
+
+# As with the serializers, translated fields of records without a translation in the
+# active language or its fallbacks are left out
+MISSING = object()
+
+
+def serialize_services_at_location(ids):
+    """Builds the same data as ServiceAtLocationSerializer for the given services at
+    location, in the given order, from plain column values instead of model instances."""
+    rows = ServiceAtLocation.objects.filter(id__in=ids).order_by().values_list('id', 'service_id', 'location_id')
+    rows = {row[0]: row for row in rows}
+    services = serialize_services({service_id for _, service_id, _ in rows.values()})
+    locations = serialize_locations({location_id for _, _, location_id in rows.values()})
+    result = []
+    for id in ids:
+        # Records deleted since the ids were found are left out
+        _, service_id, location_id = rows.get(id, (id, None, None))
+        service = services.get(service_id)
+        location = locations.get(location_id)
+        if service and location:
+            result.append({'id': id, 'service': service, 'location': location})
+    return result
+
+
+def serialize_services(ids):
+    rows = (Service.objects.filter(id__in=ids).order_by().
+            values_list('id', 'organization_id', 'last_verified_date', 'organization__website', 'organization__email'))
+    rows = list(rows)
+    translations = get_translated_values(Service, ids, ('name', 'description'))
+    organization_names = get_translated_values(Organization, {row[1] for row in rows}, ('name',))
+    result = {}
+    for id, organization_id, last_verified_date, organization_url, organization_email in rows:
+        name, description = translations[id]
+        organization_name, = organization_names[organization_id]
+        result[id] = without_missing_values({
+            'id': id,
+            'name': name,
+            'organization_id': organization_id,
+            'description': description,
+            'organization_url': organization_url,
+            'organization_email': organization_email,
+            'organization_name': organization_name,
+            'last_verified_date': last_verified_date.isoformat() if last_verified_date else None,
+        })
+    return result
+
+
+def serialize_locations(ids):
+    rows = Location.objects.filter(id__in=ids).order_by().values_list('id', 'organization_id', 'point')
+    translations = get_translated_values(Location, ids, ('name', 'description'))
+    addresses = get_addresses_by_location(ids)
+    phone_numbers = get_phone_numbers_by_location(ids)
+    result = {}
+    for id, organization_id, point in rows:
+        name, description = translations[id]
+        location = {'id': id, 'name': name, 'organization_id': organization_id}
+        # As with LocationSerializer, latitude and longitude are left out for locations without a point
+        if point is not None:
+            location['latitude'] = point.y
+            location['longitude'] = point.x
+        location['description'] = description
+        location['addresses'] = addresses.get(id, [])
+        location['phone_numbers'] = phone_numbers.get(id, [])
+        result[id] = without_missing_values(location)
+    return result
+
+
+def get_addresses_by_location(location_ids):
+    address_columns = ['address__' + field for field in ADDRESS_FIELDS]
+    rows = (LocationAddress.objects.filter(location_id__in=location_ids).order_by('id').
+            values_list('location_id', 'address_type_id', *address_columns))
+    result = {}
+    for location_id, address_type_id, *address in rows:
+        result.setdefault(location_id, []).append({
+            'address_type': address_type_id,
+            'address': dict(zip(ADDRESS_FIELDS, address)),
+        })
+    return result
+
+
+def get_phone_numbers_by_location(location_ids):
+    rows = (PhoneAtLocation.objects.filter(location_id__in=location_ids).order_by('id').
+            values_list('location_id', 'phone_number_type_id', 'phone_number'))
+    result = {}
+    for location_id, phone_number_type_id, phone_number in rows:
+        result.setdefault(location_id, []).append({
+            'phone_number_type': phone_number_type_id,
+            'phone_number': phone_number,
+        })
+    return result
+
+
+def get_translated_values(model, ids, field_names):
+    # Picks the translation in the active language or its fallbacks, the same as parler
+    languages = get_active_language_choices()
+    rows = (model._parler_meta.root_model.objects.
+            filter(master_id__in=ids, language_code__in=languages).
+            values_list('master_id', 'language_code', *field_names))
+    found = {(master_id, language_code): values for master_id, language_code, *values in rows}
+    missing = [MISSING] * len(field_names)
+    result = {}
+    for id in ids:
+        result[id] = next((found[id, language] for language in languages if (id, language) in found), missing)
+    return result
+
+
+def without_missing_values(data):
+    return {key: value for key, value in data.items() if value is not MISSING}
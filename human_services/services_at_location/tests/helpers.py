@@ -4,6 +4,7 @@ from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.locations.tests.helpers import LocationBuilder
 from human_services.locations.models import ServiceAtLocation
 from search.models import TaskServiceSimilarityScore
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 
 
 class ServiceAtLocationBuilder:
@@ -27,6 +28,7 @@ def set_service_similarity_score(topic_id, service_id, similarity_score):
         service_id=service_id,
         similarity_score=similarity_score
     )
+    save_topic_service_at_location_similarity_scores()
 
 
 def set_location_for_service(service_id, location_id):
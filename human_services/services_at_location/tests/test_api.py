@@ -1,6 +1,6 @@
 from rest_framework import test as rest_test
 from rest_framework import status
-from human_services.locations.tests.helpers import LocationBuilder
+from human_services.locations.tests.helpers import LocationBuilder, create_locations_with_address_and_phone_number
 from human_services.services_at_location.tests.helpers import (ServiceAtLocationBuilder,
                                                                set_location_for_service,
                                                                set_service_similarity_score)
@@ -9,8 +9,11 @@ from human_services.services.tests.helpers import ServiceBuilder
 from newcomers_guide.tests.helpers import create_topic
 from taxonomies.tests.helpers import TaxonomyTermBuilder
 from common.testhelpers.random_test_values import a_float, a_string
+from common.testhelpers.query_budget import LIST_PAGE_SIZE, QueryBudgetMixin
 from django.contrib.gis.geos import Point
 
+SERVICE_AT_LOCATION_LIST_QUERY_BUDGET = 12
+
 
 class ServicesAtLocationApiTests(rest_test.APITestCase):
     def setUp(self):
@@ -147,6 +150,43 @@ class ServicesAtLocationApiTests(rest_test.APITestCase):
         self.assertIn(near_location.name, names_in_response)
         self.assertNotIn(far_location.name, names_in_response)
 
+    def test_proximity_filter_uses_distance_in_km_not_in_degrees(self):
+        origin = Point(-34.515754, 83.561941)
+        west_by_94_km = Point(-41.960183, 83.540722)
+        south_by_101_km = Point(-34.845335, 82.655271)
+
+        origin_location = LocationBuilder(self.organization).with_point(origin).create()
+        near_location = LocationBuilder(self.organization).with_point(west_by_94_km).create()
+        far_location = LocationBuilder(self.organization).with_point(south_by_101_km).create()
+
+        set_location_for_service(self.service.id, origin_location.id)
+        set_location_for_service(self.service.id, near_location.id)
+        set_location_for_service(self.service.id, far_location.id)
+
+        url_with_user_location = ('/v1/services_at_location/?user_location={0},{1}&radius_km=100'
+                                  .format(origin.x, origin.y))
+
+        response = self.client.get(url_with_user_location)
+        names_in_response = [row['location']['name'] for row in response.json()]
+
+        self.assertIn(origin_location.name, names_in_response)
+        self.assertIn(near_location.name, names_in_response)
+        self.assertNotIn(far_location.name, names_in_response)
+
+    def test_proximity_filter_returns_400_for_user_location_out_of_range(self):
+        response = self.client.get('/v1/services_at_location/?user_location=10,95&radius_km=50')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()[0], 'Second value provided to proximity must be between -90 and 90')
+
+    def test_proximity_filter_excludes_locations_with_point_out_of_range(self):
+        out_of_range_location = LocationBuilder(self.organization).with_point(Point(10, 95)).create()
+        set_location_for_service(self.service.id, out_of_range_location.id)
+
+        response = self.client.get('/v1/services_at_location/?user_location=10,89.9&radius_km=1000')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+
     def test_proximity_filter_throws_if_radius_is_negative(self):
         url_with_negative_radius = ('/v1/services_at_location/?user_location={0},{1}&radius_km=-50'
                                     .format(a_float(), a_float()))
@@ -501,4 +541,13 @@ class ServicesAtLocationApiTests(rest_test.APITestCase):
         service_at_location = ServiceAtLocationBuilder().create()
         response = self.client.get('/v1/services_at_location/')
         json = response.json()
-        self.assertEqual(json[0]['id'], service_at_location.id)
\ No newline at end of file
+        self.assertEqual(json[0]['id'], service_at_location.id)
+
+
+class ServicesAtLocationQueryBudgetTests(QueryBudgetMixin, rest_test.APITestCase):
+    def test_list_of_services_at_location_is_within_query_budget(self):
+        organization = OrganizationBuilder().create()
+        for location in create_locations_with_address_and_phone_number(organization, LIST_PAGE_SIZE):
+            ServiceBuilder(organization).with_location(location).create()
+        self.assert_list_page_within_query_budget('/v1/services_at_location/',
+                                                  SERVICE_AT_LOCATION_LIST_QUERY_BUDGET)
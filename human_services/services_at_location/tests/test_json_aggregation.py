@@ -0,0 +1,87 @@
+import json
+from django.test import TestCase, override_settings
+from rest_framework import test as rest_test
+from rest_framework.renderers import JSONRenderer
+from human_services.locations.models import ServiceAtLocation
+from human_services.locations.tests.helpers import LocationBuilder, create_locations_with_address_and_phone_number
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.services.tests.helpers import ServiceBuilder
+from common.renderers import FastJSONRenderer, RenderedJSON
+from human_services.services_at_location.json_aggregation import aggregate_services_at_location
+from human_services.services_at_location.serializers import ServiceAtLocationSerializer
+
+
+def create_services_at_location():
+    organization = OrganizationBuilder().create()
+    locations = create_locations_with_address_and_phone_number(organization, 3)
+    locations.append(LocationBuilder(organization).with_point(None).create())
+    locations.append(LocationBuilder(organization).with_long_lat(-123.0, 49.0).create())
+    for location in locations:
+        ServiceBuilder(organization).with_location(location).create()
+    return list(ServiceAtLocation.objects.order_by('id'))
+
+
+class JsonAggregationTests(TestCase):
+    def setUp(self):
+        self.records = create_services_at_location()
+
+    def test_renders_same_json_as_serializer(self):
+        expected = ServiceAtLocationSerializer(self.records, many=True).data
+        aggregated = aggregate_services_at_location([record.id for record in self.records])
+        self.assertEqual(aggregated, JSONRenderer().render(expected))
+
+    def test_returns_rendered_json(self):
+        aggregated = aggregate_services_at_location([record.id for record in self.records])
+        self.assertIsInstance(aggregated, RenderedJSON)
+
+    def test_keeps_order_of_given_ids(self):
+        ids = [record.id for record in reversed(self.records)]
+        aggregated = json.loads(aggregate_services_at_location(ids))
+        self.assertEqual([row['id'] for row in aggregated], ids)
+
+    def test_leaves_out_coordinates_of_location_without_point(self):
+        without_point = next(record for record in self.records if record.location.point is None)
+        aggregated = json.loads(aggregate_services_at_location([without_point.id]))
+        self.assertNotIn('latitude', aggregated[0]['location'])
+        self.assertNotIn('longitude', aggregated[0]['location'])
+
+    def test_renders_same_strings_as_serializer(self):
+        record = self.records[0]
+        record.service.name = 'Caf\u00e9 "Bistro" \\ line\nbreak\ttab\x01control\u2028separator'
+        record.service.save()
+        expected = ServiceAtLocationSerializer([record], many=True).data
+        self.assertEqual(aggregate_services_at_location([record.id]), JSONRenderer().render(expected))
+
+    def test_renders_same_json_as_serializer_for_records_without_translation(self):
+        record = self.records[0]
+        for translated in (record.service, record.service.organization, record.location):
+            for language_code in translated.get_available_languages():
+                translated.delete_translation(language_code)
+        records = list(ServiceAtLocation.objects.order_by('id'))
+        expected = ServiceAtLocationSerializer(records, many=True).data
+        aggregated = aggregate_services_at_location([record.id for record in records])
+        self.assertEqual(aggregated, JSONRenderer().render(expected))
+        self.assertNotIn('name', json.loads(aggregated)[0]['service'])
+
+    def test_returns_empty_list_for_no_ids(self):
+        self.assertEqual(aggregate_services_at_location([]), b'[]')
+
+
+class JsonAggregationApiTests(rest_test.APITestCase):
+    def test_response_is_same_as_without_json_aggregation(self):
+        records = create_services_at_location()
+        url = '/v1/services_at_location/?proximity={0},{1}'.format(records[0].location.point.x,
+                                                                   records[0].location.point.y)
+        with override_settings(SERVICES_AT_LOCATION_JSON_AGGREGATION=False):
+            expected = self.client.get(url).content
+        with override_settings(SERVICES_AT_LOCATION_JSON_AGGREGATION=True):
+            aggregated = self.client.get(url).content
+        self.assertEqual(aggregated, expected)
+
+    def test_parses_rendered_json_for_indented_output(self):
+        records = create_services_at_location()
+        with override_settings(SERVICES_AT_LOCATION_JSON_AGGREGATION=True):
+            response = self.client.get('/v1/services_at_location/', HTTP_ACCEPT='application/json; indent=4')
+        expected = FastJSONRenderer().render(ServiceAtLocationSerializer(records, many=True).data,
+                                             'application/json; indent=4')
+        self.assertEqual(response.content, expected)
@@ -0,0 +1,58 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from human_services.locations.models import ServiceAtLocation
+from human_services.locations.tests.helpers import LocationBuilder, create_locations_with_address_and_phone_number
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.services.tests.helpers import ServiceBuilder
+from human_services.services_at_location.lean_serializers import serialize_services_at_location
+from human_services.services_at_location.serializers import ServiceAtLocationSerializer
+
+
+class LeanServiceAtLocationSerializerTests(TestCase):
+    def setUp(self):
+        organization = OrganizationBuilder().create()
+        locations = create_locations_with_address_and_phone_number(organization, 3)
+        locations.append(LocationBuilder(organization).with_point(None).create())
+        for location in locations:
+            ServiceBuilder(organization).with_location(location).create()
+        self.records = list(ServiceAtLocation.objects.order_by('id'))
+
+    def test_builds_same_data_as_serializer(self):
+        expected = ServiceAtLocationSerializer(self.records, many=True).data
+        lean = serialize_services_at_location([record.id for record in self.records])
+        self.assertEqual(JSONRenderer().render(lean), JSONRenderer().render(expected))
+
+    def test_keeps_order_of_given_ids(self):
+        ids = [record.id for record in reversed(self.records)]
+        lean = serialize_services_at_location(ids)
+        self.assertEqual([row['id'] for row in lean], ids)
+
+    def test_leaves_out_coordinates_of_location_without_point(self):
+        lean = serialize_services_at_location([self.records[-1].id])
+        self.assertNotIn('latitude', lean[0]['location'])
+        self.assertNotIn('longitude', lean[0]['location'])
+
+    def delete_translations(self, record):
+        for translated in (record.service, record.service.organization, record.location):
+            for language_code in translated.get_available_languages():
+                translated.delete_translation(language_code)
+
+    def test_builds_same_data_as_serializer_for_records_without_translation(self):
+        self.delete_translations(self.records[0])
+        records = list(ServiceAtLocation.objects.order_by('id'))
+        expected = ServiceAtLocationSerializer(records, many=True).data
+        lean = serialize_services_at_location([record.id for record in records])
+        self.assertEqual(JSONRenderer().render(lean), JSONRenderer().render(expected))
+
+    def test_leaves_out_translated_fields_of_records_without_translation(self):
+        self.delete_translations(self.records[0])
+        lean = serialize_services_at_location([self.records[0].id])
+        self.assertNotIn('name', lean[0]['service'])
+        self.assertNotIn('organization_name', lean[0]['service'])
+        self.assertNotIn('name', lean[0]['location'])
+
+    def test_leaves_out_deleted_records(self):
+        deleted = self.records[0]
+        deleted.delete()
+        lean = serialize_services_at_location([record.id for record in self.records])
+        self.assertEqual([row['id'] for row in lean], [record.id for record in self.records[1:]])
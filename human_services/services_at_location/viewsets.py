@@ -1,25 +1,34 @@
 from rest_framework import viewsets
+from django.conf import settings
 from django.utils.decorators import method_decorator
 from human_services.locations import models
-from human_services.services_at_location import documentation, serializers
+from human_services.services_at_location import documentation, json_aggregation, lean_serializers, serializers
 # TODO move common.filters to human_services.filters,
 # LocationIdFilter and similar should be with the location code
 from common.filters import (TopicSimilarityAndProximitySortFilter, ProximityCutoffFilter,
                             SearchFilter, LocationIdFilter, ServiceIdFilter, TaxonomyFilter)
+from common.cache import CachedResponseMixin
+from common.view import LeanListMixin
+from search.models import Task, TaskServiceAtLocationSimilarityScore, TaskServiceSimilarityScore
+from taxonomies.models import TaxonomyTerm
 
 
 # pylint: disable=too-many-ancestors
 @method_decorator(name='list', decorator=documentation.get_service_at_location_list_schema())
-class ServiceAtLocationViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceAtLocationViewSet(CachedResponseMixin, LeanListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = (models.ServiceAtLocation.objects.
                 select_related('service').
                 select_related('location').
+                select_related('service__organization').
                 prefetch_related('service__translations').
-                prefetch_related('service__organization').
+                prefetch_related('service__organization__translations').
                 prefetch_related('location__translations').
                 prefetch_related('location__location_addresses__address').
                 prefetch_related('location__phone_numbers'))
     serializer_class = serializers.ServiceAtLocationSerializer
+    lean_list_serializer = lean_serializers.serialize_services_at_location
+    # Used by the taxonomy filter and the sorting by topic similarity
+    data_models = (TaxonomyTerm, TaskServiceAtLocationSimilarityScore, TaskServiceSimilarityScore, Task)
     search_fields = ('location__translations__name', 'location__translations__description',
                      'service__translations__name', 'service__translations__description')
     filter_backends = (SearchFilter,
@@ -29,3 +38,8 @@ class ServiceAtLocationViewSet(viewsets.ReadOnlyModelViewSet):
                        ServiceIdFilter,
                        TaxonomyFilter,
                        )
+
+    def get_lean_list_serializer(self):
+        if settings.SERVICES_AT_LOCATION_JSON_AGGREGATION:
+            return json_aggregation.aggregate_services_at_location
+        return super().get_lean_list_serializer()
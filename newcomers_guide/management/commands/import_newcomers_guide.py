@@ -4,6 +4,7 @@ from newcomers_guide.read_data import read_topic_data, read_taxonomy_data
 from newcomers_guide.parse_data import parse_topic_files, parse_taxonomy_files
 from newcomers_guide.save_topics import save_topics
 from bc211.import_icarol_xml.import_counters import ImportCounters
+from common.cache import bump_cache_generation
 
 
 # invoke as follows:
@@ -32,3 +33,4 @@ class Command(BaseCommand):
 
         counts = ImportCounters()
         save_topics(topics, counts)
+        bump_cache_generation()
@@ -1,3 +1,5 @@
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework import test as rest_test
 from rest_framework import status
 from qa_tool.tests.helpers import AlgorithmBuilder
@@ -29,6 +31,15 @@ class AlgorithmsTests(rest_test.APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json()['notes'], algorithm_notes)
 
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_returns_not_modified_for_matching_etag(self):
+        cache.clear()
+        AlgorithmBuilder().create()
+        url = '/qa/v1/algorithms/'
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_cannot_post(self):
         url = '/qa/v1/algorithms/'
         response = self.client.post(url, self.data)
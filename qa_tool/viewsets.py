@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, status, authentication
 from rest_framework.response import Response
 from qa_tool import models, serializers
+from common.cache import CachedResponseMixin
 from django.utils import timezone
 from django.http import Http404
 
@@ -60,11 +61,11 @@ class RelevancyScoreViewSet(viewsets.ModelViewSet):
         return data
 
 
-class AlgorithmViewSet(viewsets.ReadOnlyModelViewSet):
+class AlgorithmViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.Algorithm.objects.all()
     serializer_class = serializers.AlgorithmSerializer
 
 
-class SearchLocationViewSet(viewsets.ReadOnlyModelViewSet):
+class SearchLocationViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.SearchLocation.objects.all()
     serializer_class = serializers.SearchLocationSerializer
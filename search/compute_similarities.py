@@ -1,10 +1,14 @@
 import re
 import logging
+import pickle
+import numpy
+import scipy.sparse
 import spacy
 import sklearn.preprocessing
 from textacy.vsm import Vectorizer
 from django.utils.text import slugify
 from spacy.lang.en.stop_words import STOP_WORDS as SPACY_STOP_WORDS
+from search.token_cache import compute_text_key
 
 LOGGER = logging.getLogger(__file__)
 
@@ -29,12 +33,17 @@ def to_service_ids_and_descriptions(services):
     return (ids, descriptions)
 
 
-def compute_similarities_by_tf_idf(docs, topic_ids, service_ids, results_to_save, results_file):
+def compute_similarities_by_tf_idf(docs, topic_ids, service_ids, related_topic_count,
+                                  related_service_count, results_to_save, results_file, workers=1,
+                                  token_cache=None, vectorizer_path=None):
+    vectorizer = build_vectorizer()
+    term_matrix = compute_term_matrix(vectorizer, docs, workers, token_cache)
+    if vectorizer_path:
+        save_vectorizer(vectorizer, vectorizer_path)
     if is_saving_intermediates_to_file(results_to_save, results_file):
-        return compute_similarities_and_save_intermediates(docs, topic_ids, service_ids,
-                                                           results_to_save, results_file)
-
-    return compute_similarities(docs)
+        write_intermediary_results_as_csv(vectorizer, term_matrix, topic_ids,
+                                          service_ids, results_to_save, results_file)
+    return compute_top_similarities(term_matrix, len(topic_ids), related_topic_count, related_service_count)
 
 
 def is_saving_intermediates_to_file(results_to_save, results_file):
@@ -53,27 +62,77 @@ def is_saving_intermediates_to_file(results_to_save, results_file):
     return False
 
 
-def compute_similarities(docs):
-    vectorizer = Vectorizer(tf_type='linear', apply_idf=True, idf_type='smooth', apply_dl=False)
-    term_matrix = compute_term_matrix(vectorizer, docs)
-    return compute_cosine_doc_similarities(term_matrix)
+def build_vectorizer():
+    return Vectorizer(tf_type='linear', apply_idf=True, idf_type='smooth', apply_dl=False)
 
 
-def compute_similarities_and_save_intermediates(docs, topic_ids, service_ids, results_to_save, results_file):
-    vectorizer = Vectorizer(tf_type='linear', apply_idf=True, idf_type='smooth', apply_dl=False)
-    term_matrix = compute_term_matrix(vectorizer, docs)
-    write_intermediary_results_as_csv(vectorizer, term_matrix, topic_ids,
-                                      service_ids, results_to_save, results_file)
-    return compute_cosine_doc_similarities(term_matrix)
+# Only lemmas and token flags are used, these need the tagger but not the parser or the
+# named entity recognizer, which are the most expensive parts of the pipeline
+UNUSED_SPACY_PIPES = ['parser', 'ner']
+TOKENIZER_BATCH_SIZE = 200
 
 
-def compute_term_matrix(vectorizer, docs):
-    nlp = spacy.load('en')
-    spacy_docs = [nlp(doc) for doc in docs]
-    tokenized_docs = ([token.lemma_.lower() for token in doc if not is_stop_word(token)] for doc in spacy_docs)
+def compute_term_matrix(vectorizer, docs, workers=1, token_cache=None):
+    tokenized_docs = tokenize_docs(docs, workers, token_cache)
     return vectorizer.fit_transform(tokenized_docs)
 
 
+def compute_service_similarities_with_vectorizer(vectorizer, topic_docs, service_docs,
+                                                 related_service_count, workers=1, token_cache=None):
+    # Uses the vocabulary and IDF of a previous fit, so that the scores are comparable to
+    # the ones already saved for services that are not being rescored
+    term_matrix = vectorizer.transform(tokenize_docs(topic_docs + service_docs, workers, token_cache))
+    normalized_matrix = sklearn.preprocessing.normalize(term_matrix, axis=1).tocsr()
+    topic_count = len(topic_docs)
+    return compute_topic_service_similarities(normalized_matrix[:topic_count],
+                                              normalized_matrix[topic_count:],
+                                              related_service_count)
+
+
+def save_vectorizer(vectorizer, path):
+    with open(path, 'wb') as file:
+        pickle.dump(vectorizer, file)
+
+
+def load_vectorizer(path):
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+def tokenize_docs(docs, workers=1, token_cache=None):
+    if token_cache is None:
+        return tokenize_docs_with_spacy(docs, workers)
+
+    keys = [compute_text_key(doc) for doc in docs]
+    tokenized_docs = [token_cache.get(key) for key in keys]
+    missing_indices = [i for i, tokens in enumerate(tokenized_docs) if tokens is None]
+    LOGGER.info('%d of %d documents found in token cache', len(docs) - len(missing_indices), len(docs))
+
+    if missing_indices:
+        missing_docs = [docs[i] for i in missing_indices]
+        for i, tokens in zip(missing_indices, tokenize_docs_with_spacy(missing_docs, workers)):
+            tokenized_docs[i] = tokens
+            token_cache.set(keys[i], tokens)
+
+    token_cache.save()
+    return tokenized_docs
+
+
+def tokenize_docs_with_spacy(docs, workers=1):
+    nlp = spacy.load('en', disable=UNUSED_SPACY_PIPES)
+    spacy_docs = nlp.pipe(docs, batch_size=TOKENIZER_BATCH_SIZE, n_process=workers)
+    return [to_tokens(doc) for doc in spacy_docs]
+
+
+def compute_tokenizer_fingerprint():
+    settings = [spacy.__version__, 'en', ' '.join(UNUSED_SPACY_PIPES), ' '.join(sorted(STOPLIST))]
+    return compute_text_key('\n'.join(settings))
+
+
+def to_tokens(spacy_doc):
+    return [token.lemma_.lower() for token in spacy_doc if not is_stop_word(token)]
+
+
 def is_stop_word(token):
     return (token.is_space or
             token.is_punct or
@@ -142,9 +201,76 @@ def write_comma_separated_terms_with_scores(file_handle, document_terms):
         file_handle.write(')"')
 
 
-def compute_cosine_doc_similarities(matrix):
-    normalized_matrix = sklearn.preprocessing.normalize(matrix, axis=1)
-    return normalized_matrix * normalized_matrix.T
+# Number of services to compare all topics against at a time, bounds the memory used
+# to topic count * (SERVICE_BLOCK_SIZE + related service count) scores
+SERVICE_BLOCK_SIZE = 2000
+
+
+def compute_top_similarities(term_matrix, topic_count, related_topic_count, related_service_count):
+    # Assuming that the term matrix rows are topic descriptions *followed by* service descriptions
+    normalized_matrix = sklearn.preprocessing.normalize(term_matrix, axis=1).tocsr()
+    topic_vectors = normalized_matrix[:topic_count]
+    service_vectors = normalized_matrix[topic_count:]
+    topic_similarities = compute_topic_similarities(topic_vectors, related_topic_count)
+    service_similarities = compute_topic_service_similarities(topic_vectors, service_vectors,
+                                                              related_service_count)
+    return (topic_similarities, service_similarities)
+
+
+def compute_topic_similarities(topic_vectors, count):
+    return select_top_similarities(topic_vectors * topic_vectors.T, count, exclude_diagonal=True)
+
+
+def compute_topic_service_similarities(topic_vectors, service_vectors, count, block_size=SERVICE_BLOCK_SIZE):
+    result = TopSimilarities(topic_vectors.shape[0], count)
+    for first_service in range(0, service_vectors.shape[0], block_size):
+        block = topic_vectors * service_vectors[first_service:first_service + block_size].T
+        result.add_block(to_dense_array(block), first_service)
+    return result
+
+
+def select_top_similarities(similarities, count, exclude_diagonal=False):
+    block = to_dense_array(similarities)
+    if exclude_diagonal:
+        numpy.fill_diagonal(block, -numpy.inf)
+    result = TopSimilarities(block.shape[0], count)
+    result.add_block(block, 0)
+    return result
+
+
+def to_dense_array(matrix):
+    if scipy.sparse.issparse(matrix):
+        return matrix.toarray().astype(float)
+    return numpy.array(matrix, dtype=float)
+
+
+class TopSimilarities:
+    """For each row (topic), the column indices and scores of the highest scoring columns seen
+    so far. Blocks of columns are added one at a time and only the best scores are kept, so
+    the full row is never held in memory. Scores of -inf mark excluded entries."""
+
+    def __init__(self, row_count, count):
+        self.count = count
+        self.columns = numpy.empty((row_count, 0), dtype=numpy.int64)
+        self.scores = numpy.empty((row_count, 0))
+
+    def add_block(self, block, first_column):
+        if self.count <= 0:
+            return
+        block_columns = numpy.arange(first_column, first_column + block.shape[1])
+        columns = numpy.hstack([self.columns, numpy.broadcast_to(block_columns, block.shape)])
+        scores = numpy.hstack([self.scores, block])
+        if scores.shape[1] > self.count:
+            best = numpy.argpartition(-scores, self.count - 1, axis=1)[:, :self.count]
+            columns = numpy.take_along_axis(columns, best, axis=1)
+            scores = numpy.take_along_axis(scores, best, axis=1)
+        self.columns = columns
+        self.scores = scores
+
+    def for_row(self, row):
+        order = numpy.argsort(-self.scores[row], kind='stable')
+        return [(int(self.columns[row, i]), float(self.scores[row, i]))
+                for i in order if numpy.isfinite(self.scores[row, i])]
 
 
 def remove_phone_numbers(description):
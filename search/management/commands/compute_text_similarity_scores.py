@@ -1,13 +1,21 @@
 import argparse
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from newcomers_guide.read_data import read_topic_data
 from newcomers_guide.parse_data import parse_topic_files
 from human_services.services.models import Service
+from common.cache import bump_cache_generation
 from search.compute_similarities import (to_topic_ids_and_descriptions,
                                          to_service_ids_and_descriptions,
-                                         compute_similarities_by_tf_idf)
+                                         compute_similarities_by_tf_idf,
+                                         compute_tokenizer_fingerprint,
+                                         compute_service_similarities_with_vectorizer,
+                                         load_vectorizer)
+from search.read_similarities import read_ids_one_per_line
+from search.token_cache import TokenCache
 from search.save_similarities import (save_topic_similarities,
-                                      save_topic_service_similarity_scores)
+                                      save_topic_service_similarity_scores,
+                                      save_topic_service_at_location_similarity_scores)
+from search.update_similarities_for_services import update_similarities_for_services
 
 
 class Command(BaseCommand):
@@ -27,6 +35,26 @@ class Command(BaseCommand):
                             type=int,
                             default=50,
                             help='for each topic, store this many related services')
+        parser.add_argument('--workers',
+                            dest='workers',
+                            type=int,
+                            default=1,
+                            help='number of processes to use for tokenizing topic and service descriptions')
+        parser.add_argument('--token_cache',
+                            dest='token_cache',
+                            help=('path to file for caching tokenized descriptions between runs, ' +
+                                  'only new or changed descriptions are tokenized when this is given'))
+        parser.add_argument('--vectorizer_file',
+                            dest='vectorizer_file',
+                            help=('path to file holding the vocabulary and IDF weights, written by a full ' +
+                                  'computation and required by --changed_services and --removed_services'))
+        parser.add_argument('--changed_services',
+                            dest='changed_services',
+                            help=('path to file containing ids of added or changed services, one per line. ' +
+                                  'Only these services are rescored, using the saved vocabulary and IDF weights'))
+        parser.add_argument('--removed_services',
+                            dest='removed_services',
+                            help='path to file containing ids of removed services, one per line')
         parser.add_argument('--save_intermediate_results',
                             dest='results_to_save',
                             type=int,
@@ -41,11 +69,23 @@ class Command(BaseCommand):
                             help='path to file for saving word-scores, required if --save_intermediate_results is given')
 
     def handle(self, *args, **options):
+        if options['changed_services'] or options['removed_services']:
+            self.update_changed_services(options)
+        else:
+            self.compute_all_similarities(options)
+        print('Saving topic-service at location similarities...')
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
+
+    def compute_all_similarities(self, options):
         root_folder = options['newcomers_guide_path']
         related_topic_count = options['related_topics']
         related_service_count = options['related_services']
         results_to_save = options['results_to_save']
         results_file = options['results_file']
+        workers = options['workers']
+        token_cache = build_token_cache(options['token_cache'])
+        vectorizer_file = options['vectorizer_file']
 
         print('All topic data and topic/service similarity data will be deleted and reimported')
 
@@ -64,18 +104,64 @@ class Command(BaseCommand):
         descriptions = topic_descriptions + service_descriptions
 
         print('{} services read, computing similarities...'.format(len(service_ids)))
-        cosine_doc_similarities = compute_similarities_by_tf_idf(descriptions,
-                                                                 topic_ids,
-                                                                 service_ids,
-                                                                 results_to_save,
-                                                                 results_file)
+        topic_similarities, service_similarities = compute_similarities_by_tf_idf(descriptions,
+                                                                                  topic_ids,
+                                                                                  service_ids,
+                                                                                  related_topic_count,
+                                                                                  related_service_count,
+                                                                                  results_to_save,
+                                                                                  results_file,
+                                                                                  workers,
+                                                                                  token_cache,
+                                                                                  vectorizer_file)
+
+        print('Saving topic similarities...')
+        save_topic_similarities(topic_ids, topic_similarities)
+        print('Saving topic-service similarities...')
+        save_topic_service_similarity_scores(topic_ids, service_ids, service_similarities)
 
-        print('Saving {} topic similarities...'.format(len(topic_ids)*(len(topic_ids)-1)))
-        save_topic_similarities(topic_ids, cosine_doc_similarities, related_topic_count)
-        print('Saving {} topic-service similarities...'.format(len(topic_ids)*len(service_ids)))
-        save_topic_service_similarity_scores(topic_ids, service_ids, cosine_doc_similarities, related_service_count)
+    def update_changed_services(self, options):
+        vectorizer_file = options['vectorizer_file']
+        if not vectorizer_file:
+            raise CommandError('--vectorizer_file from a previous full computation is required '
+                               'with --changed_services and --removed_services')
+
+        # Only the changed services are tokenized, the cached tokens of the others must be kept
+        token_cache = build_token_cache(options['token_cache'], evict_unused=False)
+        changed_service_ids = read_optional_ids(options['changed_services'])
+        removed_service_ids = read_optional_ids(options['removed_services'])
+
+        print('Reading topics...')
+        topics = read_topic_descriptions(options['newcomers_guide_path'])
+        topic_ids, topic_descriptions = to_topic_ids_and_descriptions(topics)
+
+        services = Service.objects.filter(id__in=changed_service_ids)
+        service_ids, service_descriptions = to_service_ids_and_descriptions(services)
+
+        print('{} topics read, computing similarities for {} changed services...'.
+              format(len(topic_ids), len(service_ids)))
+        similarities = compute_service_similarities_with_vectorizer(load_vectorizer(vectorizer_file),
+                                                                    topic_descriptions,
+                                                                    service_descriptions,
+                                                                    options['related_services'],
+                                                                    options['workers'],
+                                                                    token_cache)
+
+        print('Updating topic-service similarities, {} services removed...'.format(len(removed_service_ids)))
+        update_similarities_for_services(topic_ids, service_ids, similarities,
+                                         options['related_services'], removed_service_ids)
 
 
 def read_topic_descriptions(root_folder):
     topic_data = read_topic_data(root_folder)
     return parse_topic_files(topic_data)
+
+
+def build_token_cache(path, evict_unused=True):
+    if not path:
+        return None
+    return TokenCache(path, compute_tokenizer_fingerprint(), evict_unused)
+
+
+def read_optional_ids(path):
+    return read_ids_one_per_line(path) if path else []
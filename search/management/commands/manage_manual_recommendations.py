@@ -2,9 +2,11 @@ import os
 import re
 import logging
 from django.core.management.base import BaseCommand
+from common.cache import bump_cache_generation
 from django.core import exceptions
 from search.read_csv_data_from_file import read_csv_data_from_file
 from search.models import TaskServiceSimilarityScore
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 from human_services.services.models import Service
 
 LOGGER = logging.getLogger(__name__)
@@ -43,6 +45,8 @@ class Command(BaseCommand):
                 self.print_error(filename, error)
             except ValueError as error:
                 self.print_error(filename, error)
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
 
     def print_error(self, filename, error):
         error = '{filename}: {error_message}'.format(
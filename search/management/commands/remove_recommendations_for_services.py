@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from common.cache import bump_cache_generation
 from search.read_similarities import read_ids_one_per_line
 from search.remove_similarities_for_services import remove_similarities_for_services
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 
 
 class Command(BaseCommand):
@@ -19,3 +21,5 @@ class Command(BaseCommand):
         service_ids = read_ids_one_per_line(topics_list_path)
         print('Removing similarities for {} services...'.format(len(service_ids)))
         remove_similarities_for_services(service_ids)
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from common.cache import bump_cache_generation
 from search.read_similarities import read_ids_one_per_line
 from search.remove_similarities_for_topics import remove_similarities_for_topics
+from search.save_similarities import save_topic_service_at_location_similarity_scores
 
 
 class Command(BaseCommand):
@@ -19,3 +21,5 @@ class Command(BaseCommand):
         topics_ids = read_ids_one_per_line(topics_list_path)
         print('Removing similarities for {} topics...'.format(len(topics_ids)))
         remove_similarities_for_topics(topics_ids)
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
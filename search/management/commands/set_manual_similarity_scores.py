@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from common.cache import bump_cache_generation
 from search.read_similarities import build_manual_similarity_map
-from search.save_similarities import save_manual_similarities
+from search.save_similarities import (save_manual_similarities,
+                                      save_topic_service_at_location_similarity_scores)
 from search.read_csv_data_from_file import read_csv_data_from_file
 
 
@@ -20,3 +22,5 @@ class Command(BaseCommand):
         manual_similarities_map = build_manual_similarity_map(manual_similarities_csv)
         print('Saving manual topic-service similarities...')
         save_manual_similarities(manual_similarities_map)
+        save_topic_service_at_location_similarity_scores()
+        bump_cache_generation()
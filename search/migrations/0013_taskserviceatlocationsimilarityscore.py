@@ -0,0 +1,27 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0021_auto_20201215_0024'),
+        ('search', '0012_merge_20200706_1831'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskServiceAtLocationSimilarityScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity_score', models.FloatField()),
+                ('point', django.contrib.gis.db.models.fields.PointField(blank=True, null=True, srid=4326)),
+                ('service_at_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_scores', to='locations.serviceatlocation')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='search.task')),
+            ],
+            options={
+                'unique_together': {('task', 'service_at_location')},
+            },
+        ),
+    ]
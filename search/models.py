@@ -1,7 +1,8 @@
 from common.models import ValidateOnSaveMixin, RequiredCharField
 from human_services.services.models import Service
+from human_services.locations.models import ServiceAtLocation
 from django.core import validators
-from django.db import models
+from django.contrib.gis.db import models
 from parler.models import TranslatableModel, TranslatedFields
 from taxonomies.models import TaxonomyTerm
 
@@ -37,3 +38,14 @@ class TaskServiceSimilarityScore(ValidateOnSaveMixin, models.Model):
 
     class Meta:
         unique_together = ('task', 'service')
+
+
+class TaskServiceAtLocationSimilarityScore(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    service_at_location = models.ForeignKey(ServiceAtLocation, on_delete=models.CASCADE,
+                                            related_name='task_scores')
+    similarity_score = models.FloatField()
+    point = models.PointField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('task', 'service_at_location')
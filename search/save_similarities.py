@@ -1,58 +1,72 @@
 import logging
-from search.models import Task, TaskSimilarityScore, TaskServiceSimilarityScore
+from django.db import transaction
+from search.models import (Task, TaskSimilarityScore, TaskServiceSimilarityScore,
+                           TaskServiceAtLocationSimilarityScore)
 from human_services.services.models import Service
+from human_services.locations.models import ServiceAtLocation
 
 LOGGER = logging.getLogger(__name__)
 
+BULK_CREATE_BATCH_SIZE = 1000
 
-def save_topic_similarities(ids, similarities, count):
-    TaskSimilarityScore.objects.all().delete()
-
-    if count == 0:
-        return
 
-    for i in range(len(ids)):
-        similarities_for_topic = [similarities[i, j] for j in range(len(ids)) if i != j]
-        cutoff = compute_cutoff(similarities_for_topic, count)
-        for j in range(len(ids)):
-            score = similarities[i, j]
-            if i != j and score >= cutoff:
-                record = TaskSimilarityScore(first_task_id=ids[i],
-                                             second_task_id=ids[j],
-                                             similarity_score=score)
-                record.save()
+@transaction.atomic
+def save_topic_similarities(ids, similarities):
+    TaskSimilarityScore.objects.all().delete()
 
+    def build_records():
+        for i in range(len(ids)):
+            for j, score in similarities.for_row(i):
+                yield TaskSimilarityScore(first_task_id=ids[i],
+                                          second_task_id=ids[j],
+                                          similarity_score=score)
 
-def compute_cutoff(scores, count):
-    scores.sort(reverse=True)
-    return scores[min(count, len(scores)) - 1]
+    bulk_create_in_batches(TaskSimilarityScore, build_records())
 
 
-def save_topic_service_similarity_scores(topic_ids, service_ids, similarities, count):
+@transaction.atomic
+def save_topic_service_similarity_scores(topic_ids, service_ids, similarities):
     TaskServiceSimilarityScore.objects.all().delete()
 
-    if count == 0:
-        return
-
-    topic_count = len(topic_ids)
-    service_count = len(service_ids)
-
-    # Assuming that the similarities are computed from a document vector
-    # containing topic descriptions *followed by* service descriptions
-    def to_service_similarity_offset(service_index):
-        return topic_count + service_index
-
-    for i in range(topic_count):
-        similarities_for_topic = [similarities[i, to_service_similarity_offset(j)]
-                                  for j in range(service_count)]
-        cutoff = compute_cutoff(similarities_for_topic, count)
-        for j in range(service_count):
-            score = similarities[i, to_service_similarity_offset(j)]
-            if score >= cutoff:
-                record = TaskServiceSimilarityScore(task_id=topic_ids[i],
-                                                    service_id=service_ids[j],
-                                                    similarity_score=score)
-                record.save()
+    def build_records():
+        for i in range(len(topic_ids)):
+            for j, score in similarities.for_row(i):
+                yield TaskServiceSimilarityScore(task_id=topic_ids[i],
+                                                 service_id=service_ids[j],
+                                                 similarity_score=score)
+
+    bulk_create_in_batches(TaskServiceSimilarityScore, build_records())
+
+
+def bulk_create_in_batches(model, records, batch_size=BULK_CREATE_BATCH_SIZE):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+# The services_at_location endpoint sorts by topic similarity and distance together, store the
+# similarity score and the location point for each service at location, so that the sort does
+# not need to join through services to the similarity scores on every request
+@transaction.atomic
+def save_topic_service_at_location_similarity_scores():
+    TaskServiceAtLocationSimilarityScore.objects.all().delete()
+    rows = (ServiceAtLocation.objects.
+            filter(service__taskservicesimilarityscore__isnull=False).
+            values_list('id',
+                        'service__taskservicesimilarityscore__task_id',
+                        'service__taskservicesimilarityscore__similarity_score',
+                        'location__point'))
+    records = (TaskServiceAtLocationSimilarityScore(service_at_location_id=service_at_location_id,
+                                                    task_id=task_id,
+                                                    similarity_score=score,
+                                                    point=point)
+               for service_at_location_id, task_id, score, point in rows.iterator())
+    bulk_create_in_batches(TaskServiceAtLocationSimilarityScore, records)
 
 
 def save_manual_similarities(manual_similarities):
@@ -1,13 +1,30 @@
+import os
+from tempfile import TemporaryDirectory
 from django.test import TestCase
+import scipy.sparse
+import sklearn.preprocessing
 from search.compute_similarities import (to_topic_ids_and_descriptions,
                                          to_service_ids_and_descriptions,
-                                         compute_similarities)
+                                         build_vectorizer,
+                                         compute_term_matrix,
+                                         compute_service_similarities_with_vectorizer,
+                                         tokenize_docs,
+                                         compute_topic_service_similarities,
+                                         compute_topic_similarities)
 from human_services.services.models import Service
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.services.tests.helpers import ServiceBuilder
+from search.token_cache import TokenCache, compute_text_key
 from common.testhelpers.random_test_values import a_string
 
 
+def compute_similarities_to_first_string(strings):
+    term_matrix = compute_term_matrix(build_vectorizer(), strings)
+    vectors = sklearn.preprocessing.normalize(term_matrix, axis=1).tocsr()
+    similarities = compute_topic_service_similarities(vectors[:1], vectors, len(strings))
+    return dict(similarities.for_row(0))
+
+
 class TestTopicSimilarityScore(TestCase):
     def setUp(self):
         self.topic_id = a_string()
@@ -60,22 +77,22 @@ class TestTopicSimilarityScore(TestCase):
                    'likewise aligator interloper and fumigator',
                    'different lollipop candybar and icecream']
 
-        similarity_matrix = compute_similarities(strings)
+        similarities = compute_similarities_to_first_string(strings)
 
-        self.assertGreater(similarity_matrix[0, 0], 0.99)
-        self.assertGreater(similarity_matrix[0, 1], 0.79)
-        self.assertLess(similarity_matrix[0, 2], 0.01)
+        self.assertGreater(similarities[0], 0.99)
+        self.assertGreater(similarities[1], 0.79)
+        self.assertLess(similarities[2], 0.01)
 
     def test_similarities_ignore_case(self):
         strings = ['aligator interloper and fumigator',
                    'LIKEWISE Aligator INTERLOPER and FUmiGAtoR',
                    'different lollipop candybar and icecream']
 
-        similarity_matrix = compute_similarities(strings)
+        similarities = compute_similarities_to_first_string(strings)
 
-        self.assertGreater(similarity_matrix[0, 0], 0.99)
-        self.assertGreater(similarity_matrix[0, 1], 0.79)
-        self.assertLess(similarity_matrix[0, 2], 0.01)
+        self.assertGreater(similarities[0], 0.99)
+        self.assertGreater(similarities[1], 0.79)
+        self.assertLess(similarities[2], 0.01)
 
     def test_ignores_stop_words_when_computing_similarity(self):
         stop_words_from_spacy = 'already also although always among amongst amount an and another'
@@ -83,11 +100,11 @@ class TestTopicSimilarityScore(TestCase):
                    'likewise aligator interloper and fumigator ' + stop_words_from_spacy,
                    'different lollipop candybar and icecream ' + stop_words_from_spacy]
 
-        similarity_matrix = compute_similarities(strings)
+        similarities = compute_similarities_to_first_string(strings)
 
-        self.assertGreater(similarity_matrix[0, 0], 0.99)
-        self.assertGreater(similarity_matrix[0, 1], 0.79)
-        self.assertLess(similarity_matrix[0, 2], 0.01)
+        self.assertGreater(similarities[0], 0.99)
+        self.assertGreater(similarities[1], 0.79)
+        self.assertLess(similarities[2], 0.01)
 
     def test_stop_words_are_case_insensitive(self):
         stop_words_from_spacy = 'ALREADY Also Although ALWAYS Among AMONGST Amount An AND Another'
@@ -95,11 +112,11 @@ class TestTopicSimilarityScore(TestCase):
                    'likewise aligator interloper and fumigator ' + stop_words_from_spacy,
                    'different lollipop candybar and icecream ' + stop_words_from_spacy]
 
-        similarity_matrix = compute_similarities(strings)
+        similarities = compute_similarities_to_first_string(strings)
 
-        self.assertGreater(similarity_matrix[0, 0], 0.99)
-        self.assertGreater(similarity_matrix[0, 1], 0.79)
-        self.assertLess(similarity_matrix[0, 2], 0.01)
+        self.assertGreater(similarities[0], 0.99)
+        self.assertGreater(similarities[1], 0.79)
+        self.assertLess(similarities[2], 0.01)
 
     def test_removes_local_phone_numbers_from_description(self):
         description_with_phone_numbers = 'Call 778-123-4567 or 604-123-4567 for more information.'
@@ -142,3 +159,84 @@ class TestTopicSimilarityScore(TestCase):
         ServiceBuilder(self.organization).with_description(description_with_numbers).create()
         _, descriptions = to_service_ids_and_descriptions(Service.objects.all())
         self.assertIn(expected_description, descriptions[0])
+
+
+class TestTopSimilarities(TestCase):
+    def setUp(self):
+        self.topic_vectors = scipy.sparse.csr_matrix([[1.0, 0.0, 0.0],
+                                                      [0.6, 0.8, 0.0],
+                                                      [0.0, 0.6, 0.8]])
+        self.service_vectors = scipy.sparse.csr_matrix([[0.0, 0.0, 1.0],
+                                                        [1.0, 0.0, 0.0],
+                                                        [0.0, 1.0, 0.0],
+                                                        [0.8, 0.6, 0.0],
+                                                        [0.0, 0.8, 0.6]])
+
+    def test_topic_similarities_exclude_the_topic_itself(self):
+        similarities = compute_topic_similarities(self.topic_vectors, 2)
+        self.assertNotIn(0, [column for column, _ in similarities.for_row(0)])
+
+    def test_topic_similarities_are_sorted_by_score(self):
+        similarities = compute_topic_similarities(self.topic_vectors, 2)
+        self.assertEqual([column for column, _ in similarities.for_row(1)], [0, 2])
+
+    def test_keeps_services_with_highest_scores_across_blocks(self):
+        similarities = compute_topic_service_similarities(self.topic_vectors, self.service_vectors, 2,
+                                                          block_size=2)
+        self.assertEqual([column for column, _ in similarities.for_row(0)], [1, 3])
+        self.assertEqual([column for column, _ in similarities.for_row(2)], [4, 0])
+
+    def test_block_size_does_not_affect_result(self):
+        in_blocks = compute_topic_service_similarities(self.topic_vectors, self.service_vectors, 2,
+                                                       block_size=2)
+        in_one_block = compute_topic_service_similarities(self.topic_vectors, self.service_vectors, 2,
+                                                          block_size=100)
+        for row in range(3):
+            self.assertEqual(in_blocks.for_row(row), in_one_block.for_row(row))
+
+    def test_saves_no_similarities_when_count_is_zero(self):
+        similarities = compute_topic_service_similarities(self.topic_vectors, self.service_vectors, 0)
+        self.assertEqual(similarities.for_row(0), [])
+
+
+class TestTokenizeDocs(TestCase):
+    def setUp(self):
+        self.docs = ['aligator interloper and fumigator',
+                     'likewise aligator interloper and fumigator',
+                     'Different lollipop, CANDYBAR and icecream!']
+
+    def test_returns_lower_case_lemmas_without_stop_words_or_punctuation(self):
+        tokens = tokenize_docs(self.docs[2:])
+        self.assertEqual(tokens, [['different', 'lollipop', 'candybar', 'icecream']])
+
+    def test_keeps_order_of_docs(self):
+        tokens = tokenize_docs(self.docs)
+        self.assertEqual([doc_tokens[0] for doc_tokens in tokens], ['aligator', 'likewise', 'different'])
+
+    def test_gives_same_tokens_with_several_workers(self):
+        self.assertEqual(tokenize_docs(self.docs, workers=2), tokenize_docs(self.docs))
+
+
+class TestComputeServiceSimilaritiesWithVectorizer(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.token_cache = TokenCache(os.path.join(self.directory.name, 'tokens.json'), a_string())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_uses_tokens_from_token_cache(self):
+        topic, first_service, second_service = a_string(), a_string(), a_string()
+        cached_tokens = {topic: ['aligator', 'fumigator'],
+                         first_service: ['lollipop', 'candybar'],
+                         second_service: ['aligator', 'fumigator']}
+        for text, tokens in cached_tokens.items():
+            self.token_cache.set(compute_text_key(text), tokens)
+        vectorizer = build_vectorizer()
+        vectorizer.fit(cached_tokens.values())
+
+        similarities = compute_service_similarities_with_vectorizer(vectorizer, [topic],
+                                                                    [first_service, second_service], 2,
+                                                                    token_cache=self.token_cache)
+
+        self.assertEqual([column for column, _ in similarities.for_row(0)], [1, 0])
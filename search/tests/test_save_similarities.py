@@ -2,16 +2,20 @@ import logging
 from django.test import TestCase
 from human_services.organizations.tests.helpers import OrganizationBuilder
 from human_services.services.tests.helpers import ServiceBuilder
+from human_services.locations.tests.helpers import LocationBuilder
 from search.save_similarities import (save_topic_similarities,
                                       save_topic_service_similarity_scores,
+                                      save_topic_service_at_location_similarity_scores,
                                       save_manual_similarities)
 from search.remove_similarities_for_topics import remove_similarities_for_topics
 from search.remove_similarities_for_services import remove_similarities_for_services
-from search.models import Task, TaskSimilarityScore, TaskServiceSimilarityScore
+from search.models import (Task, TaskSimilarityScore, TaskServiceSimilarityScore,
+                           TaskServiceAtLocationSimilarityScore)
 from common.testhelpers.random_test_values import a_string, a_float
 from newcomers_guide.tests.helpers import create_topic
 import scipy
 from search.tests.helpers import create_square_matrix_of_unique_floats
+from search.compute_similarities import TopSimilarities, select_top_similarities
 
 
 def create_topics(ids):
@@ -19,6 +23,15 @@ def create_topics(ids):
         create_topic(the_id)
 
 
+def top_topic_similarities(scores, count):
+    return select_top_similarities(scores, count, exclude_diagonal=True)
+
+
+def top_topic_service_similarities(scores, topic_count, count):
+    # Topics are followed by services in the rows and columns of the scores matrix
+    return select_top_similarities(scores[:topic_count, topic_count:], count)
+
+
 class TestSavingTaskSimilarities(TestCase):
 
     def test_deletes_existing_records(self):
@@ -30,7 +43,7 @@ class TestSavingTaskSimilarities(TestCase):
                                      similarity_score=a_float())
         record.save()
 
-        save_topic_similarities([], [], 0)
+        save_topic_similarities([], TopSimilarities(0, 0))
 
         self.assertEqual(TaskSimilarityScore.objects.count(), 0)
 
@@ -41,7 +54,7 @@ class TestSavingTaskSimilarities(TestCase):
         scores_matrix = scipy.sparse.csr_matrix(scores)
 
         scores_to_save_per_row = 2
-        save_topic_similarities(ids, scores_matrix, scores_to_save_per_row)
+        save_topic_similarities(ids, top_topic_similarities(scores_matrix, scores_to_save_per_row))
 
         scores_saved_in_all = 5 * 2
         self.assertEqual(TaskSimilarityScore.objects.count(), scores_saved_in_all)
@@ -52,7 +65,7 @@ class TestSavingTaskSimilarities(TestCase):
         scores = scipy.sparse.csr_matrix([[a_float() for i in range(5)] for j in range(5)])
 
         too_many_records_to_save = 2000
-        save_topic_similarities(ids, scores, too_many_records_to_save)
+        save_topic_similarities(ids, top_topic_similarities(scores, too_many_records_to_save))
 
         number_of_off_diagonal_elements = 5 * 4
         self.assertEqual(TaskSimilarityScore.objects.count(), number_of_off_diagonal_elements)
@@ -66,7 +79,7 @@ class TestSavingTaskSimilarities(TestCase):
                                           [13, 14, 15, 16]])
 
         records_to_save_per_row = 2
-        save_topic_similarities(ids, scores, records_to_save_per_row)
+        save_topic_similarities(ids, top_topic_similarities(scores, records_to_save_per_row))
 
         records = TaskSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 8)
@@ -88,7 +101,7 @@ class TestSavingTaskSimilarities(TestCase):
                                           [13, 14, 15, 16]])
 
         records_to_save_per_row = 2
-        save_topic_similarities(ids, scores, records_to_save_per_row)
+        save_topic_similarities(ids, top_topic_similarities(scores, records_to_save_per_row))
 
         records = TaskSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 8)
@@ -110,7 +123,7 @@ class TestSavingTaskSimilarities(TestCase):
                                           [13, 14, 15, 16]])
 
         records_to_save_per_row = 2
-        save_topic_similarities(ids, scores, records_to_save_per_row)
+        save_topic_similarities(ids, top_topic_similarities(scores, records_to_save_per_row))
 
         records = TaskSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 8)
@@ -142,7 +155,7 @@ class TestSavingTaskServiceSimilarities(TestCase):
                                             similarity_score=a_float())
         record.save()
 
-        save_topic_service_similarity_scores([], [], [], 0)
+        save_topic_service_similarity_scores([], [], TopSimilarities(0, 0))
 
         self.assertEqual(TaskServiceSimilarityScore.objects.count(), 0)
 
@@ -152,7 +165,8 @@ class TestSavingTaskServiceSimilarities(TestCase):
 
         scores_to_save_per_row = 2
         save_topic_service_similarity_scores(
-            self.three_topic_ids, self.three_service_ids, scores_matrix, scores_to_save_per_row)
+            self.three_topic_ids, self.three_service_ids,
+            top_topic_service_similarities(scores_matrix, 3, scores_to_save_per_row))
 
         scores_saved_in_all = 3 * 2
         self.assertEqual(TaskServiceSimilarityScore.objects.count(), scores_saved_in_all)
@@ -162,7 +176,8 @@ class TestSavingTaskServiceSimilarities(TestCase):
 
         too_many_records_to_save = 2000
         save_topic_service_similarity_scores(
-            self.three_topic_ids, self.three_service_ids, scores, too_many_records_to_save)
+            self.three_topic_ids, self.three_service_ids,
+            top_topic_service_similarities(scores, 3, too_many_records_to_save))
 
         scores_saved_in_all = 3 * 3
         self.assertEqual(TaskServiceSimilarityScore.objects.count(), scores_saved_in_all)
@@ -176,7 +191,8 @@ class TestSavingTaskServiceSimilarities(TestCase):
                                           [0, 0, 0, 0, 0, 0]])
         records_to_save_per_row = 2
         save_topic_service_similarity_scores(
-            self.three_topic_ids, self.three_service_ids, scores, records_to_save_per_row)
+            self.three_topic_ids, self.three_service_ids,
+            top_topic_service_similarities(scores, 3, records_to_save_per_row))
 
         records = TaskServiceSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 6)
@@ -196,7 +212,8 @@ class TestSavingTaskServiceSimilarities(TestCase):
                                           [0, 0, 0, 0, 0, 0]])
         records_to_save_per_row = 2
         save_topic_service_similarity_scores(
-            self.three_topic_ids, self.three_service_ids, scores, records_to_save_per_row)
+            self.three_topic_ids, self.three_service_ids,
+            top_topic_service_similarities(scores, 3, records_to_save_per_row))
 
         records = TaskServiceSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 6)
@@ -216,7 +233,8 @@ class TestSavingTaskServiceSimilarities(TestCase):
                                           [0, 0, 0, 0, 0, 0]])
         records_to_save_per_row = 2
         save_topic_service_similarity_scores(
-            self.three_topic_ids, self.three_service_ids, scores, records_to_save_per_row)
+            self.three_topic_ids, self.three_service_ids,
+            top_topic_service_similarities(scores, 3, records_to_save_per_row))
 
         records = TaskServiceSimilarityScore.objects.order_by('similarity_score')
         self.assertEqual(len(records), 6)
@@ -228,6 +246,53 @@ class TestSavingTaskServiceSimilarities(TestCase):
         self.assertEqual(records[5].service_id, self.three_service_ids[2])
 
 
+class TestSavingTaskServiceAtLocationSimilarities(TestCase):
+    def setUp(self):
+        self.organization = OrganizationBuilder().create()
+        self.topic_id = a_string()
+        create_topics([self.topic_id])
+        self.location = LocationBuilder(self.organization).create()
+        self.service = ServiceBuilder(self.organization).with_location(self.location).create()
+
+    def test_saves_one_record_for_each_service_at_location_with_a_similarity_score(self):
+        other_location = LocationBuilder(self.organization).create()
+        service_at_two_locations = (ServiceBuilder(self.organization).
+                                    with_location(self.location).
+                                    with_location(other_location).
+                                    create())
+        TaskServiceSimilarityScore(task_id=self.topic_id, service=self.service,
+                                   similarity_score=a_float()).save()
+        TaskServiceSimilarityScore(task_id=self.topic_id, service=service_at_two_locations,
+                                   similarity_score=a_float()).save()
+
+        save_topic_service_at_location_similarity_scores()
+
+        self.assertEqual(TaskServiceAtLocationSimilarityScore.objects.count(), 3)
+
+    def test_saves_similarity_score_and_location_point(self):
+        score = a_float()
+        TaskServiceSimilarityScore(task_id=self.topic_id, service=self.service,
+                                   similarity_score=score).save()
+
+        save_topic_service_at_location_similarity_scores()
+
+        record = TaskServiceAtLocationSimilarityScore.objects.get()
+        self.assertEqual(record.task_id, self.topic_id)
+        self.assertEqual(record.service_at_location.service_id, self.service.id)
+        self.assertAlmostEqual(record.similarity_score, score)
+        self.assertEqual(record.point, self.location.point)
+
+    def test_deletes_records_for_removed_similarity_scores(self):
+        TaskServiceSimilarityScore(task_id=self.topic_id, service=self.service,
+                                   similarity_score=a_float()).save()
+        save_topic_service_at_location_similarity_scores()
+
+        TaskServiceSimilarityScore.objects.all().delete()
+        save_topic_service_at_location_similarity_scores()
+
+        self.assertEqual(TaskServiceAtLocationSimilarityScore.objects.count(), 0)
+
+
 class TestSavingManualTaskServiceSimilarities(TestCase):
     def setUp(self):
         self.organization = OrganizationBuilder().create()
@@ -0,0 +1,75 @@
+import os
+from tempfile import TemporaryDirectory
+from django.test import TestCase
+from search.token_cache import TokenCache, compute_text_key
+from common.testhelpers.random_test_values import a_string
+
+
+class TestTokenCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'tokens.json')
+        self.fingerprint = a_string()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_returns_none_for_unknown_text(self):
+        cache = TokenCache(self.path, self.fingerprint)
+        self.assertIsNone(cache.get(compute_text_key(a_string())))
+
+    def test_returns_saved_tokens_in_later_run(self):
+        key = compute_text_key(a_string())
+        tokens = [a_string(), a_string()]
+        cache = TokenCache(self.path, self.fingerprint)
+        cache.set(key, tokens)
+        cache.save()
+
+        self.assertEqual(TokenCache(self.path, self.fingerprint).get(key), tokens)
+
+    def test_evicts_entries_not_used_in_run(self):
+        used_key = compute_text_key(a_string())
+        unused_key = compute_text_key(a_string())
+        cache = TokenCache(self.path, self.fingerprint)
+        cache.set(used_key, [a_string()])
+        cache.set(unused_key, [a_string()])
+        cache.save()
+
+        second_run = TokenCache(self.path, self.fingerprint)
+        second_run.get(used_key)
+        second_run.save()
+
+        third_run = TokenCache(self.path, self.fingerprint)
+        self.assertIsNotNone(third_run.get(used_key))
+        self.assertIsNone(third_run.get(unused_key))
+
+    def test_keeps_entries_not_used_in_run_when_not_evicting(self):
+        used_key = compute_text_key(a_string())
+        unused_key = compute_text_key(a_string())
+        cache = TokenCache(self.path, self.fingerprint)
+        cache.set(used_key, [a_string()])
+        cache.set(unused_key, [a_string()])
+        cache.save()
+
+        second_run = TokenCache(self.path, self.fingerprint, evict_unused=False)
+        second_run.get(used_key)
+        second_run.save()
+
+        third_run = TokenCache(self.path, self.fingerprint)
+        self.assertIsNotNone(third_run.get(unused_key))
+
+    def test_ignores_tokens_saved_with_different_fingerprint(self):
+        key = compute_text_key(a_string())
+        cache = TokenCache(self.path, self.fingerprint)
+        cache.set(key, [a_string()])
+        cache.save()
+
+        self.assertIsNone(TokenCache(self.path, a_string()).get(key))
+
+    def test_ignores_unreadable_cache_file(self):
+        with open(self.path, 'w') as file:
+            file.write('not json')
+        self.assertIsNone(TokenCache(self.path, self.fingerprint).get(compute_text_key(a_string())))
+
+    def test_key_depends_on_text(self):
+        self.assertNotEqual(compute_text_key('some text'), compute_text_key('some other text'))
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from human_services.organizations.tests.helpers import OrganizationBuilder
+from human_services.services.tests.helpers import ServiceBuilder
+from search.compute_similarities import select_top_similarities
+from search.models import TaskServiceSimilarityScore
+from search.update_similarities_for_services import update_similarities_for_services
+from common.testhelpers.random_test_values import a_string
+from newcomers_guide.tests.helpers import create_topic
+
+
+class TestUpdatingSimilaritiesForServices(TestCase):
+    def setUp(self):
+        self.organization = OrganizationBuilder().create()
+        self.topic_id = a_string()
+        create_topic(self.topic_id)
+        self.first_service = ServiceBuilder(self.organization).create()
+        self.second_service = ServiceBuilder(self.organization).create()
+        self.changed_service = ServiceBuilder(self.organization).create()
+        self.save_score(self.first_service, 0.9)
+        self.save_score(self.second_service, 0.5)
+        self.save_score(self.changed_service, 0.1)
+
+    def save_score(self, service, score):
+        TaskServiceSimilarityScore(task_id=self.topic_id, service=service, similarity_score=score).save()
+
+    def update_changed_service(self, score, related_service_count, removed_service_ids=()):
+        similarities = select_top_similarities([[score]], related_service_count)
+        update_similarities_for_services([self.topic_id], [self.changed_service.id], similarities,
+                                         related_service_count, removed_service_ids)
+
+    def saved_scores(self):
+        records = TaskServiceSimilarityScore.objects.order_by('-similarity_score')
+        return [(record.service_id, record.similarity_score) for record in records]
+
+    def test_replaces_score_of_changed_service(self):
+        self.update_changed_service(0.7, 3)
+        self.assertEqual(self.saved_scores(), [(self.first_service.id, 0.9),
+                                               (self.changed_service.id, 0.7),
+                                               (self.second_service.id, 0.5)])
+
+    def test_drops_lowest_saved_score_when_changed_service_scores_higher(self):
+        TaskServiceSimilarityScore.objects.filter(service=self.changed_service).delete()
+        self.update_changed_service(0.7, 2)
+        self.assertEqual(self.saved_scores(), [(self.first_service.id, 0.9),
+                                               (self.changed_service.id, 0.7)])
+
+    def test_does_not_save_changed_service_that_scores_too_low(self):
+        self.update_changed_service(0.2, 2)
+        self.assertEqual(self.saved_scores(), [(self.first_service.id, 0.9),
+                                               (self.second_service.id, 0.5)])
+
+    def test_removes_scores_of_removed_services(self):
+        self.update_changed_service(0.7, 3, [self.first_service.id])
+        self.assertEqual(self.saved_scores(), [(self.changed_service.id, 0.7),
+                                               (self.second_service.id, 0.5)])
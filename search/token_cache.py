@@ -0,0 +1,56 @@
+import hashlib
+import json
+import logging
+import os
+
+LOGGER = logging.getLogger(__name__)
+
+
+def compute_text_key(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class TokenCache:
+    """Lemmatized token lists for document texts, keyed by a hash of the text and stored as
+    JSON on disk between runs. The cache is tied to a fingerprint of the tokenizer settings,
+    if these change the stored tokens are discarded. Entries for texts that are not used in
+    a run are evicted when the cache is saved, so documents that have been changed or
+    deleted do not accumulate. Runs which only tokenize some of the documents keep the
+    entries of the others by passing evict_unused=False."""
+
+    def __init__(self, path, fingerprint, evict_unused=True):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.evict_unused = evict_unused
+        self.tokens = self.read_tokens()
+        self.used_keys = set()
+
+    def read_tokens(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+        except (OSError, ValueError) as error:
+            LOGGER.warning('%s: Ignoring unreadable token cache: %s', self.path, error)
+            return {}
+        if content.get('fingerprint') != self.fingerprint:
+            LOGGER.info('%s: Tokenizer settings have changed, ignoring token cache', self.path)
+            return {}
+        return content.get('tokens', {})
+
+    def get(self, key):
+        self.used_keys.add(key)
+        return self.tokens.get(key)
+
+    def set(self, key, tokens):
+        self.used_keys.add(key)
+        self.tokens[key] = tokens
+
+    def save(self):
+        if self.evict_unused:
+            self.tokens = {key: tokens for key, tokens in self.tokens.items() if key in self.used_keys}
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'fingerprint': self.fingerprint, 'tokens': self.tokens}, file)
+        os.replace(temporary_path, self.path)
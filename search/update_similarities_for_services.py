@@ -0,0 +1,47 @@
+import logging
+from django.db import transaction
+from search.models import TaskServiceSimilarityScore
+from search.save_similarities import bulk_create_in_batches
+
+LOGGER = logging.getLogger(__name__)
+
+
+@transaction.atomic
+def update_similarities_for_services(topic_ids, service_ids, similarities,
+                                     related_service_count, removed_service_ids=()):
+    # Existing scores for the rescored and removed services are dropped, then for each
+    # topic the new scores compete with the saved scores of all other services for the
+    # related_service_count places. A topic which had a removed service among its
+    # related services is left with one fewer until the next full computation.
+    stale_service_ids = set(service_ids) | set(removed_service_ids)
+    TaskServiceSimilarityScore.objects.filter(service_id__in=stale_service_ids).delete()
+
+    saved_scores = get_saved_scores_by_topic(topic_ids)
+    ids_to_delete = []
+    records_to_create = []
+    for i, topic_id in enumerate(topic_ids):
+        new_scores = [(None, service_ids[j], score) for j, score in similarities.for_row(i)]
+        candidates = saved_scores.get(topic_id, []) + new_scores
+        candidates.sort(key=lambda candidate: candidate[2], reverse=True)
+        kept, dropped = candidates[:related_service_count], candidates[related_service_count:]
+
+        ids_to_delete += [record_id for record_id, _, _ in dropped if record_id is not None]
+        records_to_create += [TaskServiceSimilarityScore(task_id=topic_id,
+                                                         service_id=service_id,
+                                                         similarity_score=score)
+                              for record_id, service_id, score in kept if record_id is None]
+
+    TaskServiceSimilarityScore.objects.filter(id__in=ids_to_delete).delete()
+    bulk_create_in_batches(TaskServiceSimilarityScore, records_to_create)
+    LOGGER.info('Deleted %d and created %d topic-service similarity scores',
+                len(ids_to_delete), len(records_to_create))
+
+
+def get_saved_scores_by_topic(topic_ids):
+    result = {}
+    rows = (TaskServiceSimilarityScore.objects.
+            filter(task_id__in=topic_ids).
+            values_list('id', 'task_id', 'service_id', 'similarity_score'))
+    for record_id, topic_id, service_id, score in rows:
+        result.setdefault(topic_id, []).append((record_id, service_id, score))
+    return result
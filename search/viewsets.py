@@ -1,28 +1,34 @@
 from rest_framework import viewsets
 from django.utils.decorators import method_decorator
 from search import models, serializers, documentation
+from common.cache import CachedResponseMixin
+from human_services.services.models import Service
 
 
-class TopicViewSet(viewsets.ReadOnlyModelViewSet):
+class TopicViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.Task.objects.all()
     serializer_class = serializers.TopicSerializer
 
 
 @method_decorator(name='list', decorator=documentation.get_related_topics_schema())
-class RelatedTopicsViewSet(viewsets.ReadOnlyModelViewSet):
+class RelatedTopicsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         topic_id = self.kwargs['topic_id']
         return models.TaskSimilarityScore.objects.filter(first_task=topic_id).order_by('-similarity_score')
 
     serializer_class = serializers.RelatedTaskSerializer
+    # Read by the method fields of the serializer
+    data_models = (models.Task,)
 
 
 @method_decorator(name='list', decorator=documentation.get_related_services_schema())
-class RelatedServicesViewSet(viewsets.ReadOnlyModelViewSet):
+class RelatedServicesViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         topic_id = self.kwargs['topic_id']
         return models.TaskServiceSimilarityScore.objects.filter(task=topic_id).order_by('-similarity_score')
 
     serializer_class = serializers.RelatedServiceSerializer
+    # Read by the method fields of the serializer
+    data_models = (Service,)